@@ -0,0 +1,112 @@
+# research_assistant/core/api_benchmark.py
+import json
+import time
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+# ترکیب پیش‌فرض درخواست‌ها: لیست مقالات و دیتاشیت‌ها، رکورد تکی و جستجو
+DEFAULT_PATHS = (
+    "/api/papers?limit=50",
+    "/api/papers/1",
+    "/api/papers/search?q=data&limit=20",
+    "/api/datasheets?limit=50",
+)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(base_url, clients=8, requests_per_client=200, paths=DEFAULT_PATHS,
+                  token="", conditional=True, write_every=0):
+    """اجرای بار هم‌زمان روی سرور API و برگرداندن خلاصه آماری
+
+    هر کلاینت یک اتصال keep-alive دارد و مسیرها را به نوبت درخواست می‌کند.
+    با conditional=True پس از اولین پاسخ هر مسیر، If-None-Match ارسال می‌شود
+    تا اثر ETag دیده شود. با write_every=N هر N درخواست یک درج انجام می‌شود.
+    """
+    parts = urlsplit(base_url)
+    latencies = []
+    statuses = {}
+    errors = []
+    lock = threading.Lock()
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    def client(number):
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        etags = {}
+        local_latencies = []
+        local_statuses = {}
+        try:
+            for i in range(requests_per_client):
+                request_headers = dict(headers)
+                if write_every and i % write_every == write_every - 1:
+                    method, path = "POST", "/api/papers"
+                    body = json.dumps({"title": f"bench {number}-{i}", "status": "برنامه‌ریزی شده"})
+                    request_headers["Content-Type"] = "application/json"
+                else:
+                    method, path, body = "GET", paths[i % len(paths)], None
+                    if conditional and path in etags:
+                        request_headers["If-None-Match"] = etags[path]
+
+                started = time.perf_counter()
+                connection.request(method, path, body=body, headers=request_headers)
+                response = connection.getresponse()
+                response.read()
+                local_latencies.append((time.perf_counter() - started) * 1000)
+                local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+                etag = response.getheader("ETag")
+                if method == "GET" and etag:
+                    etags[path] = etag
+        except Exception as e:
+            with lock:
+                errors.append(f"client {number}: {e}")
+        finally:
+            connection.close()
+            with lock:
+                latencies.extend(local_latencies)
+                for status, count in local_statuses.items():
+                    statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=client, args=(number,)) for number in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": _percentile(latencies, 0.50),
+            "p95": _percentile(latencies, 0.95),
+            "p99": _percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "statuses": statuses,
+        "errors": errors,
+    }
+
+
+def format_benchmark(result):
+    """متن خوانای نتیجه benchmark"""
+    latency = result["latency_ms"]
+    lines = [
+        f"clients: {result['clients']}  requests: {result['requests']}  time: {result['seconds']:.2f} s",
+        f"throughput: {result['requests_per_second']:.0f} req/s",
+        f"latency ms: p50 {latency['p50']:.2f}  p95 {latency['p95']:.2f}  "
+        f"p99 {latency['p99']:.2f}  max {latency['max']:.2f}",
+        "statuses: " + ", ".join(f"{status}={count}" for status, count in sorted(result["statuses"].items())),
+    ]
+    for error in result["errors"][:5]:
+        lines.append(f"error: {error}")
+    return "\n".join(lines)
@@ -0,0 +1,404 @@
+# research_assistant/core/api_server.py
+import json
+import queue
+import hmac
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from core.connection_manager import ConnectionManager
+from core.fulltext import build_match_query, deferred_indexing, fts_table
+from core.tags import TAG_MODES, split_tags, suggest_tags, tag_filter
+
+logger = logging.getLogger(__name__)
+
+# جدول‌هایی که از طریق API در دسترس‌اند
+API_TABLES = ("papers", "datasheets")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_INSERT_RECORDS = 5000
+# زمان انتظار برای اتصال keep-alive بیکار پیش از آزاد شدن thread
+IDLE_TIMEOUT = 5
+
+
+class ApiError(Exception):
+    """خطای قابل بازگشت به کلاینت با کد وضعیت HTTP"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer که هر اتصال را در یک thread pool محدود پردازش می‌کند"""
+
+    daemon_threads = True
+
+    def __init__(self, address, handler_class, api, workers):
+        self.api = api
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        super().__init__(address, handler_class)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = IDLE_TIMEOUT
+    # هدرها و بدنه جداگانه نوشته می‌شوند؛ بدون TCP_NODELAY هر پاسخ keep-alive
+    # منتظر ACK تأخیری (حدود ۴۰ میلی‌ثانیه) می‌ماند
+    disable_nagle_algorithm = True
+    server_version = "ResistAPI/1"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_OPTIONS(self):
+        self._handle("OPTIONS")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method):
+        api = self.server.api
+        try:
+            status, payload, headers = api.dispatch(self, method)
+        except ApiError as e:
+            status, payload, headers = e.status, {"error": str(e)}, {}
+        except Exception as e:
+            logger.error(f"خطا در پردازش درخواست API {self.path}: {e}")
+            status, payload, headers = 500, {"error": "خطای داخلی سرور"}, {}
+        self._send(status, payload, headers)
+
+    def _send(self, status, payload, headers):
+        body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        for name, value in self.server.api.cors_headers(self.headers.get("Origin")).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            raise ApiError(400, "بدنه درخواست خالی است")
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, "بدنه درخواست بیش از حد بزرگ است")
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ApiError(400, f"JSON نامعتبر: {e}")
+
+
+class ApiServer:
+    """سرور HTTP/JSON محلی روی جداول مقالات و دیتاشیت‌ها
+
+    خواندن‌ها در threadهای pool با اتصال‌های فقط‌خواندنی WAL انجام می‌شوند و
+    نویسنده اصلی (thread رابط کاربری) را هرگز مسدود نمی‌کنند. درج‌ها در یک
+    thread نویسنده جداگانه با اتصال مخصوص خود به ترتیب اجرا می‌شوند و نام
+    جدول‌های تغییرکرده در صف changes قرار می‌گیرد تا برنامه در thread خود
+    رویداد تغییر را منتشر کند.
+    """
+
+    def __init__(self, db, host="127.0.0.1", port=8765, workers=8, token="", allowed_origins=()):
+        self.db = db
+        self.host = host
+        self.port = port
+        self.workers = max(1, int(workers))
+        self.token = token or ""
+        self.allowed_origins = set(allowed_origins or ())
+        self.changes = queue.Queue()
+        self.httpd = None
+        self._thread = None
+        self._stopped = False
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-writer")
+        self._write_connections = ConnectionManager(db.connections.db_path, db.connections.pragmas)
+        self._columns = {}
+        self._columns_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2] if self.httpd else (self.host, self.port)
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """شروع سرور در یک thread پس‌زمینه"""
+        self.httpd = PooledHTTPServer((self.host, self.port), ApiRequestHandler, self, self.workers)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="api-server", daemon=True)
+        self._thread.start()
+        logger.info(f"سرور API در {self.url} شروع به کار کرد")
+        return self
+
+    def serve_forever(self):
+        """اجرای سرور در thread جاری (برای حالت خط فرمان)"""
+        self.httpd = PooledHTTPServer((self.host, self.port), ApiRequestHandler, self, self.workers)
+        logger.info(f"سرور API در {self.url} شروع به کار کرد")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self):
+        """توقف سرور و بستن اتصال نوشتنی آن"""
+        if self._stopped:
+            return
+        self._stopped = True
+        if self.httpd is not None:
+            if self._thread is not None:
+                self.httpd.shutdown()
+                self._thread = None
+            self.httpd.server_close()
+            self.httpd = None
+        self._writer.submit(self._write_connections.close)
+        self._writer.shutdown(wait=True)
+
+    def drain_changes(self):
+        """جدول‌هایی که از آخرین فراخوانی توسط API تغییر کرده‌اند"""
+        tables = set()
+        while True:
+            try:
+                tables.add(self.changes.get_nowait())
+            except queue.Empty:
+                return tables
+
+    def cors_headers(self, origin):
+        if origin and (origin in self.allowed_origins or "*" in self.allowed_origins):
+            return {
+                "Access-Control-Allow-Origin": origin,
+                "Access-Control-Allow-Headers": "Authorization, Content-Type, If-None-Match",
+                "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+                "Access-Control-Expose-Headers": "ETag",
+                "Vary": "Origin",
+            }
+        return {}
+
+    # --- مسیریابی ---
+
+    def dispatch(self, request, method):
+        """پردازش درخواست؛ (کد وضعیت، بدنه JSON، هدرها) برمی‌گرداند"""
+        if method == "OPTIONS":
+            return 204, None, {}
+        self.check_token(request)
+
+        url = urlsplit(request.path)
+        parts = [part for part in url.path.split("/") if part]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if parts[:1] != ["api"]:
+            raise ApiError(404, "مسیر یافت نشد")
+        if parts == ["api", "health"]:
+            return 200, {"status": "ok", "tables": list(API_TABLES)}, {}
+        if len(parts) < 2 or parts[1] not in API_TABLES:
+            raise ApiError(404, "جدول یافت نشد")
+        table = parts[1]
+
+        if method == "POST":
+            if len(parts) != 2:
+                raise ApiError(405, "روش مجاز نیست")
+            return 201, self.insert(table, request.read_json()), {}
+
+        # پاسخ‌های خواندنی فقط با تغییر داده‌ها تغییر می‌کنند
+        etag = self.etag()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in _parse_etags(request.headers.get("If-None-Match")):
+            return 304, None, headers
+
+        if len(parts) == 2:
+            return 200, self.list_rows(table, params), headers
+        if parts[2:] == ["search"]:
+            return 200, self.search(table, params), headers
+        if parts[2:] == ["tags"]:
+            limit = _int_param(params, "limit", 10, 1, 100)
+            return 200, {"items": suggest_tags(self.db, params.get("prefix", ""), table, limit)}, headers
+        if len(parts) == 3 and parts[2].isdigit():
+            return 200, self.get_row(table, int(parts[2])), headers
+        raise ApiError(404, "مسیر یافت نشد")
+
+    def check_token(self, request):
+        if not self.token:
+            return
+        supplied = request.headers.get("X-Api-Token", "")
+        authorization = request.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            supplied = authorization[len("Bearer "):]
+        if not hmac.compare_digest(supplied.encode("utf-8"), self.token.encode("utf-8")):
+            raise ApiError(401, "توکن نامعتبر است")
+
+    # --- خواندن ---
+
+    def etag(self):
+        """ETag بر اساس شماره ترتیب change_log که با هر تغییر افزایش می‌یابد
+
+        sqlite_sequence حتی پس از حذف رکوردهای قدیمی change_log کاهش نمی‌یابد.
+        """
+        connection = self.db.read_connection()
+        row = connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        return f'"{version}-{row[0] if row else 0}"'
+
+    def query(self, sql, parameters=()):
+        cursor = self.db.read_connection().execute(sql, parameters)
+        columns = [description[0] for description in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def list_rows(self, table, params):
+        """لیست صفحه‌بندی‌شده به ترتیب نزولی شناسه (keyset: ?cursor=<آخرین شناسه>)"""
+        limit = _int_param(params, "limit", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        conditions, parameters = [], []
+        if "cursor" in params:
+            conditions.append("id < ?")
+            parameters.append(_int_param(params, "cursor", 0, 0, None))
+        if params.get("status"):
+            conditions.append("status = ?")
+            parameters.append(params["status"])
+        if params.get("tag"):
+            # ?tag=a,b&tag_mode=and|or با ایندکس tag_links
+            mode = params.get("tag_mode", "and")
+            if mode not in TAG_MODES:
+                raise ApiError(400, "tag_mode باید and یا or باشد")
+            condition, tag_params = tag_filter(table, "id", split_tags(params["tag"]), mode)
+            conditions.append(condition)
+            parameters.extend(tag_params)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        items = self.query(f"SELECT * FROM {table} {where} ORDER BY id DESC LIMIT ?", (*parameters, limit))
+        next_cursor = items[-1]["id"] if len(items) == limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def search(self, table, params):
+        """جستجوی متنی FTS5 مرتب‌شده بر اساس رتبه (?q=...&offset=...)"""
+        match = build_match_query(params.get("q", ""))
+        if match is None:
+            raise ApiError(400, "پارامتر q لازم است")
+        limit = _int_param(params, "limit", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        offset = _int_param(params, "offset", 0, 0, None)
+        fts = fts_table(table)
+        items = self.query(
+            f"SELECT t.* FROM {fts} JOIN {table} t ON t.id = {fts}.rowid "
+            f"WHERE {fts} MATCH ? ORDER BY {fts}.rank LIMIT ? OFFSET ?",
+            (match, limit, offset)
+        )
+        next_offset = offset + limit if len(items) == limit else None
+        return {"items": items, "offset": offset, "next_offset": next_offset}
+
+    def get_row(self, table, row_id):
+        items = self.query(f"SELECT * FROM {table} WHERE id = ?", (row_id,))
+        if not items:
+            raise ApiError(404, "رکورد یافت نشد")
+        return items[0]
+
+    # --- نوشتن ---
+
+    def table_columns(self, table):
+        with self._columns_lock:
+            if table not in self._columns:
+                rows = self.db.read_connection().execute(f"PRAGMA table_info({table})").fetchall()
+                self._columns[table] = {row[1] for row in rows} - {"id"}
+            return self._columns[table]
+
+    def insert(self, table, payload):
+        """درج یک رکورد یا لیستی از رکوردها در یک تراکنش"""
+        records = payload if isinstance(payload, list) else [payload]
+        if not records or not all(isinstance(record, dict) for record in records):
+            raise ApiError(400, "بدنه باید یک شیء یا لیستی از اشیاء باشد")
+        if len(records) > MAX_INSERT_RECORDS:
+            raise ApiError(413, f"حداکثر {MAX_INSERT_RECORDS} رکورد در هر درخواست")
+
+        known = self.table_columns(table)
+        rows = []
+        for record in records:
+            columns = tuple(sorted(column for column in record if column in known))
+            if not columns:
+                raise ApiError(400, "رکورد هیچ ستون معتبری ندارد")
+            rows.append((columns, tuple(_cell(record[column]) for column in columns)))
+
+        future = self._writer.submit(self._insert_rows, table, rows)
+        try:
+            ids = future.result()
+        except Exception as e:
+            raise ApiError(409 if "constraint" in str(e).lower() else 500, f"درج ناموفق بود: {e}")
+        self.changes.put(table)
+        return {"inserted": len(ids), "ids": ids}
+
+    def _insert_rows(self, table, rows):
+        """اجرای درج‌ها در thread نویسنده API"""
+        connection = self._write_connections.writer()
+        cursor = connection.cursor()
+        ids = []
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            with deferred_indexing(cursor, table):
+                for columns, values in rows:
+                    cursor.execute(
+                        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                        values
+                    )
+                    ids.append(cursor.lastrowid)
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+        return ids
+
+
+def _cell(value):
+    """لیست‌ها (مثل tags) مانند بقیه نویسنده‌ها متن جداشده با کاما و دیکشنری‌ها JSON ذخیره می‌شوند"""
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _parse_etags(header):
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def _int_param(params, name, default, minimum, maximum):
+    try:
+        value = int(params.get(name, default))
+    except (TypeError, ValueError):
+        raise ApiError(400, f"پارامتر {name} باید عدد صحیح باشد")
+    if value < minimum:
+        raise ApiError(400, f"پارامتر {name} نباید کمتر از {minimum} باشد")
+    return min(value, maximum) if maximum is not None else value
+
+
+def server_from_config(db, config, **overrides):
+    """ساخت ApiServer با کلیدهای api_* در config.json"""
+    options = {
+        "host": config.get("api_host", "127.0.0.1"),
+        "port": config.get("api_port", 8765),
+        "workers": config.get("api_workers", 8),
+        "token": config.get("api_token", ""),
+        "allowed_origins": config.get("api_allowed_origins", []),
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return ApiServer(db, **options)
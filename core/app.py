@@ -7,29 +7,47 @@ import logging
 import traceback
 import webbrowser
 import re
+from collections import OrderedDict
 
 # اضافه کردن مسیر اصلی پروژه به sys.path
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 
 from core.config import Config
-from core.database import Database
+from core.database import Database, CHANGED_EVENT
 from core.event_bus import EventBus
+from core import lazy_imports
+from core.nlp_resources import NlpResources
+from core.charts import ChartService
+from core.dashboard_stats import DashboardStats
+from core.facets import FacetService
+from core.search_engine import SearchEngine
+from core.module_manifest import discover_modules
+from core.profiler import profiler
+from core.tasks import TaskService
 
 # تنظیمات لاگ‌گیری
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# فاصله بررسی درج‌های انجام‌شده از طریق سرور API (میلی‌ثانیه)
+API_POLL_MS = 500
+
 class ResearchAssistantApp:
     def __init__(self, root):
         self.root = root
         self.config = Config()
         self.event_bus = EventBus()
-        self.db = Database(self.config)
+        self.db = Database(self.config, self.event_bus)
         self.setup_app()
-        self.setup_ui()
+        with profiler.phase("app.setup_ui"):
+            self.setup_ui()
         self.load_modules()
         self.setup_copy_paste()
+        # import وابستگی‌های سنگین و بارگذاری منابع NLP پس از نمایش اولین صفحه و در پس‌زمینه
+        if self.config.get("import_warmup", True):
+            self.root.after_idle(lazy_imports.start_warmup)
+        self.root.after_idle(self.nlp.load_async)
         
     def setup_copy_paste(self):
         """فعال کردن قابلیت کپی و پیست"""
@@ -103,10 +121,43 @@ class ResearchAssistantApp:
         os.makedirs(self.data_dir, exist_ok=True)
         os.makedirs(self.modules_dir, exist_ok=True)
         
-        # سیستم ماژول‌ها
+        # داده‌های NLTK و stopwordها فقط از پوشه‌های محلی (بدون دانلود)
+        self.nlp = NlpResources(self.config, self.data_dir)
+        
+        # سرویس مشترک کارهای پس‌زمینه؛ نتایج با after در همین thread تحویل می‌شوند
+        self.tasks = TaskService(
+            self.root,
+            max_threads=self.config.get("task_threads", 4),
+            max_processes=self.config.get("task_processes")
+        )
+        
+        # پنل‌های نمودار با figure ثابت و cache تصاویر رسم‌شده
+        self.charts = ChartService(self.tasks, cache_size=self.config.get("chart_cache_size", 32))
+        
+        # آمار داشبورد؛ با هر نوشتن در جدول‌های مربوط باطل می‌شود
+        self.stats = DashboardStats(self.db, self.event_bus, self.tasks)
+        
+        # شمارنده‌های facet فیلترها؛ پس از هر نوشتن فقط ردیف‌های تغییرکرده اعمال می‌شوند
+        self.facets = FacetService(self.db, self.event_bus, self.tasks)
+        
+        # نمایه جستجوی سراسری؛ از change_log و روی اتصال جداگانه در پس‌زمینه بروزرسانی می‌شود
+        self.search_index = SearchEngine(self.db, self.tasks)
+        self.event_bus.subscribe(CHANGED_EVENT, self.search_index.on_db_changed)
+        self.root.after_idle(self.search_index.request_sync)
+        
+        # سرور HTTP/JSON محلی اختیاری برای کلاینت‌های دیگر
+        self.api_server = None
+        if self.config.get("api_enabled", False):
+            self.start_api_server()
+        
+        # سیستم ماژول‌ها: ورودی‌های manifest و کلاس‌های import‌شده
         self.modules = {}
+        self.module_classes = {}
         self.current_module = "dashboard"
         self.current_module_instance = None
+        # نمونه‌های ساخته‌شده ماژول‌ها به ترتیب استفاده (LRU)؛ با جابجایی فقط پنهان می‌شوند
+        self.module_instances = OrderedDict()
+        self.module_cache_size = max(1, int(self.config.get("module_cache_size", 4)))
         
     def setup_ui(self):
         """ایجاد رابط کاربری اصلی با نوار کناری"""
@@ -192,26 +243,89 @@ class ResearchAssistantApp:
         ttk.Label(self.status_frame, text=f"🌐 {lang_text}").pack(side=tk.RIGHT, padx=5)
         
     def clear_content(self):
-        """پاک کردن محتوای فعلی"""
+        """پنهان کردن ماژول فعلی و پاک کردن ویجت‌های دیگر ناحیه محتوا
+        
+        نمونه‌های ماژول در cache از بین نمی‌روند و فقط با pack_forget پنهان می‌شوند.
+        """
+        self.deactivate_current_module()
+        
+        cached = {str(instance) for instance in self.module_instances.values()}
         for widget in self.content_frame.winfo_children():
-            widget.destroy()
-            
-        if self.current_module_instance:
+            if str(widget) not in cached:
+                widget.destroy()
+    
+    def deactivate_current_module(self):
+        """فراخوانی on_deactivate و پنهان کردن ماژول فعال"""
+        instance = self.current_module_instance
+        if instance is None:
+            return
+        self.current_module_instance = None
+        
+        if hasattr(instance, 'on_deactivate'):
             try:
-                self.current_module_instance.destroy()
-            except:
-                pass
-            self.current_module_instance = None
+                instance.on_deactivate()
+            except Exception as e:
+                logger.error(f"خطا در غیرفعال‌سازی ماژول {self.current_module}: {e}")
+        try:
+            instance.pack_forget()
+        except Exception:
+            pass
+    
+    def start_api_server(self):
+        """شروع سرور API در پس‌زمینه؛ درج‌های آن در thread رابط کاربری اعلام می‌شوند"""
+        from core.api_server import server_from_config
+        try:
+            self.api_server = server_from_config(self.db, self.config).start()
+        except OSError as e:
+            logger.error(f"شروع سرور API ناموفق بود: {e}")
+            self.api_server = None
+            return
+        self.root.after(API_POLL_MS, self.poll_api_changes)
+    
+    def poll_api_changes(self):
+        """انتشار رویداد تغییر برای جدول‌هایی که از طریق API نوشته شده‌اند"""
+        if self.api_server is None:
+            return
+        tables = self.api_server.drain_changes()
+        if tables:
+            self.event_bus.publish(CHANGED_EVENT, frozenset(tables))
+        self.root.after(API_POLL_MS, self.poll_api_changes)
+    
+    def destroy_module(self, module_name):
+        """حذف نمونه ماژول از cache و آزاد کردن ویجت‌های آن"""
+        instance = self.module_instances.pop(module_name, None)
+        if instance is None:
+            return
+        if instance is self.current_module_instance:
+            self.deactivate_current_module()
+        try:
+            instance.destroy()
+        except Exception:
+            pass
+        logger.info(f"ماژول {module_name} از حافظه حذف شد")
+    
+    def evict_modules(self):
+        """حذف قدیمی‌ترین ماژول‌های غیرفعال تا اندازه cache رعایت شود"""
+        for module_name in list(self.module_instances):
+            if len(self.module_instances) <= self.module_cache_size:
+                break
+            if self.module_instances[module_name] is not self.current_module_instance:
+                self.destroy_module(module_name)
         
     def load_modules(self):
-        """بارگذاری ماژول‌ها"""
+        """کشف ماژول‌ها از manifest؛ import هر ماژول تا اولین فعال‌سازی به تأخیر می‌افتد"""
         logger.info("بارگذاری ماژول‌ها شروع شد")
         
-        # ماژول‌های داخلی
-        self.register_builtin_modules()
-        
-        # ماژول‌های خارجی (از پوشه modules)
-        self.load_external_modules()
+        manifest_path = os.path.join(self.data_dir, "cache", "modules_manifest.json")
+        with profiler.phase("modules.discover"):
+            manifest = discover_modules(self.modules_dir, manifest_path)
+        for entry in manifest:
+            if not entry["class_name"]:
+                continue
+            self.modules[entry["name"]] = entry
+            # وابستگی‌های تأخیری ماژول در warmup پس‌زمینه import می‌شوند
+            for dependency in entry.get("lazy_imports", []):
+                lazy_imports.register(dependency)
         
         # اضافه کردن دکمه‌های ماژول‌ها به نوار کناری
         self.add_module_buttons_to_sidebar()
@@ -220,115 +334,48 @@ class ResearchAssistantApp:
         self.activate_module("dashboard")
         
     def add_module_buttons_to_sidebar(self):
-        """اضافه کردن دکمه‌های ماژول‌ها به نوار کناری"""
+        """اضافه کردن دکمه‌های ماژول‌ها به نوار کناری بر اساس MODULE_INFO هر ماژول"""
         # پاک کردن دکمه‌های قبلی
         for widget in self.buttons_frame.winfo_children():
             widget.destroy()
         
-        # اضافه کردن دکمه‌های ماژول‌ها
-        modules_info = [
-            ("dashboard", "📊", self.config.t("dashboard")),
-            ("datasheets", "📄", self.config.t("articles_management")),
-            ("research", "🔍", self.config.t("research")),
-            ("analysis", "📈", self.config.t("analysis")),
-            ("search", "🔎", self.config.t("search"))
-        ]
-        
-        for module_name, icon, text in modules_info:
-            if module_name in self.modules:
-                # ایجاد دکمه با آیکون و متن
-                btn = ttk.Button(
-                    self.buttons_frame,
-                    text=f"{icon} {text}",
-                    command=lambda m=module_name: self.activate_module(m),
-                    width=20
-                )
-                btn.pack(pady=5, padx=10, fill=tk.X)
+        # فقط ماژول‌هایی که MODULE_INFO دارند در نوار کناری نمایش داده می‌شوند
+        sidebar_modules = sorted(
+            (entry for entry in self.modules.values() if entry.get("info")),
+            key=lambda entry: (entry["info"].get("order", 100), entry["name"])
+        )
         
-    def register_builtin_modules(self):
-        """ثبت ماژول‌های داخلی"""
-        try:
-            # مسیر ماژول داشبورد
-            dashboard_path = os.path.join(self.modules_dir, "dashboard", "dashboard_module.py")
-            
-            if not os.path.exists(dashboard_path):
-                logger.error(f"فایل ماژول داشبورد یافت نشد: {dashboard_path}")
-                return
-                
-            # بارگذاری ماژول با importlib
-            spec = importlib.util.spec_from_file_location("dashboard_module", dashboard_path)
-            dashboard_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(dashboard_module)
-            
-            # پیدا کردن کلاس DashboardModule
-            if hasattr(dashboard_module, 'DashboardModule'):
-                self.modules["dashboard"] = dashboard_module.DashboardModule
-                logger.info("ماژول داشبورد با موفقیت بارگذاری شد")
-            else:
-                logger.error("کلاس DashboardModule در ماژول داشبورد یافت نشد")
-                
-        except Exception as e:
-            logger.error(f"خطا در بارگذاری ماژول داشبورد: {e}")
-            self.show_error_screen()
-            
-    def load_external_modules(self):
-        """بارگذاری خودکار ماژول‌ها از پوشه modules"""
-        if not os.path.exists(self.modules_dir):
-            return
-            
-        for module_name in os.listdir(self.modules_dir):
-            module_path = os.path.join(self.modules_dir, module_name)
-            if os.path.isdir(module_path) and module_name != "__pycache__" and module_name != "dashboard":
-                self.load_single_module(module_name, module_path)
-                
-    def load_single_module(self, module_name, module_path):
-        """بارگذاری یک ماژول از پوشه"""
-        try:
-            # جستجوی فایل ماژول
-            module_file = None
-            possible_files = [
-                os.path.join(module_path, "module.py"),
-                os.path.join(module_path, f"{module_name}_module.py"),
-                os.path.join(module_path, f"{module_name}.py")
-            ]
-            
-            for file_path in possible_files:
-                if os.path.exists(file_path):
-                    module_file = file_path
-                    break
-            
-            if not module_file:
-                logger.warning(f"فایل ماژول برای {module_name} یافت نشد")
-                return
+        for entry in sidebar_modules:
+            info = entry["info"]
+            text = self.config.t(info.get("title_key", entry["name"]))
+            # ایجاد دکمه با آیکون و متن
+            btn = ttk.Button(
+                self.buttons_frame,
+                text=f"{info.get('icon', '')} {text}".strip(),
+                command=lambda m=entry["name"]: self.activate_module(m),
+                width=20
+            )
+            btn.pack(pady=5, padx=10, fill=tk.X)
                 
-            # بارگذاری ماژول
-            spec = importlib.util.spec_from_file_location(module_name, module_file)
+    def load_single_module(self, module_name):
+        """import فایل یک ماژول و بازگرداندن کلاس آن (فقط بار اول)"""
+        entry = self.modules[module_name]
+        module_class = self.module_classes.get(module_name)
+        if module_class is not None:
+            return module_class
+        
+        with profiler.phase(f"module.{module_name}.import"):
+            spec = importlib.util.spec_from_file_location(module_name, entry["file"])
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
-            
-            # پیدا کردن کلاس ماژول
-            module_class = None
-            possible_classes = [
-                getattr(module, "Module", None),
-                getattr(module, f"{module_name.capitalize()}Module", None),
-                getattr(module, module_name.capitalize(), None)
-            ]
-            
-            for class_obj in possible_classes:
-                if class_obj and hasattr(class_obj, '__call__'):
-                    module_class = class_obj
-                    break
-            
-            if not module_class:
-                logger.warning(f"کلاس ماژول برای {module_name} یافت نشد")
-                return
-                
-            # ثبت ماژول
-            self.modules[module_name] = module_class
-            logger.info(f"ماژول {module_name} با موفقیت بارگذاری شد")
-                    
-        except Exception as e:
-            logger.error(f"خطا در بارگذاری ماژول {module_name}: {e}")
+        
+        module_class = getattr(module, entry["class_name"], None)
+        if module_class is None:
+            raise ImportError(f"کلاس {entry['class_name']} در {entry['file']} یافت نشد")
+        
+        self.module_classes[module_name] = module_class
+        logger.info(f"ماژول {module_name} با موفقیت بارگذاری شد")
+        return module_class
             
     def activate_module(self, module_name):
         """فعال کردن یک ماژول"""
@@ -336,24 +383,44 @@ class ResearchAssistantApp:
         
         if module_name in self.modules:
             try:
-                self.clear_content()
-                self.status_var.set(f"{self.config.t('loading_module')} {module_name}...")
-                self.root.update()
+                instance = self.module_instances.get(module_name)
+                if instance is not None and instance is self.current_module_instance:
+                    # ماژول از قبل نمایش داده می‌شود؛ فقط داده‌ها را همگام کن
+                    if hasattr(instance, 'on_activate'):
+                        instance.on_activate()
+                    return
                 
-                # ایجاد نمونه ماژول
+                self.clear_content()
                 self.current_module = module_name
-                self.current_module_instance = self.modules[module_name](
-                    self.content_frame, 
-                    self,
-                    self.config
-                )
+                created = instance is None
+                
+                if created:
+                    self.status_var.set(f"{self.config.t('loading_module')} {module_name}...")
+                    self.root.update()
+                    
+                    # ایجاد نمونه ماژول (فقط بار اول یا پس از حذف از cache)
+                    module_class = self.load_single_module(module_name)
+                    with profiler.phase(f"module.{module_name}.construct"):
+                        instance = module_class(
+                            self.content_frame, 
+                            self,
+                            self.config
+                        )
+                    self.module_instances[module_name] = instance
+                
+                self.module_instances.move_to_end(module_name)
+                self.current_module_instance = instance
                 
                 # نمایش فریم ماژول
-                self.current_module_instance.pack(fill=tk.BOTH, expand=True)
+                instance.pack(fill=tk.BOTH, expand=True)
                 
                 # اگر ماژول متد on_activate دارد، آن را فراخوانی کن
-                if hasattr(self.current_module_instance, 'on_activate'):
-                    self.current_module_instance.on_activate()
+                if hasattr(instance, 'on_activate'):
+                    phase = "on_activate" if created else "reactivate"
+                    with profiler.phase(f"module.{module_name}.{phase}"):
+                        instance.on_activate()
+                
+                self.evict_modules()
                 
                 logger.info(f"ماژول {module_name} با موفقیت فعال شد")
                 self.status_var.set(self.config.t("status_ready"))
@@ -440,6 +507,13 @@ class ResearchAssistantApp:
             
     def __del__(self):
         """تمیزکاری هنگام بسته شدن"""
-        # بستن اتصال به پایگاه داده
+        # توقف کارهای پس‌زمینه و بستن اتصال به پایگاه داده
+        if getattr(self, 'api_server', None) is not None:
+            self.api_server.stop()
+            self.api_server = None
+        if hasattr(self, 'tasks'):
+            self.tasks.shutdown()
+        if hasattr(self, 'search_index'):
+            self.search_index.close()
         if hasattr(self, 'db'):
             self.db.close()
\ No newline at end of file
@@ -0,0 +1,213 @@
+# research_assistant/core/charts.py
+import io
+import json
+import base64
+import hashlib
+import threading
+import logging
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+from core.lazy_imports import lazy_import
+
+logger = logging.getLogger(__name__)
+
+# از pyplot استفاده نمی‌شود: figureهای pyplot در رجیستری سراسری آن می‌مانند
+# و بدون plt.close هیچ‌وقت آزاد نمی‌شوند
+Figure = lazy_import("matplotlib.figure", "Figure")
+FigureCanvasAgg = lazy_import("matplotlib.backends.backend_agg", "FigureCanvasAgg")
+
+
+def draw_barh(figure, data, title=None, xlabel=None):
+    """نمودار میله‌ای افقی از لیست (برچسب، مقدار)"""
+    ax = figure.add_subplot(111)
+    ax.barh([str(label) for label, _ in data], [value for _, value in data])
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    if title:
+        ax.set_title(title)
+
+
+def draw_pie(figure, data, title=None):
+    """نمودار دایره‌ای از لیست (برچسب، مقدار)"""
+    ax = figure.add_subplot(111)
+    ax.pie(
+        [value for _, value in data],
+        labels=[str(label) for label, _ in data],
+        autopct='%1.1f%%',
+        startangle=90
+    )
+    ax.axis('equal')
+    if title:
+        ax.set_title(title)
+
+
+# انواع نمودار قابل رسم: نوع -> تابع رسم روی Figure
+RENDERERS = {
+    "barh": draw_barh,
+    "pie": draw_pie,
+}
+
+
+def chart_key(kind, data, options, size):
+    """کلید cache یک نمودار بر اساس نوع، داده‌ها، گزینه‌ها و اندازه"""
+    payload = json.dumps([kind, data, options, size], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ChartPanel:
+    """یک محل نمایش نمودار با یک Figure و canvas ثابت
+
+    رسم با backend Agg در thread pool انجام می‌شود و فقط تصویر PNG حاصل در
+    thread رابط کاربری روی یک Label ثابت نمایش داده می‌شود. با از بین رفتن
+    Label، figure پنل آزاد می‌شود.
+    """
+
+    def __init__(self, service, parent, figsize=(8, 6), dpi=100):
+        self.service = service
+        self.figsize = tuple(figsize)
+        self.dpi = dpi
+        self.key = None
+        self.task = None
+        self.image = None
+        self._figure = None
+        self._canvas = None
+        self._released = False
+        # figure پنل در هر لحظه فقط توسط یک کار رسم استفاده می‌شود
+        self._lock = threading.Lock()
+
+        self.label = ttk.Label(parent, anchor="center")
+        self.label.pack(fill=tk.BOTH, expand=True)
+        self.label.bind("<Destroy>", lambda event: self.release(), add="+")
+
+    def show(self, kind, data, **options):
+        """نمایش نمودار؛ اگر همین داده قبلاً رسم شده باشد از cache خوانده می‌شود"""
+        if kind not in RENDERERS:
+            raise ValueError(f"نوع نمودار ناشناخته: {kind}")
+        data = [list(item) for item in data]
+        key = chart_key(kind, data, options, [self.figsize, self.dpi])
+        if key == self.key:
+            # همین نمودار نمایش داده شده یا در حال رسم است
+            return
+        self.cancel()
+        self.key = key
+
+        png = self.service.cached(key)
+        if png is not None:
+            self._display(png)
+            return
+
+        self.label.configure(text="در حال رسم نمودار...")
+        self.task = self.service.tasks.run_in_thread(
+            self.render, kind, data, options,
+            name=f"chart.{kind}",
+            on_result=lambda png: self._on_rendered(key, png),
+            on_error=self._on_error
+        )
+
+    def render(self, kind, data, options):
+        """رسم نمودار روی figure پنل و برگرداندن PNG (در thread پس‌زمینه)"""
+        with self._lock:
+            if self._released:
+                return None
+            if self._figure is None:
+                self._figure = Figure(figsize=self.figsize, dpi=self.dpi)
+                self._canvas = FigureCanvasAgg(self._figure)
+            try:
+                RENDERERS[kind](self._figure, data, **options)
+                buffer = io.BytesIO()
+                self._canvas.print_png(buffer)
+            finally:
+                # آزاد کردن محورها و artistها تا نمودار بعدی؛ خود figure حفظ می‌شود
+                self._figure.clear()
+            if self._released:
+                self._drop_figure()
+        return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    def _on_rendered(self, key, png):
+        self.task = None
+        if png is None:
+            return
+        self.service.store(key, png)
+        if key == self.key:
+            self._display(png)
+
+    def _on_error(self, error):
+        self.task = None
+        self.key = None
+        logger.error(f"خطا در رسم نمودار: {error}")
+        self.label.configure(image="", text=f"خطا در رسم نمودار: {error}")
+        self.image = None
+
+    def _display(self, png):
+        self.image = tk.PhotoImage(data=png)
+        self.label.configure(image=self.image, text="")
+
+    def cancel(self):
+        """لغو رسم در جریان"""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def clear(self):
+        """پاک کردن نمودار نمایش داده‌شده"""
+        self.cancel()
+        self.key = None
+        self.image = None
+        try:
+            self.label.configure(image="", text="")
+        except tk.TclError:
+            pass
+
+    def release(self):
+        """آزاد کردن figure و تصویر پنل"""
+        self.cancel()
+        self.image = None
+        self._released = True
+        # اگر رسمی در جریان باشد، خود آن پس از پایان figure را آزاد می‌کند
+        if self._lock.acquire(blocking=False):
+            try:
+                self._drop_figure()
+            finally:
+                self._lock.release()
+
+    def _drop_figure(self):
+        if self._figure is not None:
+            self._figure.clear()
+        self._figure = None
+        self._canvas = None
+
+
+class ChartService:
+    """ساخت پنل‌های نمودار و cache مشترک تصاویر رسم‌شده
+
+    cache با کلید hash داده‌ها کار می‌کند، پس تکرار یک تحلیل روی داده‌های
+    بدون تغییر دوباره رسم نمی‌شود. cache فقط در thread رابط کاربری خوانده و
+    نوشته می‌شود.
+    """
+
+    def __init__(self, tasks, cache_size=32):
+        self.tasks = tasks
+        self.cache_size = max(0, int(cache_size))
+        self._cache = OrderedDict()
+
+    def panel(self, parent, figsize=(8, 6), dpi=100):
+        """ساخت یک پنل نمودار داخل parent"""
+        return ChartPanel(self, parent, figsize, dpi)
+
+    def cached(self, key):
+        png = self._cache.get(key)
+        if png is not None:
+            self._cache.move_to_end(key)
+        return png
+
+    def store(self, key, png):
+        if not self.cache_size:
+            return
+        self._cache[key] = png
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        self._cache.clear()
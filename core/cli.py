@@ -0,0 +1,455 @@
+# research_assistant/core/cli.py
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import argparse
+import threading
+from itertools import islice
+
+from core.config import Config
+from core.database import Database
+from core.fulltext import FULLTEXT_FIELDS, ensure_fulltext, fts_table
+from core.search_engine import SearchEngine
+
+logger = logging.getLogger(__name__)
+
+# کدهای خروج برای اجرا از cron و اسکریپت‌ها
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+# فاصله اعمال درج‌های API در نمایه جستجو هنگام اجرای serve (ثانیه)
+SERVE_SYNC_SECONDS = 0.5
+
+# جدول‌هایی که ورود و خروج دسته‌ای روی آن‌ها مجاز است
+BULK_TABLES = ("papers", "datasheets", "notes", "research_projects", "study_plans")
+
+
+class CliError(Exception):
+    """خطای قابل نمایش به کاربر خط فرمان (بدون traceback)"""
+
+
+def open_database(args):
+    """باز کردن پایگاه داده با تنظیمات config.json و مسیر اختیاری --db"""
+    settings = dict(Config().settings)
+    if args.db:
+        settings["database_path"] = args.db
+    return Database(settings)
+
+
+def table_columns(db, table):
+    """ستون‌های یک جدول به ترتیب تعریف"""
+    rows = db.fetch_all(f"PRAGMA table_info({table})")
+    if not rows:
+        raise CliError(f"جدول {table} وجود ندارد")
+    return [row[1] for row in rows]
+
+
+def progress(message):
+    """نوشتن پیشرفت در stderr تا خروجی داده در stdout دست نخورد"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def read_records(path, file_format):
+    """خواندن جریانی رکوردها (dict) از فایل csv، jsonl یا json"""
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8-sig", newline="")
+    try:
+        if file_format == "csv":
+            yield from csv.DictReader(stream)
+        elif file_format == "jsonl":
+            for line_number, line in enumerate(stream, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise CliError(f"خط {line_number} JSON معتبر نیست: {e}")
+        else:
+            data = json.load(stream)
+            if not isinstance(data, list):
+                raise CliError("فایل JSON باید آرایه‌ای از رکوردها باشد")
+            yield from data
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def guess_format(path, explicit):
+    if explicit:
+        return explicit
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("csv", "jsonl", "json", "xlsx"):
+        return extension
+    return "jsonl"
+
+
+def cmd_import(db, args):
+    """ورود دسته‌ای رکوردها؛ هر دسته در یک تراکنش درج می‌شود"""
+    file_format = guess_format(args.file, args.format)
+    if file_format not in ("csv", "jsonl", "json"):
+        raise CliError(f"فرمت ورودی پشتیبانی نمی‌شود: {file_format}")
+
+    known = [column for column in table_columns(db, args.table) if column != "id"]
+    records = iter(read_records(args.file, file_format))
+    first = next(records, None)
+    if first is None:
+        progress("هیچ رکوردی برای ورود وجود ندارد")
+        return EXIT_OK
+
+    columns = [column for column in known if column in first]
+    ignored = sorted(set(first) - set(columns))
+    if not columns:
+        raise CliError(f"هیچ‌کدام از ستون‌های ورودی در جدول {args.table} وجود ندارد")
+    if ignored:
+        progress(f"ستون‌های ناشناخته نادیده گرفته شدند: {', '.join(ignored)}")
+
+    def rows():
+        yield tuple(_cell(first.get(column)) for column in columns)
+        for record in records:
+            yield tuple(_cell(record.get(column)) for column in columns)
+
+    total = 0
+    started = time.perf_counter()
+    source = rows()
+    while True:
+        batch = list(islice(source, args.batch_size))
+        if not batch:
+            break
+        db.bulk_insert(args.table, columns, batch, on_conflict=args.on_conflict)
+        total += len(batch)
+        progress(f"{total} رکورد درج شد")
+
+    elapsed = time.perf_counter() - started
+    progress(f"ورود {total} رکورد به {args.table} در {elapsed:.2f} ثانیه انجام شد")
+    # نمایه جستجو بدون نیاز به اجرای برنامه اصلی به روز می‌شود
+    engine = SearchEngine(db)
+    try:
+        changed = engine.sync()
+    finally:
+        engine.close()
+    progress(f"{changed} سند در نمایه جستجو بروز شد")
+    return EXIT_OK
+
+
+def _cell(value):
+    """لیست‌ها (مثل tags) به متن جداشده با کاما، دیکشنری‌ها به JSON و رشته خالی CSV به NULL"""
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    if value == "":
+        return None
+    return value
+
+
+def cmd_export(db, args):
+    """خروجی جریانی یک جدول به csv، jsonl یا xlsx"""
+    file_format = guess_format(args.output, args.format) if args.output != "-" else (args.format or "jsonl")
+    available = table_columns(db, args.table)
+    if args.columns:
+        columns = [column.strip() for column in args.columns.split(",") if column.strip()]
+        unknown = [column for column in columns if column not in available]
+        if unknown:
+            raise CliError(f"ستون‌های ناشناخته: {', '.join(unknown)}")
+    else:
+        columns = available
+
+    # نام جدول از choices و نام ستون‌ها از table_info بررسی شده‌اند
+    query = f"SELECT {', '.join(columns)} FROM {args.table} ORDER BY id"
+    rows = db.fetch_iter(query, batch_size=args.batch_size)
+
+    if file_format == "xlsx":
+        if args.output == "-":
+            raise CliError("خروجی xlsx نیاز به مسیر فایل دارد (--output)")
+        from core.exporters import export_rows_to_excel
+        count = export_rows_to_excel(args.output, columns, rows, sheet_title=args.table)
+        progress(f"{count} رکورد در {args.output} ذخیره شد")
+        return EXIT_OK
+    if file_format not in ("csv", "jsonl"):
+        raise CliError(f"فرمت خروجی پشتیبانی نمی‌شود: {file_format}")
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    count = 0
+    try:
+        if file_format == "csv":
+            writer = csv.writer(stream)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                stream.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+                stream.write("\n")
+                count += 1
+        stream.flush()
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    progress(f"{count} رکورد از {args.table} خارج شد")
+    return EXIT_OK
+
+
+def cmd_reindex(db, args):
+    """بازسازی نمایه‌های متنی FTS5 و فشرده‌سازی آن‌ها"""
+    started = time.perf_counter()
+    with db.transaction() as cursor:
+        ensure_fulltext(cursor, rebuild=True)
+        for table in FULLTEXT_FIELDS:
+            fts = fts_table(table)
+            if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts,)).fetchone():
+                cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('optimize')")
+                progress(f"نمایه {fts} بازسازی شد")
+    engine = SearchEngine(db)
+    try:
+        count = engine.rebuild()
+        while engine.extract_attachments():
+            pass
+    finally:
+        engine.close()
+    progress(f"نمایه جستجوی سراسری با {count} سند بازسازی شد")
+    progress(f"بازسازی نمایه‌ها در {time.perf_counter() - started:.2f} ثانیه انجام شد")
+    return EXIT_OK
+
+
+def collect_stats(db):
+    """آمار کتابخانه: آمار داشبورد، تعداد ردیف جدول‌ها و وضعیت فایل پایگاه داده"""
+    from core.dashboard_stats import compute_stats
+
+    stats = compute_stats(db)
+    stats["tables"] = {}
+    for table in BULK_TABLES + ("change_log",):
+        row = db.fetch_one(f"SELECT COUNT(*) FROM {table}")
+        if row is not None:
+            stats["tables"][table] = row[0]
+    stats["schema_version"] = db.fetch_one("PRAGMA user_version")[0]
+    stats["change_watermark"] = db.change_watermark()
+    path = db.connections.db_path
+    if not db.connections.in_memory and os.path.exists(path):
+        stats["file_bytes"] = os.path.getsize(path)
+        wal = path + "-wal"
+        stats["wal_bytes"] = os.path.getsize(wal) if os.path.exists(wal) else 0
+    return stats
+
+
+def cmd_stats(db, args):
+    """نمایش آمار کتابخانه به صورت متن یا JSON"""
+    stats = collect_stats(db)
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+        return EXIT_OK
+
+    tables = stats.pop("tables")
+    for key, value in stats.items():
+        if isinstance(value, float):
+            value = f"{value:.1f}"
+        print(f"{key:20} {value}")
+    for table, count in tables.items():
+        print(f"{'rows.' + table:20} {count}")
+    return EXIT_OK
+
+
+def cmd_maintenance(db, args):
+    """نگهداری پایگاه داده: بررسی سلامت، ANALYZE، checkpoint و VACUUM اختیاری"""
+    status = EXIT_OK
+    if args.check:
+        problems = [row[0] for row in db.fetch_all("PRAGMA integrity_check")]
+        if problems != ["ok"]:
+            for problem in problems:
+                progress(f"integrity: {problem}")
+            status = EXIT_ERROR
+        else:
+            progress("integrity_check: ok")
+
+    if args.prune_changes:
+        # نمایه جستجو از change_log تغذیه می‌شود و باید پیش از حذف به روز شود
+        engine = SearchEngine(db)
+        try:
+            engine.sync()
+        finally:
+            engine.close()
+        watermark = db.change_watermark()
+        removed = db.prune_change_log(watermark)
+        progress(f"{removed} رکورد change_log حذف شد")
+
+    db.execute_query("PRAGMA optimize")
+    db.execute_query("ANALYZE")
+    progress("آمار query planner بروزرسانی شد")
+
+    if args.vacuum:
+        started = time.perf_counter()
+        db.execute_query("VACUUM")
+        progress(f"VACUUM در {time.perf_counter() - started:.2f} ثانیه انجام شد")
+
+    if not db.connections.in_memory:
+        busy, log_frames, checkpointed = db.execute_query("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        progress(f"checkpoint: {checkpointed}/{log_frames} صفحه" + (" (مشغول)" if busy else ""))
+    return status
+
+
+def cmd_serve(db, args):
+    """اجرای سرور API در پیش‌زمینه تا Ctrl+C"""
+    from core.api_server import server_from_config
+
+    server = server_from_config(db, db.config, host=args.host, port=args.port, workers=args.workers)
+    # درج‌های API در نمایه جستجو اعمال می‌شوند (کار برنامه اصلی در حالت GUI)
+    engine = SearchEngine(db)
+    stopped = threading.Event()
+
+    def sync_changes():
+        while not stopped.wait(SERVE_SYNC_SECONDS):
+            if server.drain_changes():
+                try:
+                    engine.sync()
+                except Exception as e:
+                    logger.error(f"خطا در بروزرسانی نمایه جستجو: {e}")
+
+    syncer = threading.Thread(target=sync_changes, name="api-search-sync", daemon=True)
+    syncer.start()
+    progress("سرور API در حال اجرا؛ برای توقف Ctrl+C")
+    try:
+        server.serve_forever()
+    finally:
+        stopped.set()
+        syncer.join()
+        engine.close()
+    return EXIT_OK
+
+
+def cmd_api_bench(db, args):
+    """اجرای benchmark بار روی سرور API (در صورت نبود --url روی یک سرور موقت)"""
+    from core.api_benchmark import DEFAULT_PATHS, run_benchmark, format_benchmark
+    from core.api_server import server_from_config
+
+    server = None
+    url = args.url
+    if not url:
+        server = server_from_config(db, db.config, host="127.0.0.1", port=0, workers=args.workers).start()
+        url = server.url
+    try:
+        progress(f"benchmark روی {url} با {args.clients} کلاینت")
+        result = run_benchmark(
+            url,
+            clients=args.clients,
+            requests_per_client=args.requests,
+            paths=args.path or DEFAULT_PATHS,
+            token=db.config.get("api_token", ""),
+            conditional=not args.no_etag,
+            write_every=args.write_every
+        )
+    finally:
+        if server is not None:
+            server.stop()
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print(format_benchmark(result))
+    return EXIT_ERROR if result["errors"] else EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m resist",
+        description="عملیات دسته‌ای دستیار پژوهشی بدون رابط گرافیکی"
+    )
+    parser.add_argument("--db", help="مسیر پایگاه داده (پیش‌فرض: database_path در config.json)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="نمایش لاگ‌های جزئی")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    p = commands.add_parser("import", help="ورود دسته‌ای رکوردها از csv/jsonl/json")
+    p.add_argument("file", help="مسیر فایل ورودی یا - برای stdin")
+    p.add_argument("--table", choices=BULK_TABLES, default="papers")
+    p.add_argument("--format", choices=("csv", "jsonl", "json"))
+    p.add_argument("--batch-size", type=int, default=1000, help="تعداد ردیف در هر تراکنش")
+    p.add_argument("--on-conflict", choices=("ignore", "replace"),
+                   help="رفتار در برخورد با ردیف تکراری (مثلاً file_path یکسان)")
+    p.set_defaults(handler=cmd_import)
+
+    p = commands.add_parser("export", help="خروجی جریانی یک جدول")
+    p.add_argument("--table", choices=BULK_TABLES, default="papers")
+    p.add_argument("--output", "-o", default="-", help="مسیر فایل خروجی یا - برای stdout")
+    p.add_argument("--format", choices=("csv", "jsonl", "xlsx"))
+    p.add_argument("--columns", help="لیست ستون‌ها با کاما")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.set_defaults(handler=cmd_export)
+
+    p = commands.add_parser("reindex", help="بازسازی نمایه‌های جستجوی متنی")
+    p.set_defaults(handler=cmd_reindex)
+
+    p = commands.add_parser("stats", help="آمار کتابخانه")
+    p.add_argument("--json", action="store_true", help="خروجی JSON")
+    p.set_defaults(handler=cmd_stats)
+
+    p = commands.add_parser("maintenance", help="نگهداری پایگاه داده")
+    p.add_argument("--check", action="store_true", help="اجرای integrity_check")
+    p.add_argument("--vacuum", action="store_true", help="فشرده‌سازی فایل پایگاه داده")
+    p.add_argument("--prune-changes", action="store_true",
+                   help="حذف change_log (فقط وقتی برنامه گرافیکی باز نیست)")
+    p.set_defaults(handler=cmd_maintenance)
+
+    p = commands.add_parser("serve", help="اجرای سرور HTTP/JSON محلی")
+    p.add_argument("--host", help="پیش‌فرض: api_host در config.json")
+    p.add_argument("--port", type=int, help="پیش‌فرض: api_port در config.json")
+    p.add_argument("--workers", type=int, help="اندازه thread pool سرور")
+    p.set_defaults(handler=cmd_serve)
+
+    p = commands.add_parser("api-bench", help="benchmark بار روی سرور API")
+    p.add_argument("--url", help="آدرس سرور در حال اجرا؛ در غیر این صورت یک سرور موقت اجرا می‌شود")
+    p.add_argument("--clients", type=int, default=8, help="تعداد کلاینت هم‌زمان")
+    p.add_argument("--requests", type=int, default=200, help="تعداد درخواست هر کلاینت")
+    p.add_argument("--workers", type=int, help="اندازه thread pool سرور موقت")
+    p.add_argument("--path", action="append",
+                   help="مسیر درخواست (قابل تکرار)؛ پیش‌فرض ترکیبی از لیست و جستجو")
+    p.add_argument("--write-every", type=int, default=0, help="یک درج به ازای هر N درخواست")
+    p.add_argument("--no-etag", action="store_true", help="ارسال نکردن If-None-Match")
+    p.add_argument("--json", action="store_true", help="خروجی JSON")
+    p.set_defaults(handler=cmd_api_bench)
+    return parser
+
+
+def main(argv=None):
+    """نقطه ورود خط فرمان؛ کد خروج برمی‌گرداند"""
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else EXIT_USAGE
+    if getattr(args, "batch_size", 1) < 1:
+        parser.print_usage(sys.stderr)
+        progress("batch-size باید مثبت باشد")
+        return EXIT_USAGE
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+        stream=sys.stderr
+    )
+
+    db = None
+    try:
+        db = open_database(args)
+        return args.handler(db, args)
+    except CliError as e:
+        progress(f"خطا: {e}")
+        return EXIT_ERROR
+    except KeyboardInterrupt:
+        progress("متوقف شد")
+        return EXIT_INTERRUPTED
+    except BrokenPipeError:
+        # خواننده خروجی (مثلاً head) زودتر بسته شده است؛ stdout به devnull هدایت
+        # می‌شود تا flush هنگام خروج دوباره خطا ندهد
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_OK
+    except Exception as e:
+        logger.debug("خطای اجرای فرمان", exc_info=True)
+        progress(f"خطا: {e}")
+        return EXIT_ERROR
+    finally:
+        if db is not None:
+            db.close()
@@ -2,14 +2,17 @@
 import json
 import os
 from pathlib import Path
+from core.profiler import profiler
 
 class Config:
     def __init__(self):
         self.config_path = Path(__file__).parent.parent / "config.json"
         self.locales_path = Path(__file__).parent.parent / "locales"
-        self.settings = self.load_config()
+        with profiler.phase("config.load"):
+            self.settings = self.load_config()
         self.current_language = self.settings.get("language", "fa")
-        self.translations = self.load_translations()
+        with profiler.phase("config.translations"):
+            self.translations = self.load_translations()
     
     def load_config(self):
         """بارگذاری تنظیمات از فایل JSON"""
@@ -23,7 +26,28 @@ class Config:
                 "language": "fa",
                 "recent_files": [],
                 "user_preferences": {},
-                "database_path": "research_db.sqlite"
+                "database_path": "research_db.sqlite",
+                "database_pragmas": {
+                    "journal_mode": "wal",
+                    "synchronous": "NORMAL",
+                    "cache_size": -20000,
+                    "mmap_size": 268435456,
+                    "busy_timeout": 5000
+                },
+                "search_debounce_ms": 250,
+                "module_cache_size": 4,
+                "import_warmup": True,
+                "nltk_data_dir": "",
+                "stopword_languages": ["english"],
+                "task_threads": 4,
+                "task_processes": None,
+                "chart_cache_size": 32,
+                "api_enabled": False,
+                "api_host": "127.0.0.1",
+                "api_port": 8765,
+                "api_workers": 8,
+                "api_token": "",
+                "api_allowed_origins": []
             }
             self.save_config(default_config)
             return default_config
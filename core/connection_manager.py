@@ -0,0 +1,156 @@
+# research_assistant/core/connection_manager.py
+import sqlite3
+import itertools
+import threading
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# مقادیر پیش‌فرض PRAGMA؛ هر کدام از طریق کلید database_pragmas در config.json قابل تغییر است
+DEFAULT_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,        # مقدار منفی یعنی کیلوبایت (حدود ۲۰ مگابایت)
+    "mmap_size": 268435456,      # ۲۵۶ مگابایت
+    "busy_timeout": 5000,        # میلی‌ثانیه
+}
+
+# PRAGMAهایی که روی اتصال‌های فقط‌خواندنی هم معنا دارند
+READER_PRAGMAS = ("cache_size", "mmap_size", "busy_timeout")
+
+# شماره پایگاه‌های داده درون حافظه تا هر ConnectionManager داده جدای خود را داشته باشد
+_memory_ids = itertools.count(1)
+
+
+class ConnectionManager:
+    """مدیریت اتصال نوشتنی اصلی و اتصال‌های فقط‌خواندنی هر thread"""
+
+    def __init__(self, db_path, pragmas=None):
+        self.db_path = str(db_path)
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        self.pragmas.update(pragmas or {})
+        self._writer = None
+        self._local = threading.local()
+        self._readers = []
+        self._lock = threading.Lock()
+        # با هر close() افزایش می‌یابد تا اتصال‌های بسته‌شده در threadها دوباره استفاده نشوند
+        self._generation = 0
+        # پایگاه درون حافظه با نام یکتا و cache مشترک باز می‌شود تا threadهای دیگر
+        # (خواننده‌ها، نمایه جستجو) با اتصال خودشان به همان داده دسترسی داشته باشند
+        self._memory_uri = None
+        if self.in_memory:
+            self._memory_uri = f"file:resist-memory-{next(_memory_ids)}?mode=memory&cache=shared"
+
+    @property
+    def in_memory(self):
+        """پایگاه داده درون حافظه (بدون فایل، WAL و اتصال فقط‌خواندنی)"""
+        return self.db_path == ":memory:" or self.db_path.startswith("file::memory:")
+
+    @property
+    def timeout(self):
+        """زمان انتظار قفل به ثانیه برای sqlite3.connect"""
+        return int(self.pragmas.get("busy_timeout", 5000)) / 1000
+
+    def writer(self):
+        """اتصال نوشتنی اصلی (متعلق به thread رابط کاربری)"""
+        if self._writer is None:
+            self._writer = self.connect()
+            logger.info(f"اتصال نوشتنی پایگاه داده باز شد: {self.db_path}")
+        return self._writer
+
+    def connect(self, check_same_thread=True):
+        """یک اتصال نوشتنی مستقل با PRAGMAهای تنظیم‌شده
+
+        برای نویسنده‌های پس‌زمینه (مثل نمایه جستجو) که نباید اتصال thread رابط
+        کاربری را به اشتراک بگذارند؛ در حالت WAL قفل نوشتن با busy_timeout
+        بین اتصال‌ها تقسیم می‌شود.
+        """
+        if self.in_memory:
+            return self._connect_memory(check_same_thread)
+        # مدیریت تراکنش‌ها به صورت دستی انجام می‌شود (BEGIN/SAVEPOINT)
+        connection = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            timeout=self.timeout,
+            check_same_thread=check_same_thread
+        )
+        self._apply_pragmas(connection, self.pragmas)
+        return connection
+
+    def _connect_memory(self, check_same_thread):
+        """اتصال به پایگاه درون حافظه مشترک
+
+        در cache مشترک قفل‌ها در سطح جدول‌اند و busy_timeout روی آن‌ها اثری
+        ندارد؛ با read_uncommitted خواندن‌ها منتظر تراکنش نوشتنی باز نمی‌مانند.
+        """
+        connection = sqlite3.connect(
+            self._memory_uri,
+            uri=True,
+            isolation_level=None,
+            check_same_thread=check_same_thread
+        )
+        connection.execute("PRAGMA read_uncommitted = ON")
+        return connection
+
+    def reader(self):
+        """اتصال فقط‌خواندنی مخصوص thread جاری
+
+        در حالت WAL خواننده‌ها نویسنده را مسدود نمی‌کنند و برعکس.
+        """
+        cached = getattr(self._local, "reader", None)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1]
+        
+        if self.in_memory:
+            connection = self._connect_memory(check_same_thread=False)
+        else:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            connection = sqlite3.connect(
+                uri,
+                uri=True,
+                isolation_level=None,
+                timeout=self.timeout,
+                check_same_thread=False
+            )
+            self._apply_pragmas(connection, {
+                key: value for key, value in self.pragmas.items() if key in READER_PRAGMAS
+            })
+        connection.execute("PRAGMA query_only = ON")
+        self._local.reader = (self._generation, connection)
+        with self._lock:
+            self._readers.append(connection)
+        return connection
+
+    def _apply_pragmas(self, connection, pragmas):
+        """اعمال PRAGMAهای تنظیم‌شده روی یک اتصال"""
+        for name, value in pragmas.items():
+            try:
+                connection.execute(f"PRAGMA {name} = {self._pragma_value(value)}")
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"اعمال PRAGMA {name} ناموفق بود: {e}")
+
+    def _pragma_value(self, value):
+        """تبدیل مقدار PRAGMA به شکل امن برای قرار گرفتن در متن دستور"""
+        if isinstance(value, bool):
+            return "ON" if value else "OFF"
+        if isinstance(value, int):
+            return str(value)
+        text = str(value)
+        if not text.replace("-", "").replace("_", "").isalnum():
+            raise ValueError(f"مقدار PRAGMA نامعتبر: {value}")
+        return text
+
+    def close(self):
+        """بستن تمام اتصال‌ها"""
+        with self._lock:
+            readers, self._readers = self._readers, []
+            self._generation += 1
+        for connection in readers:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -0,0 +1,116 @@
+# research_assistant/core/dashboard_stats.py
+import logging
+from core.database import CHANGED_EVENT
+from core.statuses import STATUSES
+
+logger = logging.getLogger(__name__)
+
+# رویدادی که پس از باطل شدن آمار منتشر می‌شود تا نمایش‌دهنده‌ها دوباره درخواست دهند
+STATS_CHANGED_EVENT = "dashboard.stats_changed"
+
+# جدول‌هایی که آمار داشبورد از آن‌ها خوانده می‌شود
+STATS_TABLES = frozenset({"papers", "notes", "research_projects", "study_plans"})
+
+# همه آمار در یک query: هر جدول فقط یک بار پیمایش می‌شود
+STATS_QUERY = """
+    SELECT p.total, p.read, p.reading, p.planned,
+           (SELECT COUNT(*) FROM notes),
+           (SELECT COUNT(*) FROM research_projects),
+           s.minutes, s.days
+    FROM (
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(status = ?), 0) AS read,
+               COALESCE(SUM(status = ?), 0) AS reading,
+               COALESCE(SUM(status = ?), 0) AS planned
+        FROM papers
+    ) p, (
+        SELECT COALESCE(SUM(time_spent), 0) AS minutes,
+               COUNT(DISTINCT CASE WHEN time_spent > 0 THEN planned_date END) AS days
+        FROM study_plans
+    ) s
+"""
+
+
+def compute_stats(db):
+    """اجرای query تجمیعی و برگرداندن آمار به صورت دیکشنری"""
+    row = db.fetch_one(STATS_QUERY, (
+        STATUSES["read"], STATUSES["reading"], STATUSES["planned"]
+    ))
+    if row is None:
+        raise RuntimeError("خواندن آمار داشبورد ناموفق بود")
+    papers, read, reading, planned, notes, projects, minutes, days = row
+    return {
+        "papers": papers,
+        "read_papers": read,
+        "reading_papers": reading,
+        "planned_papers": planned,
+        "notes": notes,
+        "projects": projects,
+        "study_minutes": minutes,
+        "avg_daily_minutes": minutes / days if days else 0,
+    }
+
+
+class DashboardStats:
+    """cache آمار داشبورد که با رویدادهای نوشتن پایگاه داده باطل می‌شود
+
+    آمار فقط وقتی دوباره محاسبه می‌شود که یکی از جدول‌های STATS_TABLES
+    تغییر کرده باشد؛ محاسبه در thread pool انجام و نتیجه در thread رابط
+    کاربری تحویل داده می‌شود.
+    """
+
+    def __init__(self, db, event_bus, tasks):
+        self.db = db
+        self.event_bus = event_bus
+        self.tasks = tasks
+        self.snapshot = None
+        self._version = 0
+        self._task = None
+        self._waiters = []
+        event_bus.subscribe(CHANGED_EVENT, self.on_db_changed)
+
+    def on_db_changed(self, tables):
+        if tables and STATS_TABLES.intersection(tables):
+            self.invalidate()
+
+    def invalidate(self):
+        """باطل کردن cache و اطلاع به نمایش‌دهنده‌ها"""
+        self.snapshot = None
+        self._version += 1
+        self.event_bus.publish(STATS_CHANGED_EVENT)
+
+    def fetch(self, on_result, on_error=None):
+        """تحویل آمار به on_result؛ در صورت وجود cache بلافاصله"""
+        if self.snapshot is not None:
+            on_result(self.snapshot)
+            return
+        self._waiters.append((on_result, on_error))
+        if self._task is not None and self._task.version == self._version:
+            return
+        if self._task is not None:
+            self._task.cancel()
+
+        version = self._version
+        self._task = self.tasks.run_in_thread(
+            compute_stats, self.db,
+            name="dashboard.stats",
+            on_result=lambda stats: self._on_result(version, stats),
+            on_error=self._on_error
+        )
+        self._task.version = version
+
+    def _on_result(self, version, stats):
+        self._task = None
+        if version == self._version:
+            self.snapshot = stats
+        waiters, self._waiters = self._waiters, []
+        for on_result, _ in waiters:
+            on_result(stats)
+
+    def _on_error(self, error):
+        self._task = None
+        logger.error(f"خطا در محاسبه آمار داشبورد: {error}")
+        waiters, self._waiters = self._waiters, []
+        for _, on_error in waiters:
+            if on_error:
+                on_error(error)
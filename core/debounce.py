@@ -0,0 +1,50 @@
+# research_assistant/core/debounce.py
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DebouncedQuery:
+    """اجرای query با تأخیر، خارج از thread رابط کاربری و با حذف نتایج قدیمی
+
+    فراخوانی‌های submit که در فاصله delay_ms از هم انجام شوند در یک اجرا ادغام
+    می‌شوند. تابع query در thread pool سرویس کارها (TaskService) اجرا می‌شود و
+    با ارسال query جدید، کار قبلی لغو می‌شود تا فقط نتیجه آخرین query به
+    on_result (در thread رابط کاربری) تحویل داده شود.
+    """
+
+    def __init__(self, widget, tasks, query, on_result, delay_ms=250, on_error=None):
+        self.widget = widget
+        self.tasks = tasks
+        self.query = query
+        self.on_result = on_result
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self._timer = None
+        self._task = None
+
+    def submit(self, *args):
+        """زمان‌بندی اجرای query؛ درخواست معلق قبلی لغو می‌شود"""
+        self.cancel()
+        self._timer = self.widget.after(self.delay_ms, self._start, args)
+
+    def cancel(self):
+        """لغو درخواست معلق و نادیده گرفتن نتیجه اجرای در حال انجام"""
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _start(self, args):
+        self._timer = None
+        self._task = self.tasks.run_in_thread(
+            self.query, *args,
+            name="debounced-query",
+            on_result=self.on_result,
+            on_error=self.on_error or self._log_error
+        )
+
+    def _log_error(self, error):
+        logger.error(f"خطا در اجرای query پس‌زمینه: {error}")
@@ -0,0 +1,27 @@
+# research_assistant/core/exporters.py
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def export_rows_to_excel(file_path, headers, rows, sheet_title="Sheet"):
+    """نوشتن جریانی ردیف‌ها در فایل اکسل
+
+    از حالت write_only در openpyxl استفاده می‌شود تا ردیف‌ها یکی‌یکی روی دیسک
+    نوشته شوند و کل جدول هیچ‌وقت در حافظه نگه داشته نشود.
+    تعداد ردیف‌های نوشته‌شده را برمی‌گرداند.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_title)
+    sheet.append(list(headers))
+
+    count = 0
+    for row in rows:
+        sheet.append(list(row))
+        count += 1
+
+    workbook.save(file_path)
+    logger.info(f"{count} ردیف در {file_path} ذخیره شد")
+    return count
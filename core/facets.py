@@ -0,0 +1,302 @@
+# research_assistant/core/facets.py
+import threading
+import logging
+import tkinter as tk
+from tkinter import ttk
+from collections import Counter
+
+from core.database import CHANGED_EVENT
+from core.tags import parse_tag_filter, split_tags, suggest_tags, tag_key
+
+logger = logging.getLogger(__name__)
+
+# رویدادی که پس از بروزرسانی شمارنده‌های یک جدول (با نام جدول) منتشر می‌شود
+FACETS_CHANGED_EVENT = "facets.changed"
+
+# facetهای هر جدول و query خواندن مقدارهای آن‌ها (id و سپس یک ستون برای هر facet)
+FACET_SOURCES = {
+    "papers": {
+        "facets": ("status", "year", "journal", "tag"),
+        "select": """
+            SELECT id, status, substr(publication_date, 1, 4), journal, tags
+            FROM papers
+        """,
+    },
+    "datasheets": {
+        "facets": ("status", "category", "tag"),
+        "select": "SELECT id, status, category, tags FROM datasheets",
+    },
+}
+
+
+class FacetCounts:
+    """شمارنده‌های facet یک جدول با بروزرسانی تدریجی از change_log
+
+    بارگذاری اول یک پیمایش از جدول است؛ پس از آن فقط ردیف‌هایی که پس از
+    watermark تغییر کرده‌اند دوباره خوانده می‌شوند: مقدارهای قبلی ردیف از
+    شمارنده‌ها کم و مقدارهای جدید اضافه می‌شوند. مقدارهای هر ردیف در حافظه
+    نگه داشته می‌شود تا فیلتر روی facetها هم بدون query انجام شود.
+    برچسب‌ها مانند فیلتر برچسب با tag_key شمرده می‌شوند و برای هر کلید یک
+    نام نمایشی (اولین شکل دیده‌شده، مانند tags.name) نگه داشته می‌شود.
+    """
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.facets = FACET_SOURCES[table]["facets"]
+        self.select = FACET_SOURCES[table]["select"]
+        self.watermark = None
+        self.values = {}
+        self.counts = {facet: Counter() for facet in self.facets}
+        self.tag_names = {}
+        self._lock = threading.Lock()
+
+    def _row_values(self, row):
+        values = []
+        for facet, value in zip(self.facets, row[1:]):
+            if facet == "tag":
+                keys = []
+                for tag in split_tags(value):
+                    key = tag_key(tag)
+                    if key and key not in keys:
+                        keys.append(key)
+                        self.tag_names.setdefault(key, tag)
+                values.append(tuple(keys))
+            else:
+                values.append(value or None)
+        return tuple(values)
+
+    def _add(self, row_id, values):
+        self.values[row_id] = values
+        for facet, value in zip(self.facets, values):
+            if facet == "tag":
+                self.counts[facet].update(value)
+            elif value is not None:
+                self.counts[facet][value] += 1
+
+    def _remove(self, row_id):
+        values = self.values.pop(row_id, None)
+        if values is None:
+            return
+        for facet, value in zip(self.facets, values):
+            counter = self.counts[facet]
+            for item in (value if facet == "tag" else (value,)):
+                if item is None:
+                    continue
+                counter[item] -= 1
+                if counter[item] <= 0:
+                    del counter[item]
+                    if facet == "tag":
+                        self.tag_names.pop(item, None)
+
+    def load(self):
+        """بارگذاری کامل در یک پیمایش"""
+        watermark = self.db.change_watermark()
+        loaded = FacetCounts(self.db, self.table)
+        for row in self.db.fetch_iter(self.select):
+            loaded._add(row[0], loaded._row_values(row))
+        # جایگزینی یک‌جا تا thread رابط کاربری هیچ‌وقت شمارنده نیمه‌کاره نبیند
+        with self._lock:
+            self.values = loaded.values
+            self.counts = loaded.counts
+            self.tag_names = loaded.tag_names
+            self.watermark = watermark
+
+    def refresh(self):
+        """اعمال تغییرات پس از watermark؛ True اگر شمارنده‌ها تغییر کرده باشند"""
+        if self.watermark is None:
+            self.load()
+            return True
+        watermark, changes = self.db.changes_since(self.watermark, self.table)
+        if not changes:
+            self.watermark = watermark
+            return False
+
+        changed = [row_id for row_id, operation in changes.items() if operation != 'D']
+        rows = []
+        for start in range(0, len(changed), 500):
+            chunk = changed[start:start + 500]
+            rows.extend(self.db.fetch_all(
+                f"{self.select} WHERE id IN ({', '.join('?' for _ in chunk)})", chunk
+            ))
+        with self._lock:
+            for row_id in changes:
+                self._remove(row_id)
+            for row in rows:
+                self._add(row[0], self._row_values(row))
+            self.watermark = watermark
+        return True
+
+    def snapshot(self):
+        """کپی شمارنده‌ها: {facet: {مقدار: تعداد}} به اضافه total"""
+        with self._lock:
+            result = {facet: dict(counter) for facet, counter in self.counts.items()}
+            if "tag" in result:
+                result["tag"] = {self.tag_names.get(key, key): count for key, count in result["tag"].items()}
+            result["total"] = len(self.values)
+        return result
+
+    def matching(self, facet, value):
+        """مجموعه شناسه ردیف‌هایی که مقدار facet آن‌ها value است"""
+        index = self.facets.index(facet)
+        with self._lock:
+            if facet == "tag":
+                key = tag_key(value)
+                return {row_id for row_id, values in self.values.items() if key in values[index]}
+            return {row_id for row_id, values in self.values.items() if values[index] == value}
+
+
+class FacetService:
+    """شمارنده‌های facet همه جدول‌ها؛ بروزرسانی در thread pool پس از هر نوشتن
+
+    مانند آمار داشبورد با رویداد db.changed کار می‌کند، ولی به جای باطل کردن
+    cache فقط تغییرات change_log را اعمال می‌کند و سپس FACETS_CHANGED_EVENT
+    را با نام جدول منتشر می‌کند.
+    """
+
+    def __init__(self, db, event_bus, tasks):
+        self.db = db
+        self.event_bus = event_bus
+        self.tasks = tasks
+        self.tables = {table: FacetCounts(db, table) for table in FACET_SOURCES}
+        self._tasks = {}
+        self._again = set()
+        event_bus.subscribe(CHANGED_EVENT, self.on_db_changed)
+
+    def on_db_changed(self, tables):
+        for table in tables or ():
+            if table in self.tables and self.tables[table].watermark is not None:
+                self.request(table)
+
+    def request(self, table):
+        """زمان‌بندی refresh یک جدول؛ درخواست‌های هم‌زمان در یک اجرا ادغام می‌شوند"""
+        if table in self._tasks:
+            self._again.add(table)
+            return
+        self._tasks[table] = self.tasks.run_in_thread(
+            self.tables[table].refresh,
+            name=f"facets.{table}",
+            on_result=lambda changed: self._on_result(table, changed),
+            on_error=lambda error: self._on_error(table, error)
+        )
+
+    def counts(self, table):
+        """آخرین شمارنده‌های جدول یا None اگر هنوز بارگذاری نشده باشد"""
+        facets = self.tables[table]
+        if facets.watermark is None:
+            self.request(table)
+            return None
+        return facets.snapshot()
+
+    def matching(self, table, facet, value):
+        return self.tables[table].matching(facet, value)
+
+    def _on_result(self, table, changed):
+        del self._tasks[table]
+        if table in self._again:
+            self._again.discard(table)
+            self.request(table)
+        if changed:
+            self.event_bus.publish(FACETS_CHANGED_EVENT, table)
+
+    def _on_error(self, table, error):
+        self._tasks.pop(table, None)
+        self._again.discard(table)
+        logger.error(f"خطا در بروزرسانی شمارنده‌های {table}: {error}")
+
+
+class FacetBar(ttk.Frame):
+    """دکمه‌های فیلتر وضعیت و فهرست‌های facet با تعداد هر مقدار
+
+    statuses لیست (کلید، برچسب، مقدار status) است؛ کلید با مقدار None یعنی
+    «همه». facets لیست (facet، برچسب) برای فهرست‌های کشویی است. با انتخاب
+    هر فیلتر on_change(facet, مقدار) و برای دکمه‌ها on_change("status", کلید)
+    فراخوانی می‌شود.
+    """
+
+    # حداکثر تعداد مقدار هر فهرست (پرتکرارترین‌ها)
+    MAX_VALUES = 50
+    ALL_LABEL = "همه"
+
+    def __init__(self, parent, statuses, facets, on_change):
+        super().__init__(parent)
+        self.statuses = statuses
+        self.on_change = on_change
+        self.buttons = {}
+        self.combos = {}
+        self.choices = {}
+
+        for key, label, _ in statuses:
+            button = ttk.Button(self, text=label, command=lambda key=key: self.on_change("status", key))
+            button.pack(side=tk.LEFT, padx=2)
+            self.buttons[key] = (button, label)
+
+        for facet, label in facets:
+            ttk.Label(self, text=label + ":").pack(side=tk.LEFT, padx=(8, 2))
+            combo = ttk.Combobox(self, state="readonly", width=16, values=(self.ALL_LABEL,))
+            combo.set(self.ALL_LABEL)
+            combo.pack(side=tk.LEFT)
+            combo.bind("<<ComboboxSelected>>", lambda event, facet=facet: self._on_select(facet))
+            self.combos[facet] = combo
+            self.choices[facet] = {}
+
+    def update_counts(self, snapshot):
+        """نمایش تعدادها کنار دکمه‌ها و مقدارهای فهرست‌ها"""
+        if snapshot is None:
+            return
+        status_counts = snapshot.get("status", {})
+        for key, label, value in self.statuses:
+            button, label = self.buttons[key]
+            count = snapshot["total"] if value is None else status_counts.get(value, 0)
+            button.config(text=f"{label} ({count})")
+
+        for facet, combo in self.combos.items():
+            counts = snapshot.get(facet, {})
+            top = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))[:self.MAX_VALUES]
+            choices = {f"{value} ({count})": value for value, count in top}
+            selected = self.choices[facet].get(combo.get())
+            self.choices[facet] = choices
+            combo.config(values=(self.ALL_LABEL, *choices))
+            # مقدار انتخاب‌شده با تعداد جدید نمایش داده می‌شود
+            if selected is not None:
+                combo.set(f"{selected} ({counts.get(selected, 0)})")
+                self.choices[facet].setdefault(combo.get(), selected)
+
+    def _on_select(self, facet):
+        combo = self.combos[facet]
+        self.on_change(facet, self.choices[facet].get(combo.get()))
+
+
+class TagFilterEntry(ttk.Combobox):
+    """فیلد فیلتر برچسب با تکمیل خودکار
+
+    «a, b» یعنی هر دو برچسب و «a | b» یعنی هر کدام؛ پیشنهادها برای برچسب در
+    حال تایپ از ایندکس جدول tags خوانده می‌شوند. با Enter یا انتخاب پیشنهاد
+    on_change(لیست برچسب‌ها، حالت) فراخوانی می‌شود.
+    """
+
+    def __init__(self, parent, db, table, on_change, width=24):
+        super().__init__(parent, width=width)
+        self.db = db
+        self.table = table
+        self.on_change = on_change
+        self.bind("<KeyRelease>", self._on_key)
+        self.bind("<Return>", lambda event: self._apply())
+        self.bind("<<ComboboxSelected>>", lambda event: self._apply())
+
+    def _on_key(self, event):
+        if event.keysym in ("Return", "Up", "Down", "Escape"):
+            return
+        text = self.get()
+        cut = max(text.rfind(","), text.rfind("|")) + 1
+        head, current = text[:cut], text[cut:].strip()
+        separator = " " if head else ""
+        self.config(values=[
+            head + separator + tag for tag in suggest_tags(self.db, current, self.table)
+        ])
+        if not text.strip():
+            self._apply()
+
+    def _apply(self):
+        tags, mode = parse_tag_filter(self.get())
+        self.on_change(tags, mode)
@@ -0,0 +1,130 @@
+# research_assistant/core/filter_index.py
+from array import array
+from bisect import bisect_left
+import logging
+
+from core.text_normalizer import fold
+
+logger = logging.getLogger(__name__)
+
+
+class FilterIndex:
+    """ذخیره ستونی فیلدهای قابل جستجو در حافظه برای فیلتر سریع
+
+    هر ردیف یک خانه (slot) ثابت دارد. متن قابل جستجو یک بار هنگام بارگذاری
+    یا تغییر ردیف یکسان‌سازی (fold) و ذخیره می‌شود و برای هر وضعیت یک
+    bitmap (یک بایت برای هر خانه) نگه داشته می‌شود، پس فیلتر هنگام تایپ
+    هیچ رفت‌وبرگشتی به پایگاه داده یا Tcl ندارد.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """پاک کردن تمام داده‌ها"""
+        self.ids = array('q')
+        self.texts = []
+        self.sort_keys = []
+        self.status_masks = {}
+        self.live = bytearray()
+        self.slot_of = {}
+        # خانه‌های زنده به ترتیب صعودی (کلید ترتیب، شناسه)؛ نمایش از انتها شروع می‌شود
+        self.order = []
+        self._order_keys = []
+
+    def __len__(self):
+        return len(self.order)
+
+    def load(self, rows):
+        """بارگذاری یک‌باره ردیف‌ها به شکل (id, sort_key, status, *text_fields)"""
+        self.clear()
+        for row in rows:
+            self._append(row)
+        pairs = sorted(
+            (self._order_key(slot), slot) for slot in range(len(self.ids)) if self.live[slot]
+        )
+        self._order_keys = [key for key, _ in pairs]
+        self.order = [slot for _, slot in pairs]
+
+    def upsert(self, row):
+        """افزودن یا بروزرسانی یک ردیف"""
+        row_id = row[0]
+        slot = self.slot_of.get(row_id)
+        if slot is None:
+            slot = self._append(row)
+        else:
+            self._remove_from_order(slot)
+            self._set_slot(slot, row)
+        self._insert_into_order(slot)
+
+    def remove(self, row_id):
+        """حذف یک ردیف؛ خانه آن خالی می‌ماند"""
+        slot = self.slot_of.pop(row_id, None)
+        if slot is None:
+            return
+        self._remove_from_order(slot)
+        self.live[slot] = 0
+        self.texts[slot] = ""
+        for mask in self.status_masks.values():
+            mask[slot] = 0
+
+    def match(self, text=None, status=None):
+        """شناسه ردیف‌های منطبق به ترتیب نمایش
+
+        همه کلمات text باید در متن ردیف وجود داشته باشند؛ status در صورت
+        تعیین باید دقیقاً برابر باشد.
+        """
+        terms = fold(text).split()
+        mask = self.live if status is None else self.status_masks.get(status)
+        if mask is None:
+            return []
+
+        slots = [slot for slot in reversed(self.order) if mask[slot]]
+        texts = self.texts
+        for term in terms:
+            slots = [slot for slot in slots if term in texts[slot]]
+
+        ids = self.ids
+        return [ids[slot] for slot in slots]
+
+    def _append(self, row):
+        slot = len(self.ids)
+        self.ids.append(row[0])
+        self.texts.append("")
+        self.sort_keys.append(None)
+        self.live.append(0)
+        for mask in self.status_masks.values():
+            mask.append(0)
+        self._set_slot(slot, row)
+        return slot
+
+    def _set_slot(self, slot, row):
+        row_id, sort_key, status = row[0], row[1], row[2]
+        self.slot_of[row_id] = slot
+        self.live[slot] = 1
+        self.sort_keys[slot] = sort_key or ""
+        self.texts[slot] = fold("\n".join(str(value) for value in row[3:] if value))
+        for mask in self.status_masks.values():
+            mask[slot] = 0
+        if status is not None:
+            mask = self.status_masks.get(status)
+            if mask is None:
+                mask = self.status_masks[status] = bytearray(len(self.ids))
+            mask[slot] = 1
+
+    def _order_key(self, slot):
+        return (self.sort_keys[slot], self.ids[slot])
+
+    def _insert_into_order(self, slot):
+        key = self._order_key(slot)
+        index = bisect_left(self._order_keys, key)
+        self._order_keys.insert(index, key)
+        self.order.insert(index, slot)
+
+    def _remove_from_order(self, slot):
+        key = self._order_key(slot)
+        index = bisect_left(self._order_keys, key)
+        if index < len(self.order) and self.order[index] == slot:
+            del self._order_keys[index]
+            del self.order[index]
+
@@ -0,0 +1,177 @@
+# research_assistant/core/fulltext.py
+import logging
+from contextlib import contextmanager
+
+from core.index_deferral import DEFERRALS_TABLE, ensure_deferral_schema, not_deferred
+from core.tags import TAGGED_TABLES, link_rows
+from core.text_normalizer import normalize_text, sql_normalize_select, tokenize
+
+logger = logging.getLogger(__name__)
+
+# ستون‌های نمایه‌شده برای هر جدول؛ datasheets نویسنده و ژورنال ندارد و دسته‌بندی را نمایه می‌کند
+FULLTEXT_FIELDS = {
+    "papers": ("title", "authors", "journal", "notes", "tags", "url"),
+    "datasheets": ("title", "category", "tags", "notes", "url"),
+}
+
+
+def fts_table(table):
+    """نام جدول مجازی FTS5 متناظر با یک جدول"""
+    return f"{table}_fts"
+
+
+def build_match_query(text, prefix_last_only=False, min_prefix=1):
+    """تبدیل متن جستجوی کاربر به عبارت MATCH با تطبیق پیشوندی
+
+    هر کلمه به صورت "کلمه"* درمی‌آید و کلمات با AND ضمنی ترکیب می‌شوند.
+    با prefix_last_only فقط کلمه آخر (که کاربر در حال تایپ آن است) پیشوندی
+    است و کلمات کوتاه‌تر از min_prefix کامل تطبیق داده می‌شوند؛ پیشوندهای
+    کوتاه هزاران term را شامل می‌شوند و رتبه‌بندی را کند می‌کنند.
+    کلمات با همان normalizer متن نمایه‌شده یکسان می‌شوند.
+    اگر متن هیچ کلمه‌ای نداشته باشد None برمی‌گرداند.
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return None
+    last = len(tokens) - 1
+
+    def term(index, token):
+        quoted = '"{}"'.format(token.replace('"', '""'))
+        if prefix_last_only and index != last:
+            return quoted
+        return quoted + "*" if len(token) >= min_prefix else quoted
+
+    return " ".join(term(index, token) for index, token in enumerate(tokens))
+
+
+def _table_columns(cursor, table):
+    return {row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def _table_exists(cursor, name):
+    row = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def ensure_fulltext(cursor, rebuild=False):
+    """ایجاد جداول FTS5 و triggerهای همگام‌سازی آن‌ها
+
+    triggerها هر بار بازسازی می‌شوند تا با ستون‌های فعلی جدول اصلی هماهنگ بمانند؛
+    ستونی که هنوز در جدول وجود ندارد با رشته خالی نمایه می‌شود. متن یک بار
+    هنگام نوشتن با sql_normalize_select (فقط توابع داخلی SQLite) یکسان می‌شود
+    تا نوشتن با هر کلاینت دیگری هم ممکن باشد؛ triggerهای درج و ویرایش در
+    deferred_indexing اجرا نمی‌شوند.
+    """
+    ensure_deferral_schema(cursor)
+    for table, fields in FULLTEXT_FIELDS.items():
+        if not _table_exists(cursor, table):
+            continue
+
+        fts = fts_table(table)
+        existing = _table_columns(cursor, table)
+        created = not _table_exists(cursor, fts)
+
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {', '.join(fields)},
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+        """)
+
+        def normalized(alias, source=None):
+            columns = [("id", f"{alias}.id")] + [
+                (field, f"COALESCE({alias}.{field}, '')" if field in existing else "''")
+                for field in fields
+            ]
+            return sql_normalize_select(columns, source, keep=("id",))
+
+        watched = ", ".join(field for field in fields if field in existing)
+
+        cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_ai")
+        cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_ad")
+        cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_au")
+        cursor.execute(f"""
+            CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} WHEN {not_deferred(table)} BEGIN
+                INSERT INTO {fts} (rowid, {', '.join(fields)}) {normalized('new')};
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN
+                DELETE FROM {fts} WHERE rowid = old.id;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER {fts}_au AFTER UPDATE OF id, {watched} ON {table}
+            WHEN old.id != new.id OR {not_deferred(table)} BEGIN
+                DELETE FROM {fts} WHERE rowid = old.id;
+                INSERT INTO {fts} (rowid, {', '.join(fields)}) {normalized('new')};
+            END
+        """)
+
+        if created or rebuild:
+            cursor.execute(f"DELETE FROM {fts}")
+            cursor.execute(f"""
+                INSERT INTO {fts} (rowid, {', '.join(fields)})
+                {normalized('t', f'{table} t')}
+            """)
+            logger.info(f"نمایه متنی {fts} ساخته شد")
+
+
+def _fulltext_value(value):
+    """مقدار ستون FTS مانند COALESCE و replaceهای trigger"""
+    return "" if value is None else normalize_text(value)
+
+
+def reindex_rows(cursor, table, ids):
+    """حذف و درج دوباره ردیف‌ها در نمایه FTS5 با normalize_text پایتون
+
+    همان متنی را می‌نویسد که triggerهای درج و ویرایش می‌نوشتند؛ شناسه‌هایی
+    که دیگر در جدول نیستند فقط از نمایه حذف می‌شوند.
+    """
+    fields = FULLTEXT_FIELDS[table]
+    fts = fts_table(table)
+    existing = _table_columns(cursor, table)
+    select = ", ".join(field if field in existing else "''" for field in fields)
+    ids = list(ids)
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        rows = cursor.execute(
+            f"SELECT id, {select} FROM {table} WHERE id IN ({', '.join('?' for _ in chunk)})", chunk
+        ).fetchall()
+        cursor.executemany(f"DELETE FROM {fts} WHERE rowid = ?", ((row_id,) for row_id in chunk))
+        cursor.executemany(
+            f"INSERT INTO {fts} (rowid, {', '.join(fields)}) VALUES (?, {', '.join('?' for _ in fields)})",
+            ((row[0], *(_fulltext_value(value) for value in row[1:])) for row in rows)
+        )
+
+
+@contextmanager
+def deferred_indexing(cursor, table):
+    """اجرای نوشتن‌های دسته‌ای بدون triggerهای نمایه و نمایه کردن یک‌جای ردیف‌ها
+
+    باید داخل یک تراکنش باز فراخوانی شود. triggerهای FTS5 و برچسب هر ردیف
+    حدود ۶۰ replace تو در تو اجرا می‌کنند؛ اینجا ردیف‌های درج‌شده یا
+    ویرایش‌شده از change_log خوانده و با normalize_text و tag_key پایتون در
+    همان تراکنش نمایه می‌شوند. در صورت خطا تراکنش بیرونی ردیف deferral را هم
+    برمی‌گرداند.
+    """
+    if table not in FULLTEXT_FIELDS and table not in TAGGED_TABLES:
+        yield
+        return
+    cursor.execute(f"INSERT OR IGNORE INTO {DEFERRALS_TABLE} (table_name) VALUES (?)", (table,))
+    watermark = cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+    yield
+    ids = [
+        row[0] for row in cursor.execute(
+            "SELECT DISTINCT row_id FROM change_log WHERE table_name = ? AND seq > ? AND operation != 'D'",
+            (table, watermark)
+        ).fetchall()
+    ]
+    if ids and table in FULLTEXT_FIELDS:
+        reindex_rows(cursor, table, ids)
+    if ids and table in TAGGED_TABLES:
+        link_rows(cursor, table, ids)
+    cursor.execute(f"DELETE FROM {DEFERRALS_TABLE} WHERE table_name = ?", (table,))
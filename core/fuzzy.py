@@ -0,0 +1,160 @@
+# research_assistant/core/fuzzy.py
+import logging
+
+from core.text_normalizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+# واژه‌های کوتاه‌تر از این طول در نمایه trigram ثبت نمی‌شوند
+MIN_TERM_LENGTH = 3
+# حداکثر تعداد واژه نامزد برای هر کلمه جستجو پیش از محاسبه فاصله ویرایشی
+MAX_CANDIDATES = 64
+# جایگزینی‌های هم‌شکل (مثل l و 1 در شماره قطعه) نصف یک ویرایش معمولی هزینه دارند
+_CONFUSABLE = {frozenset(pair) for pair in ("l1", "i1", "o0", "s5", "b8", "z2", "g9")}
+# مرز حروف واژه در trigramها؛ تا اول و آخر واژه هم trigram مخصوص خود را داشته باشد
+_PAD = "$"
+
+
+def ensure_fuzzy_schema(cursor):
+    """جداول واژگان و نمایه trigram واژه‌ها"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fuzzy_terms (
+            id INTEGER PRIMARY KEY,
+            term TEXT NOT NULL UNIQUE,
+            length INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fuzzy_grams (
+            gram TEXT NOT NULL,
+            term_id INTEGER NOT NULL,
+            PRIMARY KEY (gram, term_id)
+        ) WITHOUT ROWID
+    ''')
+
+
+def trigrams(term):
+    """مجموعه trigramهای واژه با علامت مرز در دو طرف"""
+    padded = f"{_PAD}{term}{_PAD}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_distance(term):
+    """حداکثر فاصله ویرایشی قابل قبول بر اساس طول واژه"""
+    if len(term) < 5:
+        return 1 if len(term) >= MIN_TERM_LENGTH else 0
+    return 2
+
+
+def edit_distance(a, b, limit):
+    """فاصله Levenshtein محدود به limit؛ اگر بیشتر باشد limit + 1 برمی‌گرداند
+
+    فقط نوار قطری به پهنای limit محاسبه می‌شود و با عبور کمینه هر سطر از
+    limit محاسبه متوقف می‌شود. جایگزینی حروف هم‌شکل 0.5 حساب می‌شود.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    too_far = limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        current = [too_far] * (len(b) + 1)
+        if low == 1:
+            current[0] = i
+        row_min = current[0] if low == 1 else too_far
+        for j in range(low, high + 1):
+            char_b = b[j - 1]
+            if char_a == char_b:
+                cost = 0
+            elif frozenset((char_a, char_b)) in _CONFUSABLE:
+                cost = 0.5
+            else:
+                cost = 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return too_far
+        previous = current
+    return min(previous[len(b)], too_far)
+
+
+def terms_of(texts):
+    """واژه‌های قابل نمایه یک یا چند متن (پس از یکسان‌سازی)"""
+    terms = set()
+    for text in texts:
+        for term in tokenize(text):
+            if len(term) >= MIN_TERM_LENGTH:
+                terms.add(term)
+    return terms
+
+
+def add_terms(cursor, terms):
+    """ثبت واژه‌های جدید و trigramهای آن‌ها؛ واژه‌های موجود نادیده گرفته می‌شوند"""
+    terms = list(terms)
+    new_terms = []
+    for start in range(0, len(terms), 500):
+        chunk = terms[start:start + 500]
+        existing = {
+            row[0] for row in cursor.execute(
+                f"SELECT term FROM fuzzy_terms WHERE term IN ({', '.join('?' for _ in chunk)})", chunk
+            )
+        }
+        new_terms.extend(term for term in chunk if term not in existing)
+    if not new_terms:
+        return 0
+
+    grams = []
+    for term in new_terms:
+        cursor.execute("INSERT INTO fuzzy_terms (term, length) VALUES (?, ?)", (term, len(term)))
+        term_id = cursor.lastrowid
+        grams.extend((gram, term_id) for gram in trigrams(term))
+    cursor.executemany("INSERT OR IGNORE INTO fuzzy_grams (gram, term_id) VALUES (?, ?)", grams)
+    return len(new_terms)
+
+
+def clear_terms(cursor):
+    cursor.execute("DELETE FROM fuzzy_grams")
+    cursor.execute("DELETE FROM fuzzy_terms")
+
+
+def similar_terms(cursor, word, limit=None):
+    """واژه‌های نمایه با فاصله ویرایشی محدود از word به شکل [(واژه، فاصله)]
+
+    نامزدها از نمایه trigram خوانده می‌شوند (واژه‌هایی که به اندازه کافی trigram
+    مشترک دارند)، پس هزینه به تعداد واژه‌های هم‌trigram بستگی دارد نه به کل
+    واژگان. هر ویرایش حداکثر سه trigram را خراب می‌کند؛ واژه‌هایی که کمتر از
+    len(trigrams) - 3 * فاصله مجاز trigram مشترک دارند نمی‌توانند منطبق باشند.
+    """
+    limit = max_distance(word) if limit is None else limit
+    grams = trigrams(word)
+    if limit == 0:
+        row = cursor.execute("SELECT term FROM fuzzy_terms WHERE term = ?", (word,)).fetchone()
+        return [(word, 0)] if row else []
+
+    min_shared = max(1, len(grams) - 3 * limit)
+    rows = cursor.execute(
+        f"""
+        SELECT t.term, COUNT(*) AS shared
+        FROM fuzzy_grams g JOIN fuzzy_terms t ON t.id = g.term_id
+        WHERE g.gram IN ({', '.join('?' for _ in grams)})
+          AND t.length BETWEEN ? AND ?
+        GROUP BY g.term_id
+        HAVING shared >= ?
+        ORDER BY shared DESC
+        LIMIT ?
+        """,
+        (*grams, len(word) - limit, len(word) + limit, min_shared, MAX_CANDIDATES)
+    ).fetchall()
+
+    matches = []
+    for term, _ in rows:
+        distance = edit_distance(word, term, limit)
+        if distance <= limit:
+            matches.append((term, distance))
+    matches.sort(key=lambda item: (item[1], item[0]))
+    return matches
@@ -0,0 +1,29 @@
+# research_assistant/core/index_deferral.py
+import logging
+
+logger = logging.getLogger(__name__)
+
+# جدولی که در طول یک تراکنش دسته‌ای triggerهای نمایه جدول‌های ثبت‌شده را غیرفعال می‌کند
+DEFERRALS_TABLE = "index_deferrals"
+
+
+def ensure_deferral_schema(cursor):
+    """جدول جدول‌هایی که نمایه‌سازی آن‌ها در تراکنش جاری به تعویق افتاده
+
+    ردیف‌ها فقط داخل تراکنش نویسنده وجود دارند و پیش از commit حذف می‌شوند،
+    پس کلاینت‌های دیگر هیچ‌وقت آن‌ها را نمی‌بینند.
+    """
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DEFERRALS_TABLE} (
+            table_name TEXT PRIMARY KEY
+        ) WITHOUT ROWID
+    """)
+
+
+def not_deferred(table):
+    """شرط WHEN triggerهای درج و ویرایش نمایه‌های table
+
+    در تراکنشی که نمایه‌سازی table را به تعویق انداخته، ردیف‌ها پس از همه
+    دستورها یک‌جا در پایتون نمایه می‌شوند (fulltext.deferred_indexing).
+    """
+    return f"NOT EXISTS (SELECT 1 FROM {DEFERRALS_TABLE} WHERE table_name = '{table}')"
@@ -0,0 +1,123 @@
+# research_assistant/core/lazy_imports.py
+import importlib
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# ماژول‌های ثبت‌شده برای import تأخیری به ترتیب ثبت
+_registered = []
+# زمان import هر ماژول: نام -> (ثانیه، پیام خطا یا None)
+_timings = {}
+_lock = threading.Lock()
+
+
+def _import(module_name):
+    """import یک ماژول و ثبت زمان آن (فقط بار اول)"""
+    with _lock:
+        known = module_name in _timings
+    if known:
+        return importlib.import_module(module_name)
+
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+    except Exception as e:
+        with _lock:
+            _timings.setdefault(module_name, (time.perf_counter() - start, str(e)))
+        raise
+    with _lock:
+        _timings.setdefault(module_name, (time.perf_counter() - start, None))
+    return module
+
+
+class LazyImport:
+    """نماینده یک ماژول (یا یک نام داخل ماژول) که در اولین استفاده import می‌شود
+
+    lazy_import("matplotlib.pyplot") جایگزین import matplotlib.pyplot as plt و
+    lazy_import("nltk.tokenize", "word_tokenize") جایگزین from ... import ... است؛
+    دسترسی به attributeها یا فراخوانی، import واقعی را انجام می‌دهد.
+    """
+
+    def __init__(self, module_name, attribute=None):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            target = _import(self._module_name)
+            if self._attribute:
+                target = getattr(target, self._attribute)
+            self._target = target
+        return self._target
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        name = self._module_name + (f".{self._attribute}" if self._attribute else "")
+        state = "loaded" if self._target is not None else "deferred"
+        return f"<LazyImport {name} ({state})>"
+
+
+def register(module_name):
+    """ثبت یک ماژول برای import در warmup (بدون import آن)"""
+    with _lock:
+        if module_name not in _registered:
+            _registered.append(module_name)
+
+
+def lazy_import(module_name, attribute=None):
+    """ساخت نماینده import تأخیری و ثبت ماژول برای warmup"""
+    register(module_name)
+    return LazyImport(module_name, attribute)
+
+
+def start_warmup(on_done=None):
+    """import ماژول‌های ثبت‌شده در یک thread پس‌زمینه
+
+    ماژول‌هایی که زودتر در thread اصلی استفاده شوند همان‌جا import می‌شوند؛
+    قفل import پایتون از import هم‌زمان یک ماژول جلوگیری می‌کند.
+    on_done (در thread پس‌زمینه) پس از پایان با گزارش زمان‌ها فراخوانی می‌شود.
+    """
+    def run():
+        with _lock:
+            names = list(_registered)
+        for module_name in names:
+            try:
+                _import(module_name)
+            except Exception as e:
+                logger.warning(f"import پس‌زمینه {module_name} ناموفق بود: {e}")
+        logger.info("زمان import وابستگی‌ها:\n" + format_import_report())
+        if on_done:
+            on_done(import_report())
+
+    thread = threading.Thread(target=run, name="import-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def import_report():
+    """لیست (نام ماژول، ثانیه، خطا) به ترتیب نزولی زمان
+
+    زمان هر ماژول شامل وابستگی‌هایی است که پیش از آن import نشده بودند.
+    """
+    with _lock:
+        items = [(name, seconds, error) for name, (seconds, error) in _timings.items()]
+    return sorted(items, key=lambda item: item[1], reverse=True)
+
+
+def format_import_report():
+    """متن خوانای گزارش زمان import"""
+    lines = []
+    for name, seconds, error in import_report():
+        status = f"  (خطا: {error})" if error else ""
+        lines.append(f"  {seconds * 1000:8.1f} ms  {name}{status}")
+    return "\n".join(lines) if lines else "  (هیچ ماژولی import نشده است)"
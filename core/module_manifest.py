@@ -0,0 +1,132 @@
+# research_assistant/core/module_manifest.py
+import ast
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# فرمت فایل manifest؛ با تغییر ساختار ورودی‌ها افزایش یابد
+MANIFEST_VERSION = 1
+
+# قرارداد MODULE_INFO: ماژولی که در نوار کناری نمایش داده می‌شود یک dict در سطح
+# فایل با کلیدهای icon، title_key (کلید ترجمه عنوان) و order (ترتیب در نوار
+# کناری) تعریف می‌کند. فایل ماژول اجرا نمی‌شود و مقدار با ast.literal_eval
+# خوانده می‌شود، پس فقط مقدارهای literal مجازند. ماژول بدون MODULE_INFO در
+# نوار کناری نمایش داده نمی‌شود.
+
+
+def module_file_candidates(module_name, module_path):
+    """فایل‌های ممکن برای یک ماژول به ترتیب اولویت"""
+    return [
+        os.path.join(module_path, "module.py"),
+        os.path.join(module_path, f"{module_name}_module.py"),
+        os.path.join(module_path, f"{module_name}.py"),
+    ]
+
+
+def module_class_candidates(module_name):
+    """نام‌های ممکن کلاس اصلی یک ماژول به ترتیب اولویت"""
+    return ["Module", f"{module_name.capitalize()}Module", module_name.capitalize()]
+
+
+def inspect_module_file(module_name, file_path):
+    """استخراج نام کلاس، MODULE_INFO و importهای تأخیری بدون اجرای فایل
+
+    فایل فقط با ast پارس می‌شود، پس هیچ وابستگی‌ای import نمی‌شود.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=file_path)
+
+    classes = {node.name for node in tree.body if isinstance(node, ast.ClassDef)}
+    class_name = next((name for name in module_class_candidates(module_name) if name in classes), None)
+
+    info = {}
+    lazy = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "MODULE_INFO" for target in node.targets
+        ):
+            try:
+                info = ast.literal_eval(node.value)
+            except ValueError:
+                logger.warning(f"MODULE_INFO در {file_path} قابل خواندن نیست")
+
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id == "lazy_import" and node.args
+                and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+            if node.args[0].value not in lazy:
+                lazy.append(node.args[0].value)
+
+    return {"class_name": class_name, "info": info, "lazy_imports": lazy}
+
+
+def discover_modules(modules_dir, cache_path):
+    """فهرست ماژول‌های پوشه modules با استفاده از manifest ذخیره‌شده
+
+    هر ورودی با (مسیر فایل، زمان تغییر، اندازه) کلید می‌خورد و فقط فایل‌هایی
+    که تغییر کرده‌اند دوباره پارس می‌شوند. خروجی لیستی از dictهایی با کلیدهای
+    name، file، class_name، info و lazy_imports است.
+    """
+    cached = _read_manifest(cache_path)
+    entries = []
+    changed = False
+
+    if not os.path.isdir(modules_dir):
+        return entries
+
+    for module_name in sorted(os.listdir(modules_dir)):
+        module_path = os.path.join(modules_dir, module_name)
+        if not os.path.isdir(module_path) or module_name.startswith(("_", ".")):
+            continue
+
+        file_path = next(
+            (path for path in module_file_candidates(module_name, module_path) if os.path.exists(path)),
+            None
+        )
+        if not file_path:
+            logger.warning(f"فایل ماژول برای {module_name} یافت نشد")
+            continue
+
+        stat = os.stat(file_path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        entry = cached.get(file_path)
+        if not entry or entry.get("stamp") != stamp or entry.get("name") != module_name:
+            try:
+                details = inspect_module_file(module_name, file_path)
+            except (OSError, SyntaxError, UnicodeDecodeError) as e:
+                logger.error(f"خطا در بررسی ماژول {module_name}: {e}")
+                continue
+            entry = {"name": module_name, "file": file_path, "stamp": stamp, **details}
+            changed = True
+
+        if not entry["class_name"]:
+            logger.warning(f"کلاس ماژول برای {module_name} یافت نشد")
+        entries.append(entry)
+
+    if changed or len(entries) != len(cached):
+        _write_manifest(cache_path, entries)
+    return entries
+
+
+def _read_manifest(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return {entry["file"]: entry for entry in data.get("modules", [])}
+
+
+def _write_manifest(cache_path, entries):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "modules": entries}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"ذخیره manifest ماژول‌ها ناموفق بود: {e}")
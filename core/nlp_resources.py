@@ -0,0 +1,177 @@
+# research_assistant/core/nlp_resources.py
+import os
+import pickle
+import zipfile
+import threading
+import logging
+
+from core.text_normalizer import fold, tokenize as normalized_tokens
+
+logger = logging.getLogger(__name__)
+
+# فرمت فایل cache؛ با تغییر ساختار آن افزایش یابد
+CACHE_VERSION = 1
+
+
+class NlpResources:
+    """مدیریت آفلاین داده‌های NLTK و لیست stopwordها
+
+    هیچ دانلودی انجام نمی‌شود: داده‌ها از پوشه محلی (nltk_data_dir در تنظیمات،
+    پیش‌فرض data/nltk_data) و مسیرهای استاندارد NLTK خوانده می‌شوند. لیست‌های
+    stopword یک بار پارس و به صورت frozenset در یک فایل pickle ذخیره می‌شوند
+    و تا وقتی فایل‌های منبع تغییر نکنند از همان cache بارگذاری می‌شوند.
+    بارگذاری در پس‌زمینه انجام می‌شود و آماده بودن با ready/when_ready اعلام می‌شود.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, config, data_dir):
+        self.data_dir = config.get("nltk_data_dir") or os.path.join(data_dir, "nltk_data")
+        self.cache_path = os.path.join(data_dir, "cache", "stopwords.pickle")
+        self.languages = tuple(config.get("stopword_languages", ["english"]))
+        self.ready = threading.Event()
+        self.has_punkt = False
+        self._stopwords = {}
+        self._thread = None
+
+    def search_dirs(self):
+        """پوشه‌های داده NLTK به ترتیب اولویت"""
+        dirs = [self.data_dir]
+        dirs.extend(path for path in os.environ.get("NLTK_DATA", "").split(os.pathsep) if path)
+        dirs.append(os.path.join(os.path.expanduser("~"), "nltk_data"))
+        return [path for path in dict.fromkeys(dirs) if os.path.isdir(path)]
+
+    def load_async(self):
+        """شروع بارگذاری منابع در یک thread پس‌زمینه"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.load, name="nlp-resources", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def load(self):
+        """بارگذاری هم‌زمان منابع (در thread پس‌زمینه فراخوانی می‌شود)"""
+        try:
+            dirs = self.search_dirs()
+            self.has_punkt = any(
+                self._find(dirs, "tokenizers", name) for name in ("punkt_tab", "punkt")
+            )
+            self._stopwords = self._load_stopwords(dirs)
+            self._configure_nltk(dirs)
+            logger.info(
+                f"منابع NLP آماده شد (punkt: {self.has_punkt}, "
+                f"stopwords: {', '.join(sorted(self._stopwords)) or '-'})"
+            )
+        except Exception as e:
+            logger.error(f"خطا در بارگذاری منابع NLP: {e}")
+        finally:
+            self.ready.set()
+
+    def when_ready(self, widget, callback):
+        """فراخوانی callback در thread رابط کاربری پس از آماده شدن منابع"""
+        if self.ready.is_set():
+            callback()
+        else:
+            widget.after(self.POLL_MS, self.when_ready, widget, callback)
+
+    def stopwords(self, language="english"):
+        """مجموعه stopwordهای یک زبان (در نبود داده، مجموعه خالی)"""
+        return self._stopwords.get(language, frozenset())
+
+    def word_tokenize(self, text):
+        """تقسیم متن به کلمات؛ در نبود punkt از تقسیم ساده regex استفاده می‌شود"""
+        return tokenize(text, self.has_punkt)
+
+    def _find(self, dirs, category, name):
+        """مسیر یک منبع NLTK (پوشه یا فایل zip) یا None"""
+        for base in dirs:
+            folder = os.path.join(base, category, name)
+            if os.path.isdir(folder):
+                return folder
+            if os.path.isfile(folder + ".zip"):
+                return folder + ".zip"
+        return None
+
+    def _configure_nltk(self, dirs):
+        configure_nltk(dirs)
+
+    def _load_stopwords(self, dirs):
+        source = self._find(dirs, "corpora", "stopwords")
+        if not source:
+            logger.warning("داده stopwords در پوشه‌های محلی یافت نشد")
+            return {}
+
+        if source.endswith(".zip"):
+            files = [source]
+        else:
+            files = [os.path.join(source, language) for language in self.languages]
+        signature = (CACHE_VERSION, self.languages, tuple(_file_stamp(path) for path in files))
+        cached = self._read_cache(signature)
+        if cached is not None:
+            return cached
+
+        sets = {}
+        for language in self.languages:
+            words = self._read_stopword_file(source, language)
+            if words is not None:
+                sets[language] = frozenset(words)
+        self._write_cache(signature, sets)
+        return sets
+
+    def _read_stopword_file(self, source, language):
+        try:
+            if source.endswith(".zip"):
+                with zipfile.ZipFile(source) as archive:
+                    data = archive.read(f"stopwords/{language}").decode("utf-8")
+            else:
+                with open(os.path.join(source, language), encoding="utf-8") as f:
+                    data = f.read()
+        except (OSError, KeyError) as e:
+            logger.warning(f"لیست stopword زبان {language} خوانده نشد: {e}")
+            return None
+        return [line.strip() for line in data.splitlines() if line.strip()]
+
+    def _read_cache(self, signature):
+        try:
+            with open(self.cache_path, "rb") as f:
+                stored_signature, sets = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, ValueError, TypeError):
+            return None
+        return sets if stored_signature == signature else None
+
+    def _write_cache(self, signature, sets):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = self.cache_path + ".tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump((signature, sets), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"ذخیره cache stopwordها ناموفق بود: {e}")
+
+
+def tokenize(text, use_punkt=False):
+    """تقسیم متن یکسان‌شده (fold) به کلمات با NLTK یا در نبود punkt با regex"""
+    if use_punkt:
+        from nltk.tokenize import word_tokenize
+        return word_tokenize(fold(text))
+    return normalized_tokens(text)
+
+
+def configure_nltk(dirs):
+    """افزودن پوشه‌های داده محلی به مسیر جستجوی nltk (اگر نصب باشد)"""
+    try:
+        import nltk
+    except ImportError:
+        return
+    for path in reversed(list(dirs)):
+        if path not in nltk.data.path:
+            nltk.data.path.insert(0, path)
+
+
+def _file_stamp(path):
+    """(مسیر، زمان تغییر، اندازه) برای تشخیص تغییر فایل منبع"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (path, stat.st_mtime_ns, stat.st_size)
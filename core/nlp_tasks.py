@@ -0,0 +1,28 @@
+# research_assistant/core/nlp_tasks.py
+from collections import Counter
+
+from core.nlp_resources import tokenize, configure_nltk
+
+# توابع این ماژول در process pool اجرا می‌شوند، پس باید سطح ماژول و
+# آرگومان‌هایشان قابل pickle باشند و به Tk یا پایگاه داده دست نزنند.
+
+
+def summarize(text, sentence_count=3, data_dirs=()):
+    """خلاصه‌سازی LSA متن با sumy؛ لیست جمله‌های خلاصه را برمی‌گرداند"""
+    configure_nltk(data_dirs)
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.nlp.tokenizers import Tokenizer
+    from sumy.summarizers.lsa import LsaSummarizer
+
+    parser = PlaintextParser.from_string(text, Tokenizer("english"))
+    summarizer = LsaSummarizer()
+    return [str(sentence) for sentence in summarizer(parser.document, sentence_count)]
+
+
+def keyword_frequencies(text, stop_words=frozenset(), top=10, use_punkt=False, data_dirs=()):
+    """پرتکرارترین کلمات متن به جز stopwordها به شکل [(کلمه، تعداد)]"""
+    if use_punkt:
+        configure_nltk(data_dirs)
+    words = tokenize(text, use_punkt)
+    filtered_words = [word for word in words if word.isalnum() and word.lower() not in stop_words]
+    return Counter(filtered_words).most_common(top)
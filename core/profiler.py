@@ -0,0 +1,167 @@
+# research_assistant/core/profiler.py
+import os
+import json
+import time
+import threading
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# متغیر محیطی فعال‌سازی: "1" یا لیستی با کاما از گزینه‌های cprofile و memory
+PROFILE_ENV = "RESIST_PROFILE"
+
+
+class Profiler:
+    """ثبت زمان مراحل راه‌اندازی و مسیرهای پرتکرار برنامه
+
+    تا وقتی start فراخوانی نشده، phase و mark تقریباً هیچ هزینه‌ای ندارند.
+    در حالت فعال زمان هر مرحله ثبت می‌شود و در پایان یک گزارش JSON نوشته و
+    خلاصه رتبه‌بندی‌شده‌ای چاپ می‌شود. cProfile و tracemalloc اختیاری‌اند.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.phases = []
+        self.marks = []
+        self.output_path = None
+        self._cprofile = None
+        self._tracemalloc = False
+        self._lock = threading.Lock()
+
+    def start(self, output_path="resist_profile.json", cprofile=False, memory=False):
+        """فعال کردن ثبت زمان‌ها؛ مبدأ زمان همان لحظه import این ماژول است"""
+        self.enabled = True
+        self.output_path = output_path
+        if memory:
+            import tracemalloc
+            tracemalloc.start(25)
+            self._tracemalloc = True
+        if cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        logger.info(f"حالت profile فعال شد؛ گزارش در {output_path} نوشته می‌شود")
+
+    @contextmanager
+    def phase(self, name):
+        """ثبت مدت زمان اجرای بلوک با نام مشخص"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append({
+                    "name": name,
+                    "start_ms": (start - self.origin) * 1000,
+                    "duration_ms": (end - start) * 1000,
+                    "thread": threading.current_thread().name,
+                })
+
+    def mark(self, name):
+        """ثبت یک لحظه مشخص (مثلاً اولین نمایش داشبورد)"""
+        if self.enabled:
+            with self._lock:
+                self.marks.append({"name": name, "at_ms": (time.perf_counter() - self.origin) * 1000})
+
+    def ranked(self):
+        """جمع زمان مراحل هم‌نام به ترتیب نزولی"""
+        totals = {}
+        with self._lock:
+            phases = list(self.phases)
+        for item in phases:
+            total = totals.setdefault(item["name"], {"name": item["name"], "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            total["count"] += 1
+            total["total_ms"] += item["duration_ms"]
+            total["max_ms"] = max(total["max_ms"], item["duration_ms"])
+        return sorted(totals.values(), key=lambda total: total["total_ms"], reverse=True)
+
+    def finish(self):
+        """توقف profile، نوشتن گزارش JSON و فایل‌های جانبی و چاپ خلاصه"""
+        if not self.enabled:
+            return None
+        self.enabled = False
+
+        report = {
+            "phases": self.phases,
+            "marks": self.marks,
+            "ranked": self.ranked(),
+        }
+
+        try:
+            from core.lazy_imports import import_report
+            report["imports"] = [
+                {"module": name, "duration_ms": seconds * 1000, "error": error}
+                for name, seconds, error in import_report()
+            ]
+        except ImportError:
+            pass
+
+        base, _ = os.path.splitext(self.output_path)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            stats_path = base + ".prof"
+            self._cprofile.dump_stats(stats_path)
+            report["cprofile"] = stats_path
+
+        if self._tracemalloc:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report["memory"] = {
+                "current_kb": current / 1024,
+                "peak_kb": peak / 1024,
+                "top": [
+                    {"location": str(stat.traceback[0]), "size_kb": stat.size / 1024, "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:25]
+                ],
+            }
+
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        print(self.format_summary(report))
+        return report
+
+    def format_summary(self, report):
+        """متن خلاصه رتبه‌بندی‌شده گزارش"""
+        lines = ["", "=== Profile summary ==="]
+        for mark in report["marks"]:
+            lines.append(f"  {mark['at_ms']:9.1f} ms  @ {mark['name']}")
+        lines.append("")
+        lines.append(f"  {'total ms':>9}  {'max ms':>8}  {'n':>4}  phase")
+        for total in report["ranked"]:
+            lines.append(
+                f"  {total['total_ms']:9.1f}  {total['max_ms']:8.1f}  {total['count']:4d}  {total['name']}"
+            )
+        if report.get("imports"):
+            lines.append("")
+            lines.append("  imports:")
+            for item in report["imports"][:10]:
+                lines.append(f"  {item['duration_ms']:9.1f} ms  {item['module']}")
+        if report.get("memory"):
+            lines.append("")
+            lines.append(f"  memory peak: {report['memory']['peak_kb']:.0f} KB")
+        if report.get("cprofile"):
+            lines.append(f"  cProfile: {report['cprofile']}")
+        lines.append(f"  report: {self.output_path}")
+        return "\n".join(lines)
+
+
+def options_from_env():
+    """خواندن گزینه‌های profile از متغیر محیطی؛ None اگر غیرفعال باشد"""
+    value = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if not value or value in ("0", "false", "no"):
+        return None
+    flags = {flag.strip() for flag in value.split(",")}
+    return {"cprofile": "cprofile" in flags, "memory": "memory" in flags}
+
+
+# نمونه مشترک برنامه
+profiler = Profiler()
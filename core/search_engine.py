@@ -0,0 +1,582 @@
+# research_assistant/core/search_engine.py
+import os
+import time
+import shutil
+import logging
+import threading
+import subprocess
+
+from core.fulltext import build_match_query
+from core.fuzzy import (
+    add_terms, clear_terms, ensure_fuzzy_schema, similar_terms, terms_of
+)
+from core.text_normalizer import normalize_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+# نسخه ساختار و محتوای نمایه؛ با تغییر آن نمایه در اولین sync از نو ساخته می‌شود
+INDEX_VERSION = 3
+
+SEARCH_TABLE = "search_fts"
+
+# ستون‌های نمایه به ترتیب و وزن هر کدام در رتبه‌بندی BM25
+SEARCH_FIELDS = ("title", "authors", "tags", "body", "attachment")
+FIELD_BOOSTS = {"title": 5.0, "authors": 3.0, "tags": 2.5, "body": 1.0, "attachment": 0.5}
+
+# منابع نمایه: نوع سند -> جدول، کد rowid و query ستون‌ها
+# هر query ستون‌های (id, title, authors, tags, body, attachment) را برمی‌گرداند و
+# alias نام مستعار جدول اصلی در آن است
+SEARCH_SOURCES = {
+    "paper": {
+        "table": "papers",
+        "alias": "p",
+        "code": 1,
+        "select": """
+            SELECT p.id, p.title, p.authors, p.tags,
+                   COALESCE(p.abstract, '') || ' ' || COALESCE(p.journal, '') || ' ' ||
+                   COALESCE(p.notes, '') || ' ' || COALESCE(p.doi, ''),
+                   a.content
+            FROM papers p
+            LEFT JOIN attachment_text a ON a.kind = 'paper' AND a.source_id = p.id
+        """,
+    },
+    "datasheet": {
+        "table": "datasheets",
+        "alias": "d",
+        "code": 2,
+        "select": """
+            SELECT d.id, d.title, '', d.tags,
+                   COALESCE(d.category, '') || ' ' || COALESCE(d.notes, ''),
+                   a.content
+            FROM datasheets d
+            LEFT JOIN attachment_text a ON a.kind = 'datasheet' AND a.source_id = d.id
+        """,
+    },
+    "note": {
+        "table": "notes",
+        "alias": "n",
+        "code": 3,
+        "select": """
+            SELECT n.id, '', '', '', n.content, ''
+            FROM notes n
+        """,
+    },
+}
+
+# ستون‌هایی که واژه‌هایشان در نمایه trigram جستجوی تقریبی ثبت می‌شوند
+FUZZY_FIELDS = ("title", "authors", "tags")
+# تعداد اسناد نامزد جستجوی تقریبی پیش از امتیازدهی با فاصله ویرایشی
+FUZZY_CANDIDATES = 200
+
+# جدول‌هایی که فایل پیوست دارند
+SEARCH_TABLES = frozenset(source["table"] for source in SEARCH_SOURCES.values())
+ATTACHMENT_SOURCES = {"paper": "papers", "datasheet": "datasheets"}
+
+# شناسه سند در نمایه: شناسه ردیف * KIND_SLOTS + کد نوع
+KIND_SLOTS = 4
+BATCH_SIZE = 2000
+# کلمه در حال تایپ فقط از این طول به بعد پیشوندی جستجو می‌شود
+MIN_PREFIX = 3
+# ستون‌هایی که snippet به ترتیب از آن‌ها ساخته می‌شود (عنوان جداگانه نمایش داده می‌شود)
+SNIPPET_FIELDS = ("body", "attachment", "tags", "authors", "title")
+MAX_ATTACHMENT_CHARS = 200000
+TEXT_EXTENSIONS = (".txt", ".md", ".csv", ".tex")
+
+
+def ensure_search_schema(cursor):
+    """ایجاد جداول نمایه جستجو پیش از بازسازی
+
+    جدول‌ها در مهاجرت‌ها ساخته می‌شوند؛ بازسازی search_fts را حذف و با ساختار
+    فعلی دوباره ایجاد می‌کند.
+    """
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+            {', '.join(SEARCH_FIELDS)},
+            kind UNINDEXED,
+            source_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attachment_text (
+            kind TEXT NOT NULL,
+            source_id INTEGER NOT NULL,
+            file_path TEXT,
+            extracted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            content TEXT,
+            PRIMARY KEY (kind, source_id)
+        )
+    ''')
+    ensure_fuzzy_schema(cursor)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_meta (
+            key TEXT PRIMARY KEY,
+            value
+        )
+    ''')
+
+
+def doc_id(kind, source_id):
+    return source_id * KIND_SLOTS + SEARCH_SOURCES[kind]["code"]
+
+
+def extract_text(file_path):
+    """استخراج متن فایل پیوست؛ در صورت نبود ابزار لازم None برمی‌گرداند
+
+    فایل‌های متنی مستقیماً خوانده می‌شوند. برای PDF از pypdf (در صورت نصب)
+    و در غیر این صورت از pdftotext استفاده می‌شود.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in TEXT_EXTENSIONS:
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read(MAX_ATTACHMENT_CHARS)
+    if extension != ".pdf":
+        return None
+
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        PdfReader = None
+    if PdfReader is not None:
+        parts = []
+        size = 0
+        for page in PdfReader(file_path).pages:
+            text = page.extract_text() or ""
+            parts.append(text)
+            size += len(text)
+            if size >= MAX_ATTACHMENT_CHARS:
+                break
+        return "\n".join(parts)[:MAX_ATTACHMENT_CHARS]
+
+    pdftotext = shutil.which("pdftotext")
+    if pdftotext:
+        result = subprocess.run(
+            [pdftotext, "-q", "-enc", "UTF-8", file_path, "-"],
+            capture_output=True, timeout=60
+        )
+        return result.stdout.decode("utf-8", errors="ignore")[:MAX_ATTACHMENT_CHARS]
+    return None
+
+
+def make_snippet(fields, text, width=12):
+    """بخشی از متن سند اطراف اولین کلمه منطبق، با علامت «» دور کلمات منطبق"""
+    terms = tokenize(text)
+    if not terms:
+        return ""
+
+    def matches(word):
+        words = tokenize(word)
+        return bool(words) and any(words[0].startswith(term) for term in terms)
+
+    for field in SNIPPET_FIELDS:
+        words = (fields.get(field) or "").split()
+        for index, word in enumerate(words):
+            if matches(word):
+                start = max(0, index - width // 3)
+                window = words[start:start + width]
+                marked = [f"«{item}»" if matches(item) else item for item in window]
+                prefix = "… " if start > 0 else ""
+                suffix = " …" if start + width < len(words) else ""
+                return prefix + " ".join(marked) + suffix
+    return ""
+
+
+class SearchEngine:
+    """موتور جستجوی محلی با نمایه معکوس FTS5 روی مقالات، دیتاشیت‌ها، یادداشت‌ها و پیوست‌ها
+
+    نمایه در خود پایگاه داده ذخیره می‌شود و با خواندن change_log پس از
+    watermark ذخیره‌شده به صورت تدریجی بروز می‌شود. نوشتن در نمایه با یک
+    اتصال جداگانه و در دسته‌های کوچک انجام می‌شود تا thread رابط کاربری
+    هیچ‌وقت منتظر آن نماند؛ جستجو از اتصال خواندنی thread فراخواننده استفاده
+    می‌کند. نتایج با BM25 و وزن هر ستون (FIELD_BOOSTS) رتبه‌بندی می‌شوند.
+    """
+
+    def __init__(self, db, tasks=None):
+        self.db = db
+        self.tasks = tasks
+        self._lock = threading.Lock()
+        self._connection = None
+        self._sync_task = None
+        self._sync_again = False
+        self._missing_extractor_logged = False
+
+    # --- نوشتن در نمایه ---
+
+    def _writer(self):
+        if self._connection is None:
+            self._connection = self.db.connections.connect(check_same_thread=False)
+        return self._connection
+
+    def _meta(self, cursor, key, default=None):
+        row = cursor.execute("SELECT value FROM search_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, cursor, key, value):
+        cursor.execute("INSERT OR REPLACE INTO search_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _watermark(self, cursor):
+        return cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+    def _index_rows(self, cursor, kind, rows):
+        code = SEARCH_SOURCES[kind]["code"]
+        # متن یک بار هنگام نوشتن یکسان می‌شود، نه در هر جستجو
+        documents = [
+            (row[0] * KIND_SLOTS + code, *(normalize_text(value) or "" for value in row[1:]), kind, row[0])
+            for row in rows
+        ]
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}, kind, source_id) "
+            f"VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            documents
+        )
+        # واژه‌های عنوان، نویسندگان و برچسب‌ها (ستون‌های 1 تا 3 سند) در نمایه trigram
+        add_terms(cursor, terms_of(value for document in documents for value in document[1:4]))
+
+    def _reindex_ids(self, cursor, kind, ids):
+        """حذف و درج دوباره اسناد یک نوع؛ ردیف‌های حذف‌شده فقط از نمایه پاک می‌شوند"""
+        ids = list(ids)
+        source = SEARCH_SOURCES[kind]
+        alias = source["alias"]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor.executemany(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid = ?",
+                ((doc_id(kind, row_id),) for row_id in chunk)
+            )
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = cursor.execute(
+                f"{source['select']} WHERE {alias}.id IN ({placeholders})", chunk
+            ).fetchall()
+            self._index_rows(cursor, kind, rows)
+
+    def rebuild(self):
+        """ساخت کامل نمایه در دسته‌های BATCH_SIZE تایی"""
+        with self._lock:
+            return self._rebuild()
+
+    def _rebuild(self):
+        started = time.perf_counter()
+        connection = self._writer()
+        cursor = connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # watermark پیش از خواندن ردیف‌ها ثبت می‌شود؛ تغییرات هم‌زمان در sync بعدی دوباره اعمال می‌شوند
+            watermark = self._watermark(cursor)
+            cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+            ensure_search_schema(cursor)
+            clear_terms(cursor)
+            self._set_meta(cursor, "version", None)
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+
+        total = 0
+        for kind, source in SEARCH_SOURCES.items():
+            alias = source["alias"]
+            last_id = 0
+            while True:
+                rows = cursor.execute(
+                    f"{source['select']} WHERE {alias}.id > ? ORDER BY {alias}.id LIMIT ?",
+                    (last_id, BATCH_SIZE)
+                ).fetchall()
+                if not rows:
+                    break
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    self._index_rows(cursor, kind, rows)
+                    cursor.execute("COMMIT")
+                except BaseException:
+                    cursor.execute("ROLLBACK")
+                    raise
+                last_id = rows[-1][0]
+                total += len(rows)
+
+        cursor.execute("BEGIN IMMEDIATE")
+        self._set_meta(cursor, "version", INDEX_VERSION)
+        self._set_meta(cursor, "watermark", watermark)
+        cursor.execute("COMMIT")
+        logger.info(f"نمایه جستجو با {total} سند در {time.perf_counter() - started:.2f} ثانیه ساخته شد")
+        return total
+
+    def sync(self):
+        """اعمال تغییرات پس از آخرین watermark؛ در صورت تغییر نسخه نمایه بازسازی می‌شود
+
+        تعداد اسناد بروزشده را برمی‌گرداند.
+        """
+        with self._lock:
+            cursor = self._writer().cursor()
+            if self._meta(cursor, "version") != INDEX_VERSION:
+                return self._rebuild()
+
+            previous = self._meta(cursor, "watermark", 0)
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                latest = self._watermark(cursor)
+                if latest <= previous:
+                    cursor.execute("ROLLBACK")
+                    return 0
+                changed = 0
+                for kind, source in SEARCH_SOURCES.items():
+                    ids = [row[0] for row in cursor.execute(
+                        "SELECT DISTINCT row_id FROM change_log WHERE table_name = ? AND seq > ? AND seq <= ?",
+                        (source["table"], previous, latest)
+                    )]
+                    if ids:
+                        self._reindex_ids(cursor, kind, ids)
+                        changed += len(ids)
+                self._set_meta(cursor, "watermark", latest)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        if changed:
+            logger.info(f"{changed} سند در نمایه جستجو بروز شد")
+        return changed
+
+    def extract_attachments(self, limit=20):
+        """استخراج متن پیوست‌های جدید یا تغییرکرده و نمایه کردن دوباره اسناد آن‌ها
+
+        تعداد پیوست‌های پردازش‌شده را برمی‌گرداند؛ فراخواننده تا صفر شدن آن
+        تکرار می‌کند. فایل‌هایی که متنشان قابل استخراج نیست با محتوای خالی
+        ثبت می‌شوند تا دوباره تلاش نشود.
+        """
+        with self._lock:
+            cursor = self._writer().cursor()
+            pending = []
+            for kind, table in ATTACHMENT_SOURCES.items():
+                pending.extend((kind, row_id, path) for row_id, path in cursor.execute(f"""
+                    SELECT t.id, t.file_path FROM {table} t
+                    LEFT JOIN attachment_text a ON a.kind = ? AND a.source_id = t.id
+                    WHERE t.file_path IS NOT NULL AND t.file_path != ''
+                      AND (a.source_id IS NULL OR a.file_path IS NOT t.file_path)
+                    LIMIT ?
+                """, (kind, limit - len(pending))))
+                if len(pending) >= limit:
+                    break
+
+        if not pending:
+            return 0
+
+        extracted = []
+        for kind, row_id, path in pending:
+            content = ""
+            if os.path.exists(path):
+                try:
+                    content = extract_text(path)
+                except Exception as e:
+                    logger.warning(f"استخراج متن {path} ناموفق بود: {e}")
+                    content = ""
+                if content is None:
+                    if not self._missing_extractor_logged:
+                        logger.info("ابزار استخراج متن PDF (pypdf یا pdftotext) در دسترس نیست")
+                        self._missing_extractor_logged = True
+                    content = ""
+            extracted.append((kind, row_id, path, content))
+
+        with self._lock:
+            cursor = self._writer().cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO attachment_text (kind, source_id, file_path, content) VALUES (?, ?, ?, ?)",
+                    extracted
+                )
+                for kind in ATTACHMENT_SOURCES:
+                    ids = [row_id for item_kind, row_id, _, _ in extracted if item_kind == kind]
+                    if ids:
+                        self._reindex_ids(cursor, kind, ids)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        return len(extracted)
+
+    def update(self):
+        """sync و سپس استخراج همه پیوست‌های معلق (برای اجرا در پس‌زمینه)"""
+        changed = self.sync()
+        while self.extract_attachments():
+            pass
+        return changed
+
+    def request_sync(self):
+        """زمان‌بندی update در TaskService؛ درخواست‌های هم‌زمان در یک اجرا ادغام می‌شوند"""
+        if self.tasks is None:
+            return self.update()
+        if self._sync_task is not None:
+            self._sync_again = True
+            return None
+        self._sync_task = self.tasks.run_in_thread(
+            self.update,
+            name="search.sync",
+            on_result=lambda changed: self._sync_finished(),
+            on_error=self._sync_failed
+        )
+        return self._sync_task
+
+    def on_db_changed(self, tables):
+        """گیرنده رویداد db.changed؛ فقط نوشتن در جدول‌های منبع نمایه sync را زمان‌بندی می‌کند"""
+        if tables and SEARCH_TABLES.intersection(tables):
+            self.request_sync()
+
+    def _sync_finished(self):
+        self._sync_task = None
+        if self._sync_again:
+            self._sync_again = False
+            self.request_sync()
+
+    def _sync_failed(self, error):
+        logger.error(f"خطا در بروزرسانی نمایه جستجو: {error}")
+        self._sync_task = None
+        self._sync_again = False
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    # --- جستجو ---
+
+    def _rank(self, cursor, match, kinds, limit, offset=0):
+        """(rowid، امتیاز bm25) اسناد منطبق با عبارت MATCH به ترتیب رتبه"""
+        weights = ", ".join(str(FIELD_BOOSTS[field]) for field in SEARCH_FIELDS)
+        query = (
+            f"SELECT rowid, bm25({SEARCH_TABLE}, {weights}) AS score "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ?"
+        )
+        parameters = [match]
+        if kinds:
+            # نوع سند از rowid خوانده می‌شود تا ستون kind برای هر تطبیق خوانده نشود
+            codes = [SEARCH_SOURCES[kind]["code"] for kind in kinds if kind in SEARCH_SOURCES]
+            query += f" AND rowid % {KIND_SLOTS} IN ({', '.join(str(code) for code in codes)})"
+        query += " ORDER BY score LIMIT ? OFFSET ?"
+        parameters.extend((limit, offset))
+        return cursor.execute(query, parameters).fetchall()
+
+    def _document(self, cursor, rowid):
+        """(kind، source_id، dict ستون‌ها) یک سند نمایه"""
+        # خواندن با rowid بدون MATCH؛ تکرار MATCH برای snippet همه تطبیق‌ها را دوباره پیمایش می‌کند
+        row = cursor.execute(
+            f"SELECT kind, source_id, {', '.join(SEARCH_FIELDS)} FROM {SEARCH_TABLE} WHERE rowid = ?",
+            (rowid,)
+        ).fetchone()
+        return row[0], row[1], dict(zip(SEARCH_FIELDS, row[2:]))
+
+    def _display_fields(self, cursor, kind, source_id):
+        """ستون‌های سند از ردیف منبع برای نمایش عنوان و snippet
+
+        نمایه متن یکسان‌شده (بدون نیم‌فاصله، با ارقام لاتین) را نگه می‌دارد که
+        فقط برای تطبیق است. اگر ردیف منبع پیش از sync بعدی حذف شده باشد None
+        برمی‌گرداند و سند از نتایج کنار گذاشته می‌شود.
+        """
+        source = SEARCH_SOURCES[kind]
+        row = cursor.execute(
+            f"{source['select']} WHERE {source['alias']}.id = ?", (source_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(SEARCH_FIELDS, (value or "" for value in row[1:])))
+
+    def search(self, text, kinds=None, limit=20, offset=0):
+        """اسناد منطبق به ترتیب امتیاز BM25 با وزن ستون‌ها
+
+        لیستی از dictهایی با کلیدهای kind، id، title، score و snippet برمی‌گرداند؛
+        امتیاز بیشتر یعنی تطبیق بهتر. عنوان و snippet از ردیف منبع (نه متن
+        یکسان‌شده نمایه) و فقط برای نتایج صفحه جاری ساخته می‌شوند.
+        """
+        match = build_match_query(text, prefix_last_only=True, min_prefix=MIN_PREFIX)
+        if match is None:
+            return []
+
+        cursor = self.db.read_connection().cursor()
+        try:
+            results = []
+            for rowid, score in self._rank(cursor, match, kinds, limit, offset):
+                kind, source_id, _ = self._document(cursor, rowid)
+                fields = self._display_fields(cursor, kind, source_id)
+                if fields is None:
+                    continue
+                results.append({
+                    "kind": kind,
+                    "id": source_id,
+                    "title": fields["title"],
+                    "score": -score,
+                    "snippet": make_snippet(fields, text),
+                })
+        finally:
+            cursor.close()
+        return results
+
+    def _fuzzy_match(self, cursor, text):
+        """عبارت MATCH تقریبی و واژه‌های جایگزین هر کلمه {واژه: فاصله}
+
+        هر کلمه با واژه‌های نزدیک خود در عنوان، نویسندگان و برچسب‌ها (یا خود
+        کلمه در هر ستونی) OR می‌شود و کلمات با AND ترکیب می‌شوند.
+        """
+        groups = []
+        variants = []
+        for word in tokenize(text):
+            similar = dict(similar_terms(cursor, word))
+            variants.append(similar)
+            quoted = ['"{}"'.format(term.replace('"', '""')) for term in similar]
+            exact = '"{}"'.format(word.replace('"', '""'))
+            if quoted:
+                groups.append(f"({{{' '.join(FUZZY_FIELDS)}}} : ({' OR '.join(quoted)}) OR {exact})")
+            else:
+                groups.append(exact)
+        if not groups:
+            return None, []
+        return " AND ".join(groups), variants
+
+    def fuzzy_search(self, text, kinds=None, limit=20, offset=0):
+        """جستجوی مقاوم در برابر غلط تایپی روی عنوان، نویسندگان و برچسب‌ها
+
+        واژه‌های نامزد از نمایه trigram و با فاصله ویرایشی محدود انتخاب می‌شوند؛
+        سپس حداکثر FUZZY_CANDIDATES سند با bm25 رتبه‌بندی و امتیاز هر کدام بر
+        مجموع فاصله ویرایشی کلمات تقسیم می‌شود. خروجی مانند search است به
+        اضافه کلید distance.
+        """
+        cursor = self.db.read_connection().cursor()
+        try:
+            match, variants = self._fuzzy_match(cursor, text)
+            if match is None:
+                return []
+            scored = []
+            for rowid, score in self._rank(cursor, match, kinds, max(FUZZY_CANDIDATES, offset + limit)):
+                kind, source_id, fields = self._document(cursor, rowid)
+                words = terms_of(fields[field] for field in FUZZY_FIELDS)
+                distance = 0
+                for similar in variants:
+                    found = [similar[term] for term in words.intersection(similar)]
+                    # کلمه‌ای که فقط در متن بدنه پیدا شده دقیق بوده است
+                    distance += min(found) if found else 0
+                scored.append((distance, score / (1 + distance), kind, source_id, fields))
+            scored.sort(key=lambda item: (item[0], item[1]))
+            # snippet با نزدیک‌ترین واژه هر کلمه ساخته می‌شود تا واژه اصلاح‌شده علامت بخورد
+            highlight = " ".join(min(similar, key=similar.get) for similar in variants if similar) or text
+            results = []
+            for distance, score, kind, source_id, _ in scored[offset:offset + limit]:
+                fields = self._display_fields(cursor, kind, source_id)
+                if fields is None:
+                    continue
+                results.append({
+                    "kind": kind,
+                    "id": source_id,
+                    "title": fields["title"],
+                    "score": -score,
+                    "distance": distance,
+                    "snippet": make_snippet(fields, highlight),
+                })
+        finally:
+            cursor.close()
+        return results
+
+    def fuzzy_ids(self, kind, text, limit=FUZZY_CANDIDATES):
+        """شناسه ردیف‌های یک جدول منبع که به طور تقریبی با text منطبق‌اند"""
+        return [item["id"] for item in self.fuzzy_search(text, kinds=[kind], limit=limit)]
+
+    def document_count(self):
+        row = self.db.fetch_one(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")
+        return row[0] if row else 0
@@ -0,0 +1,11 @@
+# research_assistant/core/statuses.py
+
+# مقادیر ستون status در جدول‌های papers و datasheets
+STATUSES = {
+    "read": "خوانده شده",
+    "reading": "در حال مطالعه",
+    "planned": "برنامه‌ریزی شده",
+}
+
+# دکمه‌های فیلتر وضعیت: (کلید، برچسب، مقدار ستون status)؛ None یعنی همه
+STATUS_FILTERS = [('all', "همه", None)] + [(key, value, value) for key, value in STATUSES.items()]
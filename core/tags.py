@@ -0,0 +1,280 @@
+# research_assistant/core/tags.py
+import string
+import logging
+
+from core.index_deferral import ensure_deferral_schema, not_deferred
+from core.text_normalizer import REMOVED_CHARS, normalize_text, sql_normalize_select
+
+logger = logging.getLogger(__name__)
+
+# جدول‌هایی که ستون متنی tags دارند و برچسب‌هایشان در tag_links ثبت می‌شود
+TAGGED_TABLES = ("papers", "datasheets")
+
+# ترکیب چند برچسب در فیلتر
+TAG_MODES = ("and", "or")
+
+# جداکننده‌های سفیدی که مانند فاصله با آن‌ها رفتار می‌شود (همان replace در triggerها)
+_TAG_SPACES = str.maketrans("\t\r\n", "   ")
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def ensure_tag_schema(cursor):
+    """جدول برچسب‌ها و جدول ارتباط چندبه‌چند آن‌ها با ردیف‌ها
+
+    name شکل نمایشی اولین بار ثبت برچسب و normalized کلید یکتای آن (tag_key)
+    است. کلید اصلی (tag_id, table_name, row_id) فیلتر بر اساس برچسب و ایندکس
+    (table_name, row_id) خواندن برچسب‌های یک ردیف را پوشش می‌دهند.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tags (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            normalized TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tag_links (
+            tag_id INTEGER NOT NULL REFERENCES tags (id),
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            PRIMARY KEY (tag_id, table_name, row_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tag_links_row ON tag_links (table_name, row_id)")
+
+
+def split_tags(text):
+    """برچسب‌های جداشده با کاما، بدون فاصله اضافه و تکرار
+
+    مانند triggerها tab و خط جدید فاصله حساب می‌شوند.
+    """
+    tags = []
+    for tag in (text or "").translate(_TAG_SPACES).split(","):
+        tag = tag.strip(" ")
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def tag_key(name):
+    """کلید یکتای برچسب؛ همان مقداری که triggerها در tags.normalized می‌نویسند
+
+    lower در SQLite فقط حروف ASCII را کوچک می‌کند، پس اینجا هم فقط همان‌ها
+    کوچک می‌شوند.
+    """
+    text = normalize_text((name or "").translate(_TAG_SPACES).strip(" ")) or ""
+    return text.strip(" ").translate(_ASCII_LOWER)
+
+
+def parse_tag_filter(text):
+    """تبدیل متن فیلتر برچسب به (لیست برچسب‌ها، حالت)
+
+    «a, b» یعنی هر دو برچسب (and) و «a | b» یعنی هر کدام (or).
+    """
+    text = text or ""
+    if "|" in text:
+        return [tag.strip() for tag in text.split("|") if tag.strip()], "or"
+    return split_tags(text), "and"
+
+
+def _split_select(tags, row_id, source=None):
+    """SELECT (row_id، name، normalized) برچسب‌های متن tags فقط با توابع داخلی SQLite
+
+    triggerها نمی‌توانند CTE داشته باشند، پس متن با json_quote به یک رشته JSON
+    و با تبدیل کاماها به «","» به آرایه تبدیل و با json_each تقسیم می‌شود.
+    """
+    spaced = f"COALESCE({tags}, '')"
+    # tab و خط جدید مانند split_tags فاصله حساب می‌شوند
+    for char in ("\t", "\r", "\n"):
+        spaced = f"replace({spaced}, '{char}', ' ')"
+    separator = '","'
+    each = f"json_each('[' || replace(json_quote({spaced}), ',', '{separator}') || ']')"
+    # کلید برچسبی که فقط از فاصله و حروف حذف‌شدنی (نیم‌فاصله، اعراب) ساخته شده خالی
+    # است؛ این شرط روی متن خام بررسی می‌شود، چون هر ارجاع به ستون یکسان‌شده پس از
+    # ادغام subqueryها کل عبارت replace را تکرار می‌کند
+    blank = "' " + REMOVED_CHARS + "'"
+    normalized = sql_normalize_select(
+        [("row_id", row_id), ("name", "trim(json_each.value, ' ')"), ("normalized", "json_each.value")],
+        f"{f'{source}, {each}' if source else each} WHERE trim(json_each.value, {blank}) != ''",
+        keep=("row_id", "name")
+    )
+    return f"SELECT row_id, name, lower(trim(normalized, ' ')) AS normalized FROM ({normalized})"
+
+
+def _link_statements(table, tags, row_id, source=None):
+    """دستورهای ثبت برچسب‌های جدید و ارتباط ردیف‌ها با آن‌ها"""
+    split = _split_select(tags, row_id, source)
+    return [
+        f"INSERT OR IGNORE INTO tags (name, normalized) SELECT name, normalized FROM ({split})",
+        f"INSERT OR IGNORE INTO tag_links (tag_id, table_name, row_id) "
+        f"SELECT t.id, '{table}', s.row_id FROM ({split}) s JOIN tags t ON t.normalized = s.normalized",
+    ]
+
+
+def ensure_tag_triggers(cursor):
+    """triggerهایی که tag_links را در همان تراکنش نوشتن ردیف به روز نگه می‌دارند
+
+    ستون متنی tags منبع اصلی است؛ هر کلاینتی که در جدول بنویسد (برنامه، API،
+    sqlite3) ارتباط‌ها را هم‌زمان بروز می‌کند و فیلترها هیچ‌وقت عقب نمی‌مانند.
+    برچسب‌های بدون ارتباط در tags می‌مانند و در backfill بعدی پاک می‌شوند.
+    نوشتن‌های دسته‌ای برنامه به جای triggerهای درج و ویرایش از link_rows
+    استفاده می‌کنند.
+    """
+    ensure_deferral_schema(cursor)
+    for table in TAGGED_TABLES:
+        insert = ";\n".join(_link_statements(table, "new.tags", "new.id"))
+        unlink = f"DELETE FROM tag_links WHERE table_name = '{table}' AND row_id = old.id"
+        cursor.execute(f"DROP TRIGGER IF EXISTS {table}_tags_ai")
+        cursor.execute(f"DROP TRIGGER IF EXISTS {table}_tags_au")
+        cursor.execute(f"DROP TRIGGER IF EXISTS {table}_tags_ad")
+        cursor.execute(f"""
+            CREATE TRIGGER {table}_tags_ai AFTER INSERT ON {table} WHEN {not_deferred(table)} BEGIN
+                {insert};
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER {table}_tags_au AFTER UPDATE OF id, tags ON {table}
+            WHEN old.id != new.id OR {not_deferred(table)} BEGIN
+                {unlink};
+                {insert};
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER {table}_tags_ad AFTER DELETE ON {table} BEGIN
+                {unlink};
+            END
+        """)
+
+
+def link_rows(cursor, table, ids):
+    """ساخت دوباره ارتباط برچسب‌های ردیف‌ها در پایتون؛ معادل triggerهای درج و ویرایش
+
+    نام نمایشی و کلید هر برچسب همان split_tags و tag_key است که triggerها در
+    SQL محاسبه می‌کنند.
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        rows = cursor.execute(
+            f"SELECT id, tags FROM {table} WHERE id IN ({', '.join('?' for _ in chunk)})", chunk
+        ).fetchall()
+        names = {}
+        links = []
+        # برچسب‌های یک دسته معمولاً تکراری‌اند؛ کلید هر نام یک بار محاسبه می‌شود
+        key_of = {}
+        for row_id, text in rows:
+            for name in split_tags(text):
+                key = key_of.get(name)
+                if key is None:
+                    key = key_of[name] = tag_key(name)
+                if key:
+                    names.setdefault(key, name)
+                    links.append((key, row_id))
+
+        cursor.executemany(
+            "DELETE FROM tag_links WHERE table_name = ? AND row_id = ?", ((table, row_id) for row_id in chunk)
+        )
+        if not links:
+            continue
+        cursor.executemany(
+            "INSERT OR IGNORE INTO tags (name, normalized) VALUES (?, ?)",
+            ((name, key) for key, name in names.items())
+        )
+        keys = list(names)
+        tag_ids = {}
+        for key_start in range(0, len(keys), 500):
+            key_chunk = keys[key_start:key_start + 500]
+            tag_ids.update(cursor.execute(
+                f"SELECT normalized, id FROM tags WHERE normalized IN ({', '.join('?' for _ in key_chunk)})",
+                key_chunk
+            ).fetchall())
+        cursor.executemany(
+            "INSERT OR IGNORE INTO tag_links (tag_id, table_name, row_id) VALUES (?, ?, ?)",
+            ((tag_ids[key], table, row_id) for key, row_id in links)
+        )
+
+
+def backfill(cursor, table=None):
+    """ساخت دوباره ارتباط برچسب‌ها از ستون‌های متنی tags"""
+    for name in ((table,) if table else TAGGED_TABLES):
+        cursor.execute("DELETE FROM tag_links WHERE table_name = ?", (name,))
+        for statement in _link_statements(name, "r.tags", "r.id", f"{name} r"):
+            cursor.execute(statement)
+    # برچسب‌هایی که دیگر به هیچ ردیفی متصل نیستند
+    cursor.execute("DELETE FROM tags WHERE id NOT IN (SELECT tag_id FROM tag_links)")
+
+
+def tag_filter(table, id_column, tags, mode="and"):
+    """شرط SQL و پارامترهای فیلتر ردیف‌ها بر اساس برچسب با استفاده از ایندکس‌ها
+
+    در حالت or ردیف‌هایی با حداقل یکی از برچسب‌ها و در حالت and ردیف‌هایی
+    با همه برچسب‌ها انتخاب می‌شوند. در هر دو حالت برای هر برچسب فقط بخش
+    مربوط به آن از کلید اصلی tag_links خوانده می‌شود؛ حالت and اشتراک
+    (INTERSECT) یک subquery برای هر برچسب است، چون GROUP BY روی row_id
+    planner را به پیمایش همه ارتباط‌های جدول با idx_tag_links_row می‌کشاند.
+    """
+    keys = list(dict.fromkeys(tag_key(tag) for tag in tags if tag_key(tag)))
+    if not keys:
+        return "1=1", []
+    if mode not in TAG_MODES:
+        raise ValueError(f"حالت فیلتر برچسب نامعتبر: {mode}")
+    if mode == "or" or len(keys) == 1:
+        placeholders = ", ".join("?" for _ in keys)
+        condition = (
+            f"{id_column} IN (SELECT l.row_id FROM tags t "
+            f"JOIN tag_links l ON l.tag_id = t.id AND l.table_name = ? "
+            f"WHERE t.normalized IN ({placeholders}))"
+        )
+        return condition, [table, *keys]
+
+    per_tag = (
+        "SELECT row_id FROM tag_links "
+        "WHERE tag_id = (SELECT id FROM tags WHERE normalized = ?) AND table_name = ?"
+    )
+    condition = f"{id_column} IN ({' INTERSECT '.join(per_tag for _ in keys)})"
+    params = []
+    for key in keys:
+        params.extend((key, table))
+    return condition, params
+
+
+def suggest_tags(db, prefix, table=None, limit=10):
+    """پیشنهاد برچسب‌هایی که با prefix شروع می‌شوند، به ترتیب تعداد استفاده
+
+    جستجوی پیشوند یک بازه روی ایندکس یکتای normalized است.
+    """
+    key = tag_key(prefix)
+    if not key:
+        return []
+    query = """
+        SELECT t.name, COUNT(l.row_id) AS uses
+        FROM tags t LEFT JOIN tag_links l ON l.tag_id = t.id {link_filter}
+        WHERE t.normalized >= ? AND t.normalized < ?
+        GROUP BY t.id
+        HAVING uses > 0
+        ORDER BY uses DESC, t.name
+        LIMIT ?
+    """
+    params = []
+    link_filter = ""
+    if table:
+        link_filter = "AND l.table_name = ?"
+        params.append(table)
+    params.extend((key, key + "\U0010ffff", limit))
+    return [row[0] for row in db.fetch_all(query.format(link_filter=link_filter), params)]
+
+
+def tag_counts(db, table, limit=None):
+    """تعداد ردیف‌های هر برچسب (برای ابر برچسب) بدون split در پایتون"""
+    query = """
+        SELECT t.name, COUNT(*) AS uses
+        FROM tag_links l JOIN tags t ON t.id = l.tag_id
+        WHERE l.table_name = ?
+        GROUP BY l.tag_id
+        ORDER BY uses DESC, t.name
+    """
+    params = [table]
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+    return db.fetch_all(query, params)
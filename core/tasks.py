@@ -0,0 +1,167 @@
+# research_assistant/core/tasks.py
+import os
+import queue
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError
+
+logger = logging.getLogger(__name__)
+
+
+class Task:
+    """یک کار پس‌زمینه: future به همراه لغو و گزارش پیشرفت
+
+    تابع‌هایی که با with_task=True ارسال می‌شوند این شیء را به عنوان اولین
+    آرگومان دریافت می‌کنند تا با report پیشرفت را گزارش دهند و با بررسی
+    cancelled در صورت لغو زودتر خارج شوند.
+    """
+
+    def __init__(self, service, name, on_result=None, on_error=None, on_progress=None):
+        self.service = service
+        self.name = name
+        self.future = None
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """لغو کار؛ اگر هنوز شروع نشده اجرا نمی‌شود و در هر حال نتیجه‌اش تحویل داده نمی‌شود"""
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def report(self, progress, message=None):
+        """گزارش پیشرفت (عددی بین 0 و 1 یا شمارنده) از thread کار"""
+        if self.on_progress and not self.cancelled:
+            self.service._post(self, "progress", (progress, message))
+
+
+class TaskService:
+    """اجرای کارهای پس‌زمینه و تحویل نتیجه به thread رابط کاربری
+
+    کارهای I/O و پایگاه داده در یک thread pool محدود و کارهای سنگین CPU
+    (مثل پردازش متن) در یک process pool اجرا می‌شوند. همه callbackها
+    (نتیجه، خطا، پیشرفت) از یک صف واحد و با after در thread رابط کاربری
+    فراخوانی می‌شوند، پس ماژول‌ها هیچ‌وقت مستقیماً از thread دیگری به Tk دست نمی‌زنند.
+    """
+
+    POLL_MS = 30
+
+    def __init__(self, root, max_threads=4, max_processes=None):
+        self.root = root
+        self.max_threads = max_threads
+        self.max_processes = max_processes or max(1, min(2, (os.cpu_count() or 2) - 1))
+        self._threads = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="task")
+        self._processes = None
+        self._messages = queue.Queue()
+        self._pending = set()
+        self._poller = None
+        self._closed = False
+
+    def run_in_thread(self, fn, *args, name=None, on_result=None, on_error=None,
+                      on_progress=None, with_task=False, **kwargs):
+        """اجرای fn در thread pool؛ شیء Task برمی‌گرداند"""
+        task = Task(self, name or getattr(fn, "__name__", "task"), on_result, on_error, on_progress)
+        if with_task:
+            args = (task,) + args
+        return self._submit(task, self._threads, fn, args, kwargs)
+
+    def run_in_process(self, fn, *args, name=None, on_result=None, on_error=None, **kwargs):
+        """اجرای fn در process pool برای کارهای سنگین CPU
+
+        fn و آرگومان‌ها باید قابل pickle باشند (تابع سطح ماژول). لغو فقط پیش از
+        شروع اجرا مؤثر است؛ پس از آن فقط تحویل نتیجه حذف می‌شود.
+        """
+        if self._processes is None:
+            # spawn به جای fork: فرزند نباید وضعیت Tk و threadهای والد را به ارث ببرد
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.max_processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        task = Task(self, name or getattr(fn, "__name__", "task"), on_result, on_error)
+        return self._submit(task, self._processes, fn, args, kwargs)
+
+    def _submit(self, task, executor, fn, args, kwargs):
+        if self._closed:
+            raise RuntimeError("TaskService بسته شده است")
+        task.future = executor.submit(fn, *args, **kwargs)
+        self._pending.add(task)
+        task.future.add_done_callback(lambda future: self._post(task, "done", None))
+        self._schedule_poll()
+        return task
+
+    def _post(self, task, kind, payload):
+        self._messages.put((task, kind, payload))
+
+    def _schedule_poll(self):
+        if self._poller is None and not self._closed:
+            self._poller = self.root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poller = None
+        while True:
+            try:
+                task, kind, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if not task.cancelled and task.on_progress:
+                    self._call(task, task.on_progress, *payload)
+            else:
+                self._pending.discard(task)
+                self._deliver(task)
+
+        if self._pending:
+            self._schedule_poll()
+
+    def _deliver(self, task):
+        if task.cancelled:
+            return
+        try:
+            result = task.future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            if task.on_error:
+                self._call(task, task.on_error, e)
+            else:
+                logger.error(f"خطا در کار پس‌زمینه {task.name}: {e}")
+            return
+        if task.on_result:
+            self._call(task, task.on_result, result)
+
+    def _call(self, task, callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"خطا در callback کار {task.name}: {e}")
+
+    def cancel_all(self):
+        """لغو همه کارهای در جریان"""
+        for task in list(self._pending):
+            task.cancel()
+
+    def shutdown(self):
+        """توقف poolها بدون انتظار برای کارهای در جریان"""
+        if self._closed:
+            return
+        self._closed = True
+        self.cancel_all()
+        if self._poller is not None:
+            try:
+                self.root.after_cancel(self._poller)
+            except Exception:
+                pass
+            self._poller = None
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,104 @@
+# research_assistant/core/text_normalizer.py
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# یکسان‌سازی حروف عربی با معادل فارسی و ارقام فارسی/عربی با ارقام لاتین
+_CHAR_MAP = {
+    "\u064a": "\u06cc",  # ي -> ی
+    "\u0649": "\u06cc",  # ى -> ی
+    "\u0643": "\u06a9",  # ك -> ک
+    "\u0629": "\u0647",  # ة -> ه
+    "\u06c0": "\u0647",  # ۀ -> ه
+    "\u0623": "\u0627",  # أ -> ا
+    "\u0625": "\u0627",  # إ -> ا
+    "\u0671": "\u0627",  # ٱ -> ا
+    "\u0624": "\u0648",  # ؤ -> و
+}
+_CHAR_MAP.update({chr(0x06F0 + digit): str(digit) for digit in range(10)})
+_CHAR_MAP.update({chr(0x0660 + digit): str(digit) for digit in range(10)})
+# نیم‌فاصله، اتصال‌دهنده و کشیده حذف می‌شوند تا «می‌خواهم» و «میخواهم» یکی شوند
+for _char in ("\u200c", "\u200d", "\u0640", "\u200e", "\u200f"):
+    _CHAR_MAP[_char] = None
+# اعراب (فتحه، کسره، تنوین، تشدید، سکون و الف مقصوره کوچک)
+for _code in list(range(0x064B, 0x0660)) + [0x0670]:
+    _CHAR_MAP[chr(_code)] = None
+_TRANSLATION = str.maketrans(_CHAR_MAP)
+# حروفی که normalize_text حذف می‌کند
+REMOVED_CHARS = "".join(char for char, replacement in _CHAR_MAP.items() if replacement is None)
+
+# حداکثر replace تو در تو در هر مرحله sql_normalize_select؛ هر subquery بیرونی
+# (مثلاً در triggerهای برچسب) هم از همان عمق parser مصرف می‌کند
+_SQL_NESTING = 12
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_PERSIAN_RE = re.compile("[\u0600-\u06ff\u0750-\u077f\ufb50-\ufdff\ufe70-\ufeff]")
+
+
+def normalize_text(text):
+    """یکسان‌سازی حروف، ارقام و نیم‌فاصله؛ حروف بزرگ و کوچک تغییر نمی‌کنند
+
+    خروجی فقط برای تطبیق و نمایه است (نیم‌فاصله حذف و ارقام لاتین می‌شوند)
+    و نباید به جای متن اصلی نمایش داده شود؛ برای مقایسه در پایتون از fold
+    استفاده کنید.
+    """
+    if not text:
+        return text
+    text = str(text)
+    # همه حروف جدول جایگزینی غیر ASCII هستند
+    if text.isascii():
+        return text
+    return text.translate(_TRANSLATION)
+
+
+def fold(text):
+    """شکل قابل مقایسه متن: normalize_text و سپس حروف کوچک"""
+    if not text:
+        return ""
+    return str(text).translate(_TRANSLATION).casefold()
+
+
+def tokenize(text):
+    """کلمات متن پس از fold؛ تنها توکن‌سازی مشترک جستجو و تحلیل"""
+    return _TOKEN_RE.findall(fold(text))
+
+
+def is_persian(text):
+    """بیش از نیمی از حروف غیر فاصله متن فارسی/عربی باشند"""
+    if not text or not text.strip():
+        return False
+    total_chars = sum(1 for char in text if not char.isspace())
+    persian_chars = len(_PERSIAN_RE.findall(text))
+    return (persian_chars / total_chars) > 0.5
+
+
+def sql_normalize_select(columns, source=None, keep=()):
+    """SELECT معادل normalize_text روی ستون‌ها فقط با replace داخلی SQLite
+
+    columns لیست (نام، عبارت SQL) است و ستون‌های keep بدون تغییر برمی‌گردند؛
+    source ادامه SELECT داخلی پس از FROM است (جدول‌ها و در صورت نیاز WHERE).
+    triggerها نباید به تابع‌های ثبت‌شده روی اتصال‌های برنامه وابسته باشند،
+    چون هر ابزار دیگری (sqlite3، DB Browser، اسکریپت پشتیبان) که در جدول‌ها
+    می‌نویسد همین triggerها را اجرا می‌کند؛ درج‌های دسته‌ای برنامه از آن‌ها
+    رد می‌شوند و با normalize_text نمایه می‌شوند. parser SQLite فقط حدود ۳۰
+    تابع تو در تو را می‌پذیرد، پس جایگزینی‌ها در چند subquery انجام می‌شوند
+    که بهینه‌ساز آن‌ها را دوباره در یک عبارت ادغام می‌کند.
+    """
+    names = [name for name, _ in columns]
+    query = "SELECT " + ", ".join(f"{expression} AS {name}" for name, expression in columns)
+    if source:
+        query += f" FROM {source}"
+
+    replacements = sorted(_CHAR_MAP.items())
+    for start in range(0, len(replacements), _SQL_NESTING):
+        outer = []
+        for name in names:
+            expression = name
+            if name not in keep:
+                for char, replacement in replacements[start:start + _SQL_NESTING]:
+                    # رشته ثابت به جای char()؛ ثابت‌های محاسبه‌شده در هر اجرای trigger دوباره ساخته می‌شوند
+                    expression = f"replace({expression}, '{char}', '{replacement or ''}')"
+            outer.append(f"{expression} AS {name}")
+        query = f"SELECT {', '.join(outer)} FROM ({query})"
+    return query
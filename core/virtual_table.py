@@ -0,0 +1,383 @@
+# research_assistant/core/virtual_table.py
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _PagedSource:
+    """پایه منابع داده جدول مجازی با کش صفحه‌ها
+
+    ردیف اول هر ردیف بازگشتی شناسه آن است و به عنوان iid در Treeview استفاده می‌شود.
+    """
+
+    def __init__(self, page_size=100, cache_pages=10):
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self._pages = OrderedDict()
+        self._count = None
+
+    def count(self):
+        """تعداد کل ردیف‌های منبع"""
+        if self._count is None:
+            self._count = self._load_count()
+        return self._count
+
+    def invalidate(self):
+        """پاک کردن کش تا داده‌ها در درخواست بعدی دوباره خوانده شوند"""
+        self._pages.clear()
+        self._count = None
+
+    def rows(self, offset, limit):
+        """ردیف‌های بازه [offset, offset + limit)"""
+        if limit <= 0:
+            return []
+        first_page = offset // self.page_size
+        last_page = (offset + limit - 1) // self.page_size
+        result = []
+        for page in range(first_page, last_page + 1):
+            result.extend(self._page(page))
+        start = offset - first_page * self.page_size
+        return result[start:start + limit]
+
+    def _page(self, page):
+        if page in self._pages:
+            self._pages.move_to_end(page)
+            return self._pages[page][0]
+        rows, keys = self._load_page(page)
+        self._pages[page] = (rows, keys)
+        while len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+        return rows
+
+    def _cached_keys(self, page):
+        entry = self._pages.get(page)
+        return entry[1] if entry and entry[1] else None
+
+    def anchor(self, offset):
+        """کلید ردیف موجود در offset (از کش) برای بازیابی موقعیت پس از تغییر داده‌ها"""
+        entry = self._pages.get(offset // self.page_size)
+        if not entry:
+            return None
+        rows, keys = entry
+        index = offset % self.page_size
+        if index >= len(rows):
+            return None
+        return keys[index] if keys else rows[index][0]
+
+    def locate(self, anchor):
+        """موقعیت فعلی ردیفی با کلید anchor (یا جایی که باید باشد)"""
+        return None
+
+    def _load_count(self):
+        raise NotImplementedError
+
+    def _load_page(self, page):
+        """بازگرداندن (ردیف‌ها، کلیدهای ترتیب هر ردیف)"""
+        raise NotImplementedError
+
+
+class KeysetSource(_PagedSource):
+    """منبع داده با صفحه‌بندی keyset روی یک کوئری SQL
+
+    select ستون‌های نمایش داده‌شده است (ستون اول شناسه ردیف) و from_where شامل
+    FROM و یک عبارت WHERE است. sort_keys عبارت‌های ترتیب هستند و آخرین آن‌ها
+    باید یکتا باشد. صفحه‌های مجاور از روی کلید آخرین/اولین ردیف صفحه کناری
+    خوانده می‌شوند و فقط پرش مستقیم با نوار اسکرول به OFFSET نیاز دارد.
+    """
+
+    def __init__(self, db, select, from_where, params=(), sort_keys=("id",),
+                 descending=True, page_size=100, cache_pages=10):
+        super().__init__(page_size, cache_pages)
+        self.db = db
+        self.select = select
+        self.from_where = from_where
+        self.params = list(params)
+        self.sort_keys = list(sort_keys)
+        self.descending = descending
+
+    def _load_count(self):
+        row = self.db.fetch_one(f"SELECT COUNT(*) {self.from_where}", self.params)
+        return row[0] if row else 0
+
+    def _query(self, key=None, forward=True, offset=None):
+        width = len(self.sort_keys)
+        descending = self.descending if forward else not self.descending
+        direction = "DESC" if descending else "ASC"
+        query = f"SELECT {', '.join(self.sort_keys)}, {self.select} {self.from_where}"
+        params = list(self.params)
+        if key is not None:
+            operator = "<" if descending else ">"
+            query += f" AND ({', '.join(self.sort_keys)}) {operator} ({', '.join('?' * width)})"
+            params.extend(key)
+        query += " ORDER BY " + ", ".join(f"{expr} {direction}" for expr in self.sort_keys)
+        query += " LIMIT ?"
+        params.append(self.page_size)
+        if offset:
+            query += " OFFSET ?"
+            params.append(offset)
+
+        rows = self.db.fetch_all(query, params)
+        if not forward:
+            rows.reverse()
+        return [row[width:] for row in rows], [row[:width] for row in rows]
+
+    def locate(self, anchor):
+        operator = "<" if not self.descending else ">"
+        row = self.db.fetch_one(
+            f"SELECT COUNT(*) {self.from_where} "
+            f"AND ({', '.join(self.sort_keys)}) {operator} ({', '.join('?' * len(anchor))})",
+            self.params + list(anchor)
+        )
+        return row[0] if row else None
+
+    def _load_page(self, page):
+        previous = self._cached_keys(page - 1)
+        following = self._cached_keys(page + 1)
+        if page == 0:
+            return self._query()
+        if previous is not None and len(previous) == self.page_size:
+            return self._query(key=previous[-1])
+        if following is not None:
+            return self._query(key=following[0], forward=False)
+        return self._query(offset=page * self.page_size)
+
+
+class IdListSource(_PagedSource):
+    """منبع داده بر اساس لیست مرتب شناسه‌ها (مثلاً نتایج رتبه‌بندی‌شده جستجو)
+
+    فقط شناسه‌ها در حافظه نگه داشته می‌شوند و ردیف‌های هر صفحه با یک
+    کوئری IN از پایگاه داده خوانده می‌شوند.
+    """
+
+    def __init__(self, db, ids, select, from_table, id_column="id",
+                 page_size=100, cache_pages=10):
+        super().__init__(page_size, cache_pages)
+        self.db = db
+        self.ids = list(ids)
+        self.select = select
+        self.from_table = from_table
+        self.id_column = id_column
+
+    def _load_count(self):
+        return len(self.ids)
+
+    def locate(self, anchor):
+        try:
+            return self.ids.index(anchor)
+        except ValueError:
+            return None
+
+    def _load_page(self, page):
+        page_ids = self.ids[page * self.page_size:(page + 1) * self.page_size]
+        if not page_ids:
+            return [], None
+        rows = self.db.fetch_all(
+            f"SELECT {self.select} FROM {self.from_table} "
+            f"WHERE {self.id_column} IN ({', '.join('?' * len(page_ids))})",
+            page_ids
+        )
+        by_id = {row[0]: row for row in rows}
+        return [by_id[row_id] for row_id in page_ids if row_id in by_id], None
+
+
+class VirtualTable(ttk.Frame):
+    """جدول مجازی بر پایه ttk.Treeview
+
+    فقط ردیف‌های قابل مشاهده در Treeview ساخته می‌شوند؛ با اسکرول، ردیف‌های
+    خارج‌شده حذف و ردیف‌های جدید از منبع داده (با کش صفحه‌ها) درج می‌شوند.
+    iid هر ردیف برابر شناسه آن در پایگاه داده است.
+    """
+
+    WHEEL_ROWS = 3
+
+    def __init__(self, parent, columns, **tree_options):
+        super().__init__(parent)
+        self._source = None
+        self._total = 0
+        self._offset = 0
+        self._visible_rows = 25
+        self._rendered = OrderedDict()
+        self._selection = set()
+
+        # اسکرول بار عمودی
+        self.v_scrollbar = ttk.Scrollbar(self, command=self._on_scrollbar)
+        self.v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # اسکرول بار افقی
+        self.h_scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL)
+        self.h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+
+        tree_options.setdefault("show", "headings")
+        self.tree = ttk.Treeview(
+            self,
+            columns=columns,
+            xscrollcommand=self.h_scrollbar.set,
+            **tree_options
+        )
+        self.h_scrollbar.config(command=self.tree.xview)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_rows(-self.WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_rows(self.WHEEL_ROWS))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        for key, delta in (("<Up>", -1), ("<Down>", 1)):
+            self.tree.bind(key, lambda e, d=delta: self._move_selection(d))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible_rows))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible_rows))
+        self.tree.bind("<Home>", lambda e: self._move_selection(-self._total))
+        self.tree.bind("<End>", lambda e: self._move_selection(self._total))
+
+    @property
+    def total(self):
+        """تعداد کل ردیف‌های منبع فعلی"""
+        return self._total
+
+    def set_source(self, source, keep_position=False):
+        """تنظیم منبع داده جدید؛ به طور پیش‌فرض به ابتدای جدول برمی‌گردد"""
+        anchor = self._current_anchor() if keep_position else None
+        self._source = source
+        if not keep_position:
+            self._offset = 0
+            self._selection.clear()
+        # منبع جدید ممکن است از قبل (مثلاً در thread پس‌زمینه) صفحه اول را خوانده باشد
+        self._reload(anchor, invalidate=False)
+
+    def refresh(self):
+        """خواندن دوباره داده‌ها با حفظ موقعیت اسکرول و انتخاب
+
+        پنجره فعلی دوباره خوانده می‌شود ولی در Treeview فقط ردیف‌هایی که
+        درج، حذف، جابه‌جا یا ویرایش شده‌اند لمس می‌شوند.
+        """
+        if self._source is None:
+            return
+        anchor = self._current_anchor()
+        self._reload(anchor)
+
+    def _current_anchor(self):
+        if self._source is None or not self._rendered:
+            return None
+        return self._source.anchor(self._offset)
+
+    def _reload(self, anchor=None, invalidate=True):
+        if invalidate:
+            self._source.invalidate()
+        self._total = self._source.count()
+        if anchor is not None:
+            position = self._source.locate(anchor)
+            if position is not None:
+                self._offset = position
+        self.render()
+
+    def render(self):
+        """همگام‌سازی ردیف‌های Treeview با پنجره قابل مشاهده"""
+        max_offset = max(0, self._total - self._visible_rows)
+        self._offset = min(max(0, self._offset), max_offset)
+        rows = self._source.rows(self._offset, self._visible_rows) if self._source else []
+
+        wanted = OrderedDict((str(row[0]), row) for row in rows)
+        removed = [iid for iid in self._rendered if iid not in wanted]
+        if removed:
+            self.tree.delete(*removed)
+
+        # ترتیب فعلی ردیف‌های باقی‌مانده در Treeview؛ فقط اختلاف‌ها به Tk فرستاده می‌شوند
+        order = [iid for iid in self._rendered if iid in wanted]
+        for index, (iid, row) in enumerate(wanted.items()):
+            if iid in self._rendered:
+                if self._rendered[iid] != row:
+                    self.tree.item(iid, values=row)
+                if order[index] != iid:
+                    self.tree.move(iid, "", index)
+                    order.remove(iid)
+                    order.insert(index, iid)
+            else:
+                self.tree.insert("", index, iid=iid, values=row)
+                order.insert(index, iid)
+        self._rendered = wanted
+
+        visible_selection = [iid for iid in self._selection if iid in wanted]
+        if tuple(visible_selection) != self.tree.selection():
+            self.tree.selection_set(visible_selection)
+        self._update_scrollbar()
+
+    def scroll_rows(self, delta):
+        """اسکرول به اندازه delta ردیف"""
+        self._offset += delta
+        self.render()
+        return "break"
+
+    def scroll_to(self, offset):
+        """اسکرول به ردیف با اندیس offset"""
+        self._offset = offset
+        self.render()
+
+    def row_index(self, iid):
+        """اندیس ردیف در کل منبع، اگر در پنجره فعلی باشد"""
+        keys = list(self._rendered)
+        if iid in keys:
+            return self._offset + keys.index(iid)
+        return None
+
+    def _update_scrollbar(self):
+        if self._total <= 0:
+            self.v_scrollbar.set(0, 1)
+            return
+        first = self._offset / self._total
+        last = min(1.0, (self._offset + self._visible_rows) / self._total)
+        self.v_scrollbar.set(first, last)
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(int(float(args[0]) * self._total))
+        elif action == "scroll":
+            amount = int(args[0])
+            if args[1] == "pages":
+                amount *= self._visible_rows
+            self.scroll_rows(amount)
+
+    def _on_mousewheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        return self.scroll_rows(step * self.WHEEL_ROWS)
+
+    def _on_configure(self, event):
+        header, row_height = 25, 20
+        children = self.tree.get_children()
+        if children:
+            bbox = self.tree.bbox(children[0])
+            if bbox:
+                header, row_height = bbox[1], bbox[3]
+        visible = max(1, (event.height - header) // max(1, row_height))
+        if visible != self._visible_rows:
+            self._visible_rows = visible
+            self.render()
+
+    def _on_select(self, event=None):
+        visible = set(self.tree.selection())
+        if visible:
+            self._selection = visible
+        else:
+            # ردیف‌های انتخاب‌شده‌ای که از پنجره خارج شده‌اند انتخاب باقی می‌مانند
+            self._selection = {iid for iid in self._selection if iid not in self._rendered}
+
+    def _move_selection(self, delta):
+        selection = self.tree.selection()
+        current = self.row_index(selection[0]) if selection else None
+        if current is None:
+            current = self._offset - 1 if delta > 0 else self._offset + self._visible_rows
+        target = min(max(0, current + delta), max(0, self._total - 1))
+        if target < self._offset:
+            self._offset = target
+        elif target >= self._offset + self._visible_rows:
+            self._offset = target - self._visible_rows + 1
+        self.render()
+        keys = list(self._rendered)
+        index = target - self._offset
+        if 0 <= index < len(keys):
+            self._selection = {keys[index]}
+            self.tree.selection_set(keys[index])
+            self.tree.focus(keys[index])
+        return "break"
@@ -1,10 +1,42 @@
 # research_assistant/main.py
+import sys
+import argparse
 import tkinter as tk
-from core.app import ResearchAssistantApp
+from core.profiler import profiler, options_from_env
 
-def main():
+
+def parse_args(argv=None):
+    """خواندن گزینه‌های خط فرمان"""
+    parser = argparse.ArgumentParser(description="دستیار پژوهشی")
+    parser.add_argument("--profile", action="store_true",
+                        help="ثبت زمان مراحل راه‌اندازی و نوشتن گزارش JSON در پایان")
+    parser.add_argument("--profile-cprofile", action="store_true",
+                        help="ذخیره خروجی cProfile در کنار گزارش (همراه با --profile)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="ثبت مصرف حافظه با tracemalloc (همراه با --profile)")
+    parser.add_argument("--profile-out", default="resist_profile.json",
+                        help="مسیر فایل گزارش profile")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def main(argv=None):
     """نقطه ورود اصلی برنامه"""
-    root = tk.Tk()
+    args = parse_args(argv)
+    env_options = options_from_env()
+    if args.profile or env_options:
+        env_options = env_options or {}
+        profiler.start(
+            args.profile_out,
+            cprofile=args.profile_cprofile or env_options.get("cprofile", False),
+            memory=args.profile_memory or env_options.get("memory", False),
+        )
+    
+    with profiler.phase("import.app"):
+        from core.app import ResearchAssistantApp
+    
+    with profiler.phase("tk.root"):
+        root = tk.Tk()
     root.tk_setPalette(background='white')  # تنظیم پس‌زمینه سفید
     
     # تنظیمات راست‌چین برای کل برنامه
@@ -12,8 +44,18 @@ def main():
     root.option_add('*Label.anchor', 'e')  # راست‌چین کردن متن Labelها
     root.option_add('*Button.anchor', 'center')
     
-    app = ResearchAssistantApp(root)
-    root.mainloop()
+    with profiler.phase("app.init"):
+        app = ResearchAssistantApp(root)
+    
+    if profiler.enabled:
+        # اجرای رسم اولیه تا زمان اولین نمایش داشبورد ثبت شود
+        root.update()
+        profiler.mark("first_paint")
+    
+    try:
+        root.mainloop()
+    finally:
+        profiler.finish()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
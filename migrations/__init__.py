@@ -0,0 +1,2 @@
+from migrations.runner import current_version, run_migrations
+from migrations.versions import MIGRATIONS
@@ -1,35 +1,42 @@
-import sqlite3
 import os
-from pathlib import Path
+import sys
 
-def migrate_database():
-    """مهاجرت پایگاه داده به نسخه جدید"""
-    db_path = Path(__file__).parent.parent / "research_db.sqlite"
-    
-    if not db_path.exists():
+# اضافه کردن مسیر اصلی پروژه به sys.path برای اجرای مستقیم اسکریپت
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import Config
+from core.database import Database
+from migrations.runner import current_version
+
+
+def migrate_database(db_path=None):
+    """مهاجرت پایگاه داده به آخرین نسخه
+
+    مسیر پایگاه داده از config.json خوانده می‌شود مگر اینکه صریحاً داده شود.
+    مهاجرت‌ها هنگام باز شدن Database اجرا می‌شوند.
+    """
+    config = Config()
+    settings = dict(config.settings)
+    if db_path:
+        settings["database_path"] = db_path
+
+    if not os.path.exists(settings.get("database_path", "research_db.sqlite")):
         print("پایگاه داده یافت نشد. نیازی به مهاجرت نیست.")
         return
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+
+    db = Database(settings)
     try:
-        # بررسی وجود ستون url در جدول datasheets
-        cursor.execute("PRAGMA table_info(datasheets)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'url' not in columns:
-            print("اضافه کردن ستون url به جدول datasheets...")
-            cursor.execute("ALTER TABLE datasheets ADD COLUMN url TEXT")
-            conn.commit()
-            print("ستون url با موفقیت اضافه شد.")
-        else:
-            print("ستون url از قبل وجود دارد.")
-            
+        cursor = db.connection.cursor()
+        print(f"نسخه طرح پایگاه داده: {current_version(cursor)}")
+        for version, name, applied_at, duration_ms in cursor.execute(
+            "SELECT version, name, applied_at, duration_ms FROM schema_migrations ORDER BY version"
+        ):
+            print(f"  {version}. {name} ({applied_at}) - {duration_ms:.1f} ms")
     except Exception as e:
         print(f"خطا در مهاجرت پایگاه داده: {e}")
     finally:
-        conn.close()
+        db.close()
+
 
 if __name__ == "__main__":
-    migrate_database()
\ No newline at end of file
+    migrate_database(sys.argv[1] if len(sys.argv) > 1 else None)
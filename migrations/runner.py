@@ -0,0 +1,49 @@
+# research_assistant/migrations/runner.py
+import time
+import logging
+
+from migrations.versions import MIGRATIONS
+
+logger = logging.getLogger(__name__)
+
+
+def current_version(cursor):
+    """نسخه فعلی طرح پایگاه داده (PRAGMA user_version)"""
+    return cursor.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(db, migrations=MIGRATIONS):
+    """اجرای مهاجرت‌های معلق به ترتیب نسخه در یک تراکنش واحد
+
+    مدت اجرای هر مهاجرت در جدول schema_migrations ثبت می‌شود. در صورت خطا
+    کل تراکنش برگردانده می‌شود و نسخه پایگاه داده تغییری نمی‌کند.
+    لیستی از (نسخه، نام، مدت به میلی‌ثانیه) مهاجرت‌های اعمال‌شده برمی‌گرداند.
+    """
+    applied = []
+    with db.transaction() as cursor:
+        version = current_version(cursor)
+        pending = [m for m in sorted(migrations, key=lambda m: m[0]) if m[0] > version]
+        if not pending:
+            return applied
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                duration_ms REAL
+            )
+        ''')
+
+        for number, name, migrate in pending:
+            started = time.perf_counter()
+            migrate(cursor)
+            duration_ms = (time.perf_counter() - started) * 1000
+            cursor.execute(
+                "INSERT OR REPLACE INTO schema_migrations (version, name, duration_ms) VALUES (?, ?, ?)",
+                (number, name, duration_ms)
+            )
+            cursor.execute(f"PRAGMA user_version = {int(number)}")
+            applied.append((number, name, duration_ms))
+            logger.info(f"مهاجرت {number} ({name}) در {duration_ms:.1f} میلی‌ثانیه اعمال شد")
+    return applied
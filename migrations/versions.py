@@ -0,0 +1,330 @@
+# research_assistant/migrations/versions.py
+from core.fulltext import ensure_fulltext
+from core.tags import backfill as backfill_tags, ensure_tag_triggers
+
+
+def _columns(cursor, table):
+    """نام ستون‌های موجود یک جدول"""
+    return {row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def _add_missing_columns(cursor, table, columns):
+    """افزودن ستون‌هایی که هنوز در جدول وجود ندارند"""
+    existing = _columns(cursor, table)
+    for name, definition in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+def base_schema(cursor):
+    """ایجاد جداول اصلی برنامه"""
+    cursor.execute('''
+            CREATE TABLE IF NOT EXISTS datasheets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                category TEXT,
+                tags TEXT,
+                status TEXT DEFAULT 'برنامه‌ریزی شده',
+                file_path TEXT,
+                url TEXT,  -- فیلد جدید برای لینک
+                notes TEXT,
+                added_date DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+    # جدول پروژه‌های تحقیقاتی
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS research_projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT,
+            created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_date DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # جدول ارتباط پروژه‌ها و مقالات
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS research_project_mapers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER,
+            paper_id INTEGER,
+            added_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES research_projects (id),
+            FOREIGN KEY (paper_id) REFERENCES papers (id),
+            UNIQUE(project_id, paper_id)
+        )
+    ''')
+    # جدول مقالات
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS papers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            authors TEXT,
+            publication_date TEXT,
+            abstract TEXT,
+            file_path TEXT UNIQUE,
+            tags TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # جدول یادداشت‌ها
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            paper_id INTEGER,
+            content TEXT NOT NULL,
+            page_number INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (paper_id) REFERENCES papers (id)
+        )
+    ''')
+    
+    # جدول برنامه‌ریزی مطالعه
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS study_plans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            paper_id INTEGER,
+            planned_date TEXT,
+            completed BOOLEAN DEFAULT FALSE,
+            time_spent INTEGER DEFAULT 0,
+            FOREIGN KEY (paper_id) REFERENCES papers (id)
+        )
+    ''')
+
+
+def research_columns(cursor):
+    """افزودن ستون‌هایی که ماژول تحقیقات در جدول papers استفاده می‌کند"""
+    _add_missing_columns(cursor, "papers", [
+        ("journal", "TEXT"),
+        ("status", "TEXT DEFAULT 'برنامه‌ریزی شده'"),
+        ("rating", "INTEGER"),
+        ("doi", "TEXT"),
+        ("url", "TEXT"),
+        ("notes", "TEXT"),
+        ("source", "TEXT"),
+    ])
+    # پایگاه‌های داده قدیمی‌تر ممکن است ستون url را در datasheets نداشته باشند
+    _add_missing_columns(cursor, "datasheets", [("url", "TEXT")])
+
+
+def fulltext_index(cursor):
+    """جدول‌های FTS5 مقالات و دیتاشیت‌ها پس از اضافه شدن ستون‌های جدید
+
+    ساختار این نسخه ثابت نوشته شده است؛ triggerها و پر کردن نمایه با متن
+    یکسان‌شده در مهاجرت normalized_fulltext انجام می‌شود.
+    """
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+            title, authors, journal, notes, tags, url,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS datasheets_fts USING fts5(
+            title, category, tags, notes, url,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+
+
+def hot_query_indexes(cursor):
+    """ایجاد ایندکس‌های لازم برای کوئری‌های پرتکرار
+
+    جفت (project_id, paper_id) از قبل با قید UNIQUE ایندکس دارد؛ اینجا جهت
+    معکوس برای جستجوی پروژه‌های یک مقاله اضافه می‌شود.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_papers_status ON papers (status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_papers_publication_date ON papers (publication_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_datasheets_status ON datasheets (status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_datasheets_added_date ON datasheets (added_date)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_project_mapers_paper "
+        "ON research_project_mapers (paper_id, project_id)"
+    )
+    cursor.execute("ANALYZE")
+
+
+def change_log(cursor):
+    """ثبت خودکار تغییرات papers و datasheets برای بروزرسانی تدریجی
+
+    هر درج، ویرایش یا حذف یک ردیف با شماره ترتیب افزایشی در change_log ثبت
+    می‌شود تا مصرف‌کننده‌ها فقط ردیف‌های تغییرکرده پس از آخرین watermark خود
+    را بخوانند.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            operation TEXT NOT NULL,
+            changed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_change_log_table_seq ON change_log (table_name, seq)")
+    for table in ("papers", "datasheets"):
+        _change_triggers(cursor, table)
+
+
+def _change_triggers(cursor, table):
+    """triggerهای ثبت درج، ویرایش و حذف ردیف‌های یک جدول در change_log"""
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_changes_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO change_log (table_name, row_id, operation) VALUES ('{table}', new.id, 'I');
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_changes_au AFTER UPDATE ON {table} BEGIN
+            INSERT INTO change_log (table_name, row_id, operation) VALUES ('{table}', new.id, 'U');
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_changes_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO change_log (table_name, row_id, operation) VALUES ('{table}', old.id, 'D');
+        END
+    """)
+
+
+def search_index(cursor):
+    """جداول موتور جستجوی محلی و ثبت تغییرات یادداشت‌ها در change_log
+
+    خود نمایه در اولین sync موتور جستجو (در پس‌زمینه) پر می‌شود. ساختار
+    این نسخه اینجا ثابت نوشته شده تا تغییرات بعدی ensure_search_schema رفتار
+    این مهاجرت را تغییر ندهند.
+    """
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+            title, authors, tags, body, attachment,
+            kind UNINDEXED,
+            source_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attachment_text (
+            kind TEXT NOT NULL,
+            source_id INTEGER NOT NULL,
+            file_path TEXT,
+            extracted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            content TEXT,
+            PRIMARY KEY (kind, source_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_meta (
+            key TEXT PRIMARY KEY,
+            value
+        )
+    ''')
+    _change_triggers(cursor, "notes")
+
+
+def normalized_fulltext(cursor):
+    """بازسازی نمایه‌های FTS5 با متن یکسان‌شده (ی/ک عربی، نیم‌فاصله، ارقام فارسی)
+
+    triggerها از این نسخه متن یکسان‌شده را نمایه می‌کنند؛ نمایه سراسری
+    جستجو با افزایش INDEX_VERSION در sync بعدی بازسازی می‌شود. triggerهای
+    این نسخه تابعی از اتصال برنامه را فراخوانی می‌کردند، پس عمداً از
+    ensure_fulltext فعلی استفاده می‌شود: triggerها حذف و دوباره ساخته
+    می‌شوند و محتوای نمایه از جدول اصلی بازسازی می‌شود.
+    """
+    ensure_fulltext(cursor, rebuild=True)
+
+
+def fuzzy_index(cursor):
+    """جداول واژگان و trigram جستجوی تقریبی؛ در بازسازی بعدی نمایه جستجو پر می‌شوند"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fuzzy_terms (
+            id INTEGER PRIMARY KEY,
+            term TEXT NOT NULL UNIQUE,
+            length INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fuzzy_grams (
+            gram TEXT NOT NULL,
+            term_id INTEGER NOT NULL,
+            PRIMARY KEY (gram, term_id)
+        ) WITHOUT ROWID
+    ''')
+
+
+def tag_index(cursor):
+    """جدول‌های tags و tag_links
+
+    ستون tags همچنان منبع اصلی است. پر کردن جدول‌ها به tag_link_triggers
+    سپرده شده که پس از تغییر کلید برچسب‌ها هر دو جدول را از نو می‌سازد.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tags (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            normalized TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tag_links (
+            tag_id INTEGER NOT NULL REFERENCES tags (id),
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            PRIMARY KEY (tag_id, table_name, row_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tag_links_row ON tag_links (table_name, row_id)")
+
+
+def portable_fulltext_triggers(cursor):
+    """جایگزینی triggerهای FTS5 که تابع normalize_text متصل به اتصال برنامه را
+    فراخوانی می‌کردند با عبارت replace داخلی SQLite
+
+    متن نمایه‌شده تغییری نمی‌کند، پس بازسازی نمایه لازم نیست. triggerها با
+    ensure_fulltext فعلی ساخته می‌شوند؛ روی پایگاهی که normalized_fulltext
+    را در همین اجرا گذرانده فقط همان triggerها دوباره ساخته می‌شوند.
+    """
+    ensure_fulltext(cursor)
+
+
+def tag_link_triggers(cursor):
+    """نگهداری tag_links با trigger در همان تراکنش نوشتن ردیف
+
+    تا این نسخه موتور جستجو ارتباط‌ها را پس از change_log بروز می‌کرد و
+    فیلترها بلافاصله پس از نوشتن کهنه بودند. کلید برچسب‌ها هم به tag_key
+    (lower داخلی SQLite) تغییر کرده، پس جدول‌ها از نو پر می‌شوند. این تنها
+    پر کردن جدول‌های برچسب در مهاجرت‌هاست و با ensure_tag_triggers و backfill
+    فعلی اجرا می‌شود تا کلیدها با triggerهای نصب‌شده یکی باشند.
+    """
+    cursor.execute("DELETE FROM tag_links")
+    cursor.execute("DELETE FROM tags")
+    ensure_tag_triggers(cursor)
+    backfill_tags(cursor)
+
+
+def deferred_bulk_indexing(cursor):
+    """جدول index_deferrals و شرط WHEN روی triggerهای درج و ویرایش FTS5 و برچسب‌ها
+
+    نوشتن‌های دسته‌ای برنامه ردیف‌ها را پس از همه دستورها در پایتون نمایه
+    می‌کنند؛ متن نمایه‌شده تغییری نمی‌کند، پس بازسازی لازم نیست. مانند
+    مهاجرت‌های قبلی triggerها از helperهای فعلی ساخته می‌شوند و اجرای
+    دوباره آن‌ها همان triggerها را می‌سازد.
+    """
+    ensure_fulltext(cursor)
+    ensure_tag_triggers(cursor)
+
+
+# مهاجرت‌ها به ترتیب نسخه؛ نسخه جدید همیشه به انتهای لیست اضافه می‌شود
+MIGRATIONS = [
+    (1, "base_schema", base_schema),
+    (2, "research_columns", research_columns),
+    (3, "fulltext_index", fulltext_index),
+    (4, "hot_query_indexes", hot_query_indexes),
+    (5, "change_log", change_log),
+    (6, "search_index", search_index),
+    (7, "normalized_fulltext", normalized_fulltext),
+    (8, "fuzzy_index", fuzzy_index),
+    (9, "tag_index", tag_index),
+    (10, "portable_fulltext_triggers", portable_fulltext_triggers),
+    (11, "tag_link_triggers", tag_link_triggers),
+    (12, "deferred_bulk_indexing", deferred_bulk_indexing),
+]
@@ -5,6 +5,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+MODULE_INFO = {"icon": "📈", "title_key": "analysis", "order": 40}
+
 class AnalysisModule(tk.Frame):
     module_name = "تحلیل"
     
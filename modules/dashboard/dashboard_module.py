@@ -2,10 +2,12 @@
 import tkinter as tk
 from tkinter import ttk
 import logging
-from tkinter import messagebox
+from core.dashboard_stats import STATS_CHANGED_EVENT
 
 logger = logging.getLogger(__name__)
 
+MODULE_INFO = {"icon": "📊", "title_key": "dashboard", "order": 10}
+
 class DashboardModule(ttk.Frame):
     def __init__(self, parent, app, config):
         super().__init__(parent)
@@ -13,11 +15,17 @@ class DashboardModule(ttk.Frame):
         self.config = config
         logger.info("سازنده DashboardModule فراخوانی شد")
         
+        # برچسب‌های مقدار کارت‌ها و آمار سریع بر اساس کلید آمار
+        self.value_labels = {}
+        
         # تنظیم layout برای پر کردن فضای disponible
         self.pack(fill=tk.BOTH, expand=True)
         
         self.setup_ui()
         
+        # با هر تغییر در داده‌های مرتبط، آمار نمایش داده‌شده بروزرسانی می‌شود
+        self.app.event_bus.subscribe(STATS_CHANGED_EVENT, self.on_stats_changed)
+        
     def setup_ui(self):
         """ایجاد رابط کاربری داشبورد"""
         logger.info("تنظیم رابط کاربری داشبورد")
@@ -60,12 +68,12 @@ class DashboardModule(ttk.Frame):
         
     def create_info_cards(self, parent):
         """ایجاد کارت‌های اطلاعاتی"""
-        # داده‌های کارت‌ها
+        # داده‌های کارت‌ها؛ مقادیر پس از دریافت آمار پر می‌شوند
         cards_data = [
-            {"title": self.config.t("papers"), "value": "12", "icon": "📄", "color": "#3498db"},
-            {"title": self.config.t("study_time"), "value": "8.5 ساعت", "icon": "⏱️", "color": "#2ecc71"},
-            {"title": self.config.t("notes"), "value": "23", "icon": "📝", "color": "#e74c3c"},
-            {"title": self.config.t("projects"), "value": "3", "icon": "📁", "color": "#f39c12"}
+            {"key": "papers", "title": self.config.t("papers"), "icon": "📄", "color": "#3498db"},
+            {"key": "study_minutes", "title": self.config.t("study_time"), "icon": "⏱️", "color": "#2ecc71"},
+            {"key": "notes", "title": self.config.t("notes"), "icon": "📝", "color": "#e74c3c"},
+            {"key": "projects", "title": self.config.t("projects"), "icon": "📁", "color": "#f39c12"}
         ]
         
         for i, card in enumerate(cards_data):
@@ -108,23 +116,23 @@ class DashboardModule(ttk.Frame):
             # مقدار
             value_label = ttk.Label(
                 card_frame, 
-                text=card["value"], 
+                text="...", 
                 font=("Tahoma", 18, "bold"),
                 anchor='center'
             )
             value_label.pack(fill=tk.BOTH, expand=True)
+            self.value_labels[card["key"]] = value_label
         
     def create_quick_stats(self, parent):
         """ایجاد بخش آمار سریع"""
-        # آمار نمونه
         stats_data = [
-            (self.config.t("read_papers"), "8"),
-            (self.config.t("reading_papers"), "4"),
-            (self.config.t("planned_papers"), "5"),
-            (self.config.t("avg_study_time"), "45 دقیقه")
+            ("read_papers", self.config.t("read_papers")),
+            ("reading_papers", self.config.t("reading_papers")),
+            ("planned_papers", self.config.t("planned_papers")),
+            ("avg_daily_minutes", self.config.t("avg_study_time"))
         ]
         
-        for stat_name, stat_value in stats_data:
+        for stat_key, stat_name in stats_data:
             stat_frame = ttk.Frame(parent)
             stat_frame.pack(fill=tk.X, pady=5)
             
@@ -137,20 +145,53 @@ class DashboardModule(ttk.Frame):
             
             value_label = ttk.Label(
                 stat_frame, 
-                text=stat_value, 
+                text="...", 
                 font=("Tahoma", 10, "bold"),
                 anchor='w'
             )
             value_label.pack(side=tk.RIGHT)
+            self.value_labels[stat_key] = value_label
+    
+    def format_stat(self, key, value):
+        """متن نمایشی یک مقدار آماری"""
+        if key == "study_minutes":
+            return f"{value / 60:.1f} {self.config.t('hours')}"
+        if key == "avg_daily_minutes":
+            return f"{value:.0f} {self.config.t('minutes')}"
+        return str(value)
+    
+    def show_stats(self, stats):
+        """نمایش آمار دریافت‌شده در کارت‌ها و آمار سریع"""
+        if not self.winfo_exists():
+            return
+        for key, label in self.value_labels.items():
+            label.configure(text=self.format_stat(key, stats.get(key, 0)))
+    
+    def show_stats_error(self, error):
+        if not self.winfo_exists():
+            return
+        for label in self.value_labels.values():
+            label.configure(text="-")
+    
+    def load_stats(self):
+        """دریافت آمار از cache مشترک (در صورت نیاز با یک query تجمیعی)"""
+        self.app.stats.fetch(self.show_stats, self.show_stats_error)
     
     def refresh_data(self):
         """بروزرسانی داده‌های داشبورد"""
-        # این متد می‌تواند داده‌های واقعی از پایگاه داده بگیرد
-        messagebox.showinfo(
-            self.config.t("info"), 
-            "داده‌های داشبورد بروزرسانی شدند"
-        )
+        # باطل کردن cache؛ رویداد حاصل آمار را دوباره بارگذاری می‌کند
+        self.app.stats.invalidate()
+    
+    def on_stats_changed(self, data=None):
+        # ماژول پنهان در فعال‌سازی بعدی آمار را می‌خواند
+        if self.app.current_module_instance is self:
+            self.load_stats()
     
     def on_activate(self):
         """هنگام فعال شدن ماژول فراخوانی می‌شود"""
-        logger.info("ماژول داشبورد فعال شد")
\ No newline at end of file
+        logger.info("ماژول داشبورد فعال شد")
+        self.load_stats()
+    
+    def destroy(self):
+        self.app.event_bus.unsubscribe(STATS_CHANGED_EVENT, self.on_stats_changed)
+        super().destroy()
\ No newline at end of file
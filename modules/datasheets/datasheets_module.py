@@ -2,7 +2,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import logging
 from tkinter import scrolledtext
-import pandas as pd
 from datetime import datetime
 import os
 import sqlite3
@@ -11,16 +10,44 @@ import platform
 import webbrowser
 import shutil
 import re
+from core.exporters import export_rows_to_excel
+from core.facets import FACETS_CHANGED_EVENT, FacetBar, TagFilterEntry
+from core.statuses import STATUS_FILTERS
+from core.tags import tag_filter
+from core.filter_index import FilterIndex
+from core.text_normalizer import is_persian
+from core.virtual_table import VirtualTable, IdListSource
 
 logger = logging.getLogger(__name__)
 
+MODULE_INFO = {"icon": "📄", "title_key": "articles_management", "order": 20}
+
+# ستون‌های جدول datasheets به ترتیب ستون‌های Treeview
+DATASHEET_SELECT = """
+    d.id, d.title, d.category, d.tags, d.status,
+    strftime('%Y-%m-%d', d.added_date) as added_date,
+    d.url, d.notes, d.file_path
+"""
+
+# ستون‌های نمایه فیلتر: (id, کلید ترتیب, وضعیت, فیلدهای متنی قابل جستجو...)
+FILTER_INDEX_SELECT = """
+    SELECT id, COALESCE(added_date, ''), status, title, category, tags, notes, url
+    FROM datasheets
+"""
+
 class DatasheetsModule(ttk.Frame):
     def __init__(self, parent, app, config):
         super().__init__(parent)
         self.app = app
         self.config = config
         self.current_filters = {}
+        # آخرین تغییر change_log که جدول با آن همگام است
+        self.change_watermark = 0
+        # ذخیره ستونی فیلدهای قابل جستجو؛ فیلتر هنگام تایپ فقط روی حافظه اجرا می‌شود
+        self.filter_index = FilterIndex()
         self.setup_ui()
+        # تعداد مقادیر فیلترها پس از هر نوشتن در datasheets بروزرسانی می‌شود
+        self.app.event_bus.subscribe(FACETS_CHANGED_EVENT, self.on_facets_changed)
         
     def setup_ui(self):
         """ایجاد رابط کاربری مدیریت دیتاشیت‌ها"""
@@ -73,14 +100,19 @@ class DatasheetsModule(ttk.Frame):
         search_entry.pack(side=tk.RIGHT, padx=5)
         search_entry.bind('<KeyRelease>', self.apply_filters)
         
-        # دکمه‌های فیلتر
-        filter_buttons = ttk.Frame(search_frame)
-        filter_buttons.pack(side=tk.RIGHT, padx=10)
+        # دکمه‌های فیلتر وضعیت و فهرست‌های دسته‌بندی و برچسب با تعداد هر مقدار
+        self.facet_bar = FacetBar(
+            self,
+            STATUS_FILTERS,
+            [('category', "دسته‌بندی"), ('tag', "برچسب")],
+            self.on_facet_selected
+        )
+        self.facet_bar.pack(fill=tk.X, padx=20)
+        self.facet_bar.update_counts(self.app.facets.counts("datasheets"))
         
-        ttk.Button(filter_buttons, text="همه", command=lambda: self.set_filter('all')).pack(side=tk.LEFT, padx=2)
-        ttk.Button(filter_buttons, text="خوانده شده", command=lambda: self.set_filter('read')).pack(side=tk.LEFT, padx=2)
-        ttk.Button(filter_buttons, text="در حال مطالعه", command=lambda: self.set_filter('reading')).pack(side=tk.LEFT, padx=2)
-        ttk.Button(filter_buttons, text="برنامه‌ریزی شده", command=lambda: self.set_filter('planned')).pack(side=tk.LEFT, padx=2)
+        # فیلتر چند برچسبی: «a, b» هر دو و «a | b» هر کدام
+        ttk.Label(self.facet_bar, text="برچسب‌ها:").pack(side=tk.LEFT, padx=(8, 2))
+        TagFilterEntry(self.facet_bar, self.app.db, "datasheets", self.on_tags_selected).pack(side=tk.LEFT)
         
         # جدول نمایش دیتاشیت‌ها
         table_frame = ttk.Frame(self)
@@ -94,31 +126,14 @@ class DatasheetsModule(ttk.Frame):
         
     def create_table(self, parent):
         """ایجاد جدول نمایش دیتاشیت‌ها"""
-        # فریم برای جدول و اسکرول بار
-        table_container = ttk.Frame(parent)
-        table_container.pack(fill=tk.BOTH, expand=True)
-        
-        # اسکرول بار عمودی
-        v_scrollbar = ttk.Scrollbar(table_container)
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # اسکرول بار افقی
-        h_scrollbar = ttk.Scrollbar(table_container, orient=tk.HORIZONTAL)
-        h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-        
-        # ایجاد Treeview
-        self.tree = ttk.Treeview(
-            table_container,
+        # جدول مجازی: فقط ردیف‌های قابل مشاهده در Treeview ساخته می‌شوند
+        self.table = VirtualTable(
+            parent,
             columns=('id', 'title', 'category', 'tags', 'status', 'added_date', 'url', 'notes', 'file_path'),
-            show='headings',
-            yscrollcommand=v_scrollbar.set,
-            xscrollcommand=h_scrollbar.set,
             selectmode='browse'
         )
-        
-        # تنظیم اسکرول بارها
-        v_scrollbar.config(command=self.tree.yview)
-        h_scrollbar.config(command=self.tree.xview)
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.table.tree
         
         # تعریف ستون‌ها با ترتیب راست به چپ
         columns_config = [
@@ -146,8 +161,6 @@ class DatasheetsModule(ttk.Frame):
         if self.config.current_language == "fa":
             self.tree["displaycolumns"] = ('file_path', 'notes', 'url', 'added_date', 'status', 'tags', 'category', 'title')
         
-        self.tree.pack(fill=tk.BOTH, expand=True)
-        
         # رویداد دابل‌کلیک برای باز کردن فایل/لینک
         self.tree.bind('<Double-1>', self.on_item_double_click)
         
@@ -185,31 +198,81 @@ class DatasheetsModule(ttk.Frame):
                 self.clipboard_append(cell_value)
         
     def load_datasheets(self):
-        """بارگذاری دیتاشیت‌ها از پایگاه داده"""
+        """بارگذاری کامل نمایه فیلتر از پایگاه داده و نمایش آن در جدول مجازی"""
         try:
-            # پاک کردن داده‌های موجود
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # دریافت داده‌ها از دیتابیس
-            datasheets = self.app.db.fetch_all("""
-                SELECT id, title, category, tags, status, 
-                       strftime('%Y-%m-%d', added_date) as added_date, 
-                       url, notes, file_path 
-                FROM datasheets 
-                ORDER BY added_date DESC
-            """)
-            
-            # افزودن به جدول
-            for ds in datasheets:
-                self.tree.insert('', 'end', values=ds, iid=ds[0])
-                
-            logger.info("دیتاشیت‌ها با موفقیت بارگذاری شدند")
+            self.change_watermark = self.app.db.change_watermark()
+            self.filter_index.load(self.app.db.fetch_iter(FILTER_INDEX_SELECT))
+            self.show_filtered()
+            logger.info(f"{len(self.filter_index)} دیتاشیت با موفقیت بارگذاری شدند")
             
         except Exception as e:
             logger.error(f"خطا در بارگذاری دیتاشیت‌ها: {e}")
             messagebox.showerror("خطا", "خطا در بارگذاری دیتاشیت‌ها")
     
+    def refresh_datasheets(self):
+        """بروزرسانی تدریجی جدول پس از افزودن، ویرایش یا حذف
+        
+        فقط ردیف‌هایی که change_log پس از آخرین watermark ثبت کرده در نمایه فیلتر
+        بروزرسانی می‌شوند؛ موقعیت اسکرول و انتخاب حفظ می‌شوند و فقط ردیف‌های
+        تغییرکرده در Treeview لمس می‌شوند.
+        """
+        try:
+            watermark, changes = self.app.db.changes_since(self.change_watermark, "datasheets")
+            self.change_watermark = watermark
+            if not changes:
+                return
+            
+            for row_id, op in changes.items():
+                if op == 'D':
+                    self.filter_index.remove(row_id)
+            
+            changed = [row_id for row_id, op in changes.items() if op != 'D']
+            if changed:
+                rows = self.app.db.fetch_all(
+                    FILTER_INDEX_SELECT + f" WHERE id IN ({', '.join('?' * len(changed))})",
+                    changed
+                )
+                for row in rows:
+                    self.filter_index.upsert(row)
+            
+            self.show_filtered(keep_position=True)
+            logger.info(f"{len(changes)} دیتاشیت تغییرکرده بروزرسانی شد")
+            
+        except Exception as e:
+            logger.error(f"خطا در بروزرسانی دیتاشیت‌ها: {e}")
+    
+    def show_filtered(self, keep_position=False):
+        """نمایش شناسه‌های منطبق با فیلترهای فعلی
+        
+        مجموعه شناسه‌ها از نمایه حافظه محاسبه می‌شود و جدول مجازی فقط
+        ردیف‌هایی را که نمایش آن‌ها تغییر کرده حذف یا اضافه می‌کند.
+        """
+        search = self.current_filters.get('search')
+        status = self.current_filters.get('status')
+        ids = self.filter_index.match(search, status)
+        if search and not ids:
+            # بدون تطبیق زیررشته‌ای: شماره قطعه با غلط تایپی (مثلاً TPS6139l) از نمایه trigram
+            allowed = set(self.filter_index.match(None, status))
+            ids = [row_id for row_id in self.app.search_index.fuzzy_ids("datasheet", search) if row_id in allowed]
+        if self.current_filters.get('category'):
+            # مقدار facet هر ردیف در شمارنده‌ها نگه داشته می‌شود
+            allowed = self.app.facets.matching("datasheets", "category", self.current_filters['category'])
+            ids = [row_id for row_id in ids if row_id in allowed]
+        # برچسب‌ها از ایندکس tag_links خوانده می‌شوند
+        if self.current_filters.get('tag'):
+            allowed = self.tagged_ids([self.current_filters['tag']])
+            ids = [row_id for row_id in ids if row_id in allowed]
+        if self.current_filters.get('tags'):
+            allowed = self.tagged_ids(*self.current_filters['tags'])
+            ids = [row_id for row_id in ids if row_id in allowed]
+        source = IdListSource(self.app.db, ids, DATASHEET_SELECT, "datasheets d", id_column="d.id")
+        self.table.set_source(source, keep_position=keep_position)
+    
+    def tagged_ids(self, tags, mode="and"):
+        """مجموعه شناسه دیتاشیت‌های دارای برچسب‌ها (and: همه، or: هر کدام)"""
+        condition, params = tag_filter("datasheets", "d.id", tags, mode)
+        return {row[0] for row in self.app.db.fetch_iter(f"SELECT d.id FROM datasheets d WHERE {condition}", params)}
+    
     def on_item_double_click(self, event):
         """حالت باز کردن فایل/لینک هنگام دابل‌کلیک"""
         selection = self.tree.selection()
@@ -304,27 +367,13 @@ class DatasheetsModule(ttk.Frame):
     def auto_adjust_text_direction(self, event):
         """تنظیم خودکار جهت متن بر اساس محتوا"""
         text = event.widget.get('1.0', 'end-1c')
-        if self.is_persian(text):
+        if is_persian(text):
             event.widget.tag_configure('rtl', justify='right')
             event.widget.tag_add('rtl', '1.0', 'end')
         else:
             event.widget.tag_configure('ltr', justify='left')
             event.widget.tag_add('ltr', '1.0', 'end')
     
-    def is_persian(self, text):
-        """تشخیص اینکه آیا متن فارسی است یا نه"""
-        # اگر بیش از 50% کاراکترها فارسی باشند، متن فارسی در نظر گرفته می‌شود
-        if not text.strip():
-            return False
-            
-        persian_chars = sum(1 for c in text if '\u0600' <= c <= '\u06FF')
-        total_chars = len(text.replace(' ', '').replace('\n', ''))
-        
-        if total_chars == 0:
-            return False
-            
-        return (persian_chars / total_chars) > 0.5
-    
     def browse_file(self, entry_widget):
         """انتخاب فایل"""
         file_path = filedialog.askopenfilename(
@@ -364,62 +413,91 @@ class DatasheetsModule(ttk.Frame):
                 messagebox.showerror("خطا", "عنوان باید وارد شود")
                 return
             
-            # کپی فایل به پوشه داده‌ها اگر فایل جدید انتخاب شده
-            if data['file_path'] and os.path.exists(data['file_path']):
-                # فقط اگر فایل خارج از پوشه داده‌ها است، آن را کپی کن
-                if not data['file_path'].startswith(self.app.data_dir):
-                    new_path = self.copy_file_to_data_dir(data['file_path'])
-                    data['file_path'] = new_path
+            dialog = self.dialog
             
-            # ذخیره در دیتابیس
-            self.app.db.execute_query("""
-                INSERT INTO datasheets (title, category, tags, status, file_path, url, notes, added_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))
-            """, (
-                data['title'],
-                data['category'],
-                data['tags'],
-                data['status'],
-                data['file_path'],
-                data['url'],
-                data['notes']
-            ))
+            def insert(data):
+                try:
+                    # ذخیره در دیتابیس
+                    self.app.db.execute_query("""
+                        INSERT INTO datasheets (title, category, tags, status, file_path, url, notes, added_date)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))
+                    """, (
+                        data['title'],
+                        data['category'],
+                        data['tags'],
+                        data['status'],
+                        data['file_path'],
+                        data['url'],
+                        data['notes']
+                    ))
+                    
+                    dialog.destroy()
+                    self.refresh_datasheets()
+                    messagebox.showinfo("موفقیت", "دیتاشیت با موفقیت اضافه شد")
+                    
+                except Exception as e:
+                    logger.error(f"خطا در ذخیره دیتاشیت: {e}")
+                    messagebox.showerror("خطا", f"خطا در ذخیره دیتاشیت: {e}")
             
-            self.dialog.destroy()
-            self.load_datasheets()
-            messagebox.showinfo("موفقیت", "دیتاشیت با موفقیت اضافه شد")
+            self.store_file(data, insert)
             
         except Exception as e:
             logger.error(f"خطا در ذخیره دیتاشیت: {e}")
             messagebox.showerror("خطا", f"خطا در ذخیره دیتاشیت: {e}")
     
+    def store_file(self, data, then):
+        """کپی فایل انتخاب‌شده به پوشه داده‌ها در پس‌زمینه و سپس فراخوانی then(data)
+        
+        فقط فایل‌های موجود خارج از پوشه داده‌ها کپی می‌شوند؛ در غیر این صورت
+        then بلافاصله فراخوانی می‌شود.
+        """
+        file_path = data['file_path']
+        if not (file_path and os.path.exists(file_path) and not file_path.startswith(self.app.data_dir)):
+            then(data)
+            return
+        
+        def copied(new_path):
+            data['file_path'] = new_path
+            then(data)
+        
+        self.app.tasks.run_in_thread(
+            self.copy_file_to_data_dir, file_path,
+            name="copy-file",
+            on_result=copied,
+            on_error=self.on_copy_error
+        )
+    
+    def on_copy_error(self, error):
+        """گزارش خطای کپی فایل؛ دیتاشیت ذخیره نمی‌شود"""
+        logger.error(f"خطا در کپی فایل: {error}")
+        messagebox.showerror("خطا", f"خطا در کپی فایل: {error}")
+    
     def copy_file_to_data_dir(self, original_path):
-        """کپی کردن فایل به پوشه داده‌های برنامه"""
-        try:
-            # ایجاد پوشه داده‌ها اگر وجود ندارد
-            os.makedirs(self.app.data_dir, exist_ok=True)
-            
-            # نام فایل
-            filename = os.path.basename(original_path)
-            counter = 1
-            new_filename = filename
-            
-            # بررسی وجود فایل تکراری
-            while os.path.exists(os.path.join(self.app.data_dir, new_filename)):
-                name, ext = os.path.splitext(filename)
-                new_filename = f"{name}_{counter}{ext}"
-                counter += 1
-            
-            # مسیر جدید
-            new_path = os.path.join(self.app.data_dir, new_filename)
-            
-            # کپی فایل
-            shutil.copy2(original_path, new_path)
-            
-            return new_path
-        except Exception as e:
-            logger.error(f"خطا در کپی فایل: {e}")
-            return original_path  # در صورت خطا، مسیر اصلی را بازگردان
+        """کپی کردن فایل به پوشه داده‌های برنامه
+        
+        در thread پس‌زمینه اجرا می‌شود؛ خطای کپی به on_copy_error می‌رسد.
+        """
+        # ایجاد پوشه داده‌ها اگر وجود ندارد
+        os.makedirs(self.app.data_dir, exist_ok=True)
+        
+        # نام فایل
+        filename = os.path.basename(original_path)
+        counter = 1
+        new_filename = filename
+        
+        # بررسی وجود فایل تکراری
+        while os.path.exists(os.path.join(self.app.data_dir, new_filename)):
+            name, ext = os.path.splitext(filename)
+            new_filename = f"{name}_{counter}{ext}"
+            counter += 1
+        
+        # مسیر جدید
+        new_path = os.path.join(self.app.data_dir, new_filename)
+        
+        # کپی فایل
+        shutil.copy2(original_path, new_path)
+        
+        return new_path
     
     def edit_selected(self):
         """ویرایش آیتم انتخاب شده"""
@@ -439,7 +517,7 @@ class DatasheetsModule(ttk.Frame):
             if messagebox.askyesno("تأیید حذف", f"آیا از حذف '{title}' مطمئن هستید؟"):
                 try:
                     self.app.db.execute_query("DELETE FROM datasheets WHERE id = ?", (item_id,))
-                    self.load_datasheets()
+                    self.refresh_datasheets()
                     messagebox.showinfo("موفقیت", "دیتاشیت با موفقیت حذف شد")
                 except Exception as e:
                     logger.error(f"خطا در حذف دیتاشیت: {e}")
@@ -475,7 +553,7 @@ class DatasheetsModule(ttk.Frame):
                         (new_note, item_id)
                     )
                     dialog.destroy()
-                    self.load_datasheets()
+                    self.refresh_datasheets()
                     messagebox.showinfo("موفقیت", "یادداشت با موفقیت ذخیره شد")
                 except Exception as e:
                     logger.error(f"خطا در ذخیره یادداشت: {e}")
@@ -623,32 +701,33 @@ class DatasheetsModule(ttk.Frame):
                     messagebox.showerror("خطا", "عنوان باید وارد شود")
                     return
                 
-                # کپی فایل به پوشه داده‌ها اگر فایل جدید انتخاب شده
-                if data['file_path'] and os.path.exists(data['file_path']):
-                    # فقط اگر فایل خارج از پوشه داده‌ها است، آن را کپی کن
-                    if not data['file_path'].startswith(self.app.data_dir):
-                        new_path = self.copy_file_to_data_dir(data['file_path'])
-                        data['file_path'] = new_path
+                def update(data):
+                    try:
+                        # به‌روزرسانی در دیتابیس
+                        self.app.db.execute_query("""
+                            UPDATE datasheets 
+                            SET title = ?, category = ?, tags = ?, status = ?, file_path = ?, url = ?, notes = ?
+                            WHERE id = ?
+                        """, (
+                            data['title'],
+                            data['category'],
+                            data['tags'],
+                            data['status'],
+                            data['file_path'],
+                            data['url'],
+                            data['notes'],
+                            item_id
+                        ))
+                        
+                        dialog.destroy()
+                        self.refresh_datasheets()
+                        messagebox.showinfo("موفقیت", "دیتاشیت با موفقیت ویرایش شد")
+                        
+                    except Exception as e:
+                        logger.error(f"خطا در ویرایش دیتاشیت: {e}")
+                        messagebox.showerror("خطا", f"خطا در ویرایش دیتاشیت: {e}")
                 
-                # به‌روزرسانی در دیتابیس
-                self.app.db.execute_query("""
-                    UPDATE datasheets 
-                    SET title = ?, category = ?, tags = ?, status = ?, file_path = ?, url = ?, notes = ?
-                    WHERE id = ?
-                """, (
-                    data['title'],
-                    data['category'],
-                    data['tags'],
-                    data['status'],
-                    data['file_path'],
-                    data['url'],
-                    data['notes'],
-                    item_id
-                ))
-                
-                dialog.destroy()
-                self.load_datasheets()
-                messagebox.showinfo("موفقیت", "دیتاشیت با موفقیت ویرایش شد")
+                self.store_file(data, update)
                 
             except Exception as e:
                 logger.error(f"خطا در ویرایش دیتاشیت: {e}")
@@ -659,59 +738,46 @@ class DatasheetsModule(ttk.Frame):
     
     def apply_filters(self, event=None):
         """اعمال فیلترهای جستجو"""
-        search_text = self.search_var.get().lower()
-        
-        for item in self.tree.get_children():
-            values = self.tree.item(item)['values']
-            # جستجو در عنوان، برچسب‌ها، یادداشت‌ها و لینک
-            # با ترتیب جدید: [id, title, category, tags, status, added_date, url, notes, file_path]
-            match = any([
-                search_text in str(values[1]).lower(),  # title در ایندکس 1
-                search_text in str(values[3]).lower(),  # tags در ایندکس 3
-                search_text in str(values[7]).lower(),  # notes در ایندکس 7
-                search_text in str(values[6]).lower()   # url در ایندکس 6
-            ]) if search_text else True
-            
-            # اعمال فیلتر وضعیت
-            if self.current_filters.get('status'):
-                if self.current_filters['status'] != 'all':
-                    status_match = str(values[4]).lower() == self.current_filters['status']  # status در ایندکس 4
-                    match = match and status_match
-            
-            self.tree.item(item, tags=('hidden',) if not match else ())
+        search_text = self.search_var.get().strip()
+        if search_text:
+            self.current_filters['search'] = search_text
+        else:
+            self.current_filters.pop('search', None)
         
-        # مخفی کردن مواردی که تطابق ندارند
-        self.tree.tag_configure('hidden', display='none')
+        self.show_filtered()
     
     def set_filter(self, filter_type):
         """اعمال فیلتر بر اساس نوع"""
-        status_map = {
-            'all': None,
-            'read': 'خوانده شده',
-            'reading': 'در حال مطالعه',
-            'planned': 'برنامه‌ریزی شده'
-        }
-        
-        self.current_filters['status'] = status_map.get(filter_type)
+        self.current_filters['status'] = dict((key, value) for key, _, value in STATUS_FILTERS).get(filter_type)
         self.apply_filters()
     
+    def on_facet_selected(self, facet, value):
+        """انتخاب دکمه وضعیت یا مقداری از فهرست‌های facet"""
+        if facet == 'status':
+            self.set_filter(value)
+            return
+        if value is None:
+            self.current_filters.pop(facet, None)
+        else:
+            self.current_filters[facet] = value
+        self.show_filtered()
+    
+    def on_tags_selected(self, tags, mode):
+        """فیلتر ترکیبی برچسب‌ها از فیلد تکمیل خودکار"""
+        if tags:
+            self.current_filters['tags'] = (tags, mode)
+        else:
+            self.current_filters.pop('tags', None)
+        self.show_filtered()
+    
+    def on_facets_changed(self, table):
+        """بروزرسانی تعدادها پس از نوشتن در datasheets (بدون پیمایش دوباره جدول)"""
+        if table == "datasheets":
+            self.facet_bar.update_counts(self.app.facets.counts("datasheets"))
+    
     def export_to_excel(self):
         """خروجی اکسل از دیتاشیت‌ها"""
         try:
-            # دریافت داده‌ها
-            datasheets = self.app.db.fetch_all("""
-                SELECT title, category, tags, status, 
-                       strftime('%Y-%m-%d', added_date) as added_date, 
-                       url, notes, file_path 
-                FROM datasheets 
-                ORDER BY added_date DESC
-            """)
-            
-            # ایجاد DataFrame
-            df = pd.DataFrame(datasheets, columns=[
-                'عنوان', 'دسته‌بندی', 'برچسب‌ها', 'وضعیت', 'تاریخ افزودن', 'لینک', 'یادداشت‌ها', 'مسیر فایل'
-            ])
-            
             # ذخیره به صورت Excel
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
@@ -720,14 +786,42 @@ class DatasheetsModule(ttk.Frame):
             )
             
             if file_path:
-                df.to_excel(file_path, index=False, engine='openpyxl')
-                messagebox.showinfo("موفقیت", f"داده‌ها با موفقیت در {file_path} ذخیره شدند")
+                # نوشتن جریانی داده‌ها در پس‌زمینه، بدون ساخت DataFrame در حافظه
+                self.app.tasks.run_in_thread(
+                    self.write_excel, file_path,
+                    name="export-datasheets",
+                    on_result=lambda count: messagebox.showinfo(
+                        "موفقیت", f"داده‌ها با موفقیت در {file_path} ذخیره شدند"
+                    ),
+                    on_error=self.on_export_error
+                )
                 
         except Exception as e:
-            logger.error(f"خطا در خروجی اکسل: {e}")
-            messagebox.showerror("خطا", f"خطا در ایجاد خروجی اکسل: {e}")
+            self.on_export_error(e)
+    
+    def write_excel(self, file_path):
+        """نوشتن دیتاشیت‌ها در فایل اکسل (در thread پس‌زمینه اجرا می‌شود)"""
+        datasheets = self.app.db.fetch_iter("""
+            SELECT title, category, tags, status, 
+                   strftime('%Y-%m-%d', added_date) as added_date, 
+                   url, notes, file_path 
+            FROM datasheets 
+            ORDER BY added_date DESC
+        """)
+        return export_rows_to_excel(file_path, [
+            'عنوان', 'دسته‌بندی', 'برچسب‌ها', 'وضعیت', 'تاریخ افزودن', 'لینک', 'یادداشت‌ها', 'مسیر فایل'
+        ], datasheets, sheet_title="Datasheets")
+    
+    def on_export_error(self, error):
+        """گزارش خطای خروجی اکسل"""
+        logger.error(f"خطا در خروجی اکسل: {error}")
+        messagebox.showerror("خطا", f"خطا در ایجاد خروجی اکسل: {error}")
     
     def on_activate(self):
         """هنگام فعال شدن ماژول فراخوانی می‌شود"""
         logger.info("ماژول دیتاشیت‌ها فعال شد")
-        self.load_datasheets()
\ No newline at end of file
+        self.refresh_datasheets()
+    
+    def destroy(self):
+        self.app.event_bus.unsubscribe(FACETS_CHANGED_EVENT, self.on_facets_changed)
+        super().destroy()
@@ -3,7 +3,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import logging
 from tkinter import scrolledtext
-import pandas as pd
 from datetime import datetime
 import os
 import sqlite3
@@ -12,31 +11,31 @@ import platform
 import webbrowser
 import shutil
 import re
-import requests
-from bs4 import BeautifulSoup
-import threading
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import networkx as nx
+from core import nlp_tasks
+from core.exporters import export_rows_to_excel
+from core.fulltext import build_match_query
+from core.virtual_table import VirtualTable, KeysetSource, IdListSource
+from core.debounce import DebouncedQuery
+from core.facets import FACETS_CHANGED_EVENT, FacetBar, TagFilterEntry
+from core.statuses import STATUS_FILTERS
+from core.tags import tag_filter
 
 logger = logging.getLogger(__name__)
 
-# دانلود داده‌های لازم برای nltk (فقط یک بار لازم است)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+MODULE_INFO = {"icon": "🔍", "title_key": "research", "order": 30}
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# ستون‌های جدول papers به ترتیب ستون‌های Treeview
+PAPER_COLUMNS = (
+    'id', 'title', 'authors', 'publication_date', 'journal', 'status',
+    'rating', 'doi', 'url', 'file_path', 'notes'
+)
+
+# شناسه پروژه‌های هر مقاله از جدول ارتباط (ستون project_id جدول و خروجی اکسل)؛
+# ایندکس (paper_id, project_id) این subquery را پوشش می‌دهد
+PAPER_PROJECTS = (
+    "(SELECT group_concat(rpm.project_id, ', ') FROM research_project_mapers rpm "
+    "WHERE rpm.paper_id = p.id) AS project_id"
+)
 
 class ResearchModule(ttk.Frame):
     def __init__(self, parent, app, config):
@@ -46,7 +45,17 @@ class ResearchModule(ttk.Frame):
         self.current_filters = {}
         self.search_results = []
         self.analysis_combo = None  # اضافه کردن reference برای combobox
+        # ویجت‌های تب‌هایی که هنوز ساخته نشده‌اند
+        self.table = None
+        self.research_query = None
+        self.facet_bar = None
+        self.projects_tree = None
+        self.search_task = None
+        # آخرین تغییر change_log که داده هر تب با آن همگام است
+        self.watermarks = {}
         self.setup_ui()
+        # تعداد مقادیر فیلترها پس از هر نوشتن در papers بروزرسانی می‌شود
+        self.app.event_bus.subscribe(FACETS_CHANGED_EVENT, self.on_facets_changed)
         
     def setup_ui(self):
         """ایجاد رابط کاربری مدیریت مقالات تحقیقاتی"""
@@ -72,11 +81,46 @@ class ResearchModule(ttk.Frame):
         self.projects_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.projects_tab, text="📂 مدیریت پروژه‌ها")
         
-        # راه‌اندازی هر تب
-        self.setup_articles_tab()
-        self.setup_search_tab()
-        self.setup_analysis_tab()
-        self.setup_projects_tab()
+        # هر تب بار اول که انتخاب شود ساخته و پر می‌شود و پس از آن فقط
+        # در صورت تغییر داده‌هایش بروزرسانی می‌شود
+        self.tab_handlers = {
+            str(self.articles_tab): (self.setup_articles_tab, self.refresh_research),
+            str(self.search_tab): (self.setup_search_tab, None),
+            str(self.analysis_tab): (self.setup_analysis_tab, self.refresh_analysis_titles),
+            str(self.projects_tab): (self.setup_projects_tab, self.refresh_projects),
+        }
+        self.built_tabs = set()
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.ensure_tab(self.notebook.select())
+    
+    def ensure_tab(self, tab):
+        """ساخت تب در صورتی که هنوز ساخته نشده باشد؛ True اگر همین حالا ساخته شد"""
+        tab = str(tab)
+        if not tab or tab in self.built_tabs:
+            return False
+        self.built_tabs.add(tab)
+        setup, _ = self.tab_handlers[tab]
+        setup()
+        return True
+    
+    def on_tab_changed(self, event=None):
+        """ساخت تب انتخاب‌شده در اولین نمایش یا همگام‌سازی داده‌های آن"""
+        tab = self.notebook.select()
+        if not tab or self.ensure_tab(tab):
+            return
+        _, refresh = self.tab_handlers[tab]
+        if refresh:
+            refresh()
+    
+    def mark_synced(self, key):
+        """ثبت همگام بودن داده‌های key با آخرین تغییر change_log"""
+        self.watermarks[key] = self.app.db.change_watermark()
+    
+    def papers_changed(self, key):
+        """آیا papers پس از آخرین همگام‌سازی key تغییر کرده است"""
+        watermark, changes = self.app.db.changes_since(self.watermarks.get(key, 0), "papers")
+        self.watermarks[key] = watermark
+        return bool(changes)
         
     def setup_articles_tab(self):
         """ایجاد تب مدیریت مقالات"""
@@ -135,14 +179,29 @@ class ResearchModule(ttk.Frame):
         search_entry.pack(side=tk.RIGHT, padx=5)
         search_entry.bind('<KeyRelease>', self.apply_filters)
         
-        # دکمه‌های فیلتر
-        filter_buttons = ttk.Frame(search_frame)
-        filter_buttons.pack(side=tk.RIGHT, padx=10)
+        # جستجوی هنگام تایپ: ادغام ضربه‌های کلید و اجرای query در پس‌زمینه
+        self.research_query = DebouncedQuery(
+            self,
+            self.app.tasks,
+            self.query_research_source,
+            self.show_research_source,
+            delay_ms=self.config.get("search_debounce_ms", 250),
+            on_error=self.on_research_query_error
+        )
+        
+        # دکمه‌های فیلتر وضعیت و فهرست‌های سال، ژورنال و برچسب با تعداد هر مقدار
+        self.facet_bar = FacetBar(
+            self.articles_tab,
+            STATUS_FILTERS,
+            [('year', "سال"), ('journal', "ژورنال"), ('tag', "برچسب")],
+            self.on_facet_selected
+        )
+        self.facet_bar.pack(fill=tk.X, padx=20)
+        self.facet_bar.update_counts(self.app.facets.counts("papers"))
         
-        ttk.Button(filter_buttons, text="همه", command=lambda: self.set_filter('all')).pack(side=tk.LEFT, padx=2)
-        ttk.Button(filter_buttons, text="خوانده شده", command=lambda: self.set_filter('read')).pack(side=tk.LEFT, padx=2)
-        ttk.Button(filter_buttons, text="در حال مطالعه", command=lambda: self.set_filter('reading')).pack(side=tk.LEFT, padx=2)
-        ttk.Button(filter_buttons, text="برنامه‌ریزی شده", command=lambda: self.set_filter('planned')).pack(side=tk.LEFT, padx=2)
+        # فیلتر چند برچسبی: «a, b» هر دو و «a | b» هر کدام
+        ttk.Label(self.facet_bar, text="برچسب‌ها:").pack(side=tk.LEFT, padx=(8, 2))
+        TagFilterEntry(self.facet_bar, self.app.db, "papers", self.on_tags_selected).pack(side=tk.LEFT)
         
         # جدول نمایش مقالات
         table_frame = ttk.Frame(self.articles_tab)
@@ -156,31 +215,14 @@ class ResearchModule(ttk.Frame):
     
     def create_table(self, parent):
         """ایجاد جدول نمایش مقالات تحقیقاتی"""
-        # فریم برای جدول و اسکرول بار
-        table_container = ttk.Frame(parent)
-        table_container.pack(fill=tk.BOTH, expand=True)
-        
-        # اسکرول بار عمودی
-        v_scrollbar = ttk.Scrollbar(table_container)
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # اسکرول بار افقی
-        h_scrollbar = ttk.Scrollbar(table_container, orient=tk.HORIZONTAL)
-        h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-        
-        # ایجاد Treeview
-        self.tree = ttk.Treeview(
-            table_container,
+        # جدول مجازی: فقط ردیف‌های قابل مشاهده در Treeview ساخته می‌شوند
+        self.table = VirtualTable(
+            parent,
             columns=('id', 'title', 'authors', 'publication_date', 'journal', 'status', 'rating', 'doi', 'url', 'file_path', 'notes', 'project_id'),
-            show='headings',
-            yscrollcommand=v_scrollbar.set,
-            xscrollcommand=h_scrollbar.set,
             selectmode='browse'
         )
-        
-        # تنظیم اسکرول بارها
-        v_scrollbar.config(command=self.tree.yview)
-        h_scrollbar.config(command=self.tree.xview)
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.table.tree
         
         # تعریف ستون‌ها با ترتیب راست به چپ
         columns_config = [
@@ -212,8 +254,6 @@ class ResearchModule(ttk.Frame):
         if self.config.current_language == "fa":
             self.tree["displaycolumns"] = ('notes', 'file_path', 'url', 'doi', 'rating', 'status', 'journal', 'publication_date', 'authors', 'title')
         
-        self.tree.pack(fill=tk.BOTH, expand=True)
-        
         # رویداد دابل‌کلیک برای باز کردن فایل/لینک
         self.tree.bind('<Double-1>', self.on_item_double_click)
         
@@ -313,80 +353,153 @@ class ResearchModule(ttk.Frame):
         ttk.Button(button_frame, text="انصراف", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
     
     def load_research(self):
-        """بارگذاری مقالات از دیتابیس"""
+        """بارگذاری مقالات از دیتابیس در جدول مجازی"""
+        if self.table is None:
+            # تب مقالات هنوز ساخته نشده و هنگام ساخت بارگذاری می‌شود
+            return
         try:
-            # پاک کردن داده‌های قبلی
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # ساخت کوئری بر اساس فیلترها
-            query = "SELECT * FROM papers WHERE 1=1"
-            params = []
-            
-            if self.current_filters.get('status'):
-                query += " AND status = ?"
-                params.append(self.current_filters['status'])
-            
-            if self.current_filters.get('search'):
-                query += " AND (title LIKE ? OR authors LIKE ? OR journal LIKE ? OR notes LIKE ?)"
-                search_term = f"%{self.current_filters['search']}%"
-                params.extend([search_term, search_term, search_term, search_term])
-            
-            query += " ORDER BY id DESC"
-            
-            # اجرای کوئری
-            papers = self.app.db.fetch_all(query, params)
-            
-            # افزودن به Treeview
-            for paper in papers:
-                self.tree.insert('', 'end', values=paper)
-                
+            # نتیجه query معلق جستجو نباید این بارگذاری را بازنویسی کند
+            self.research_query.cancel()
+            self.mark_synced('articles')
+            self.table.set_source(self.build_research_source())
         except Exception as e:
             logger.error(f"خطا در بارگذاری مقالات: {e}")
             messagebox.showerror("خطا", "خطا در بارگذاری مقالات")
     
+    def query_research_source(self, filters):
+        """ساخت منبع داده و خواندن صفحه اول آن (در thread پس‌زمینه اجرا می‌شود)"""
+        source = self.build_research_source(filters)
+        source.count()
+        source.rows(0, source.page_size)
+        return source
+    
+    def show_research_source(self, source):
+        """نمایش نتیجه آخرین query در جدول (در thread رابط کاربری)"""
+        self.table.set_source(source)
+    
+    def on_research_query_error(self, error):
+        """گزارش خطای query پس‌زمینه"""
+        logger.error(f"خطا در بارگذاری مقالات: {error}")
+        messagebox.showerror("خطا", "خطا در بارگذاری مقالات")
+    
+    def filter_conditions(self, filters):
+        """شرط‌های SQL (با پیشوند AND) و پارامترهای فیلترهای وضعیت و facetها"""
+        conditions = ""
+        params = []
+        if filters.get('status'):
+            conditions += " AND p.status = ?"
+            params.append(filters['status'])
+        if filters.get('year'):
+            conditions += " AND substr(p.publication_date, 1, 4) = ?"
+            params.append(filters['year'])
+        if filters.get('journal'):
+            conditions += " AND p.journal = ?"
+            params.append(filters['journal'])
+        # برچسب‌ها از جدول tag_links و با ایندکس آن فیلتر می‌شوند
+        if filters.get('tag'):
+            condition, tag_params = tag_filter("papers", "p.id", [filters['tag']])
+            conditions += " AND " + condition
+            params.extend(tag_params)
+        if filters.get('tags'):
+            tags, mode = filters['tags']
+            condition, tag_params = tag_filter("papers", "p.id", tags, mode)
+            conditions += " AND " + condition
+            params.extend(tag_params)
+        return conditions, params
+    
+    def build_research_source(self, filters=None):
+        """ساخت منبع داده جدول بر اساس فیلترها (پیش‌فرض: فیلترهای فعلی)"""
+        if filters is None:
+            filters = self.current_filters
+        select = ", ".join([*(f"p.{column}" for column in PAPER_COLUMNS), PAPER_PROJECTS])
+        conditions, condition_params = self.filter_conditions(filters)
+        match = build_match_query(filters.get('search'))
+        
+        if match:
+            # جستجو در نمایه FTS5 با رتبه‌بندی BM25؛ فقط شناسه‌ها در حافظه نگه داشته می‌شوند
+            query = """
+                SELECT p.id FROM papers_fts
+                JOIN papers p ON p.id = papers_fts.rowid
+                WHERE papers_fts MATCH ?
+            """ + conditions + " ORDER BY papers_fts.rank"
+            ids = [row[0] for row in self.app.db.fetch_iter(query, [match, *condition_params])]
+            if not ids:
+                # بدون تطبیق دقیق: جستجوی مقاوم در برابر غلط تایپی (مثلاً نام نویسنده)
+                ids = self.fuzzy_paper_ids(filters.get('search'), conditions, condition_params)
+            return IdListSource(self.app.db, ids, select, "papers p", id_column="p.id")
+        
+        # صفحه‌بندی keyset روی شناسه به ترتیب نزولی
+        from_where = "FROM papers p WHERE 1=1" + conditions
+        return KeysetSource(self.app.db, select, from_where, condition_params, sort_keys=("p.id",))
+    
+    def fuzzy_paper_ids(self, text, conditions="", condition_params=()):
+        """شناسه مقالات منطبق تقریبی از نمایه trigram به ترتیب امتیاز"""
+        ids = self.app.search_index.fuzzy_ids("paper", text)
+        if not ids or not conditions:
+            return ids
+        placeholders = ", ".join("?" for _ in ids)
+        allowed = {
+            row[0] for row in self.app.db.fetch_iter(
+                f"SELECT p.id FROM papers p WHERE p.id IN ({placeholders}){conditions}",
+                [*ids, *condition_params]
+            )
+        }
+        return [row_id for row_id in ids if row_id in allowed]
+    
     def apply_filters(self, event=None):
-        """اعمال فیلترها بر روی مقالات"""
+        """اعمال فیلترها بر روی مقالات (با تأخیر و در پس‌زمینه)"""
         search_text = self.search_var.get().strip()
+        if search_text == self.current_filters.get('search', ''):
+            # کلیدهایی مثل جهت‌نما متن جستجو را تغییر نمی‌دهند
+            return
         if search_text:
             self.current_filters['search'] = search_text
         else:
             self.current_filters.pop('search', None)
         
-        self.load_research()
+        self.research_query.submit(dict(self.current_filters))
     
     def set_filter(self, filter_type):
         """تنظیم فیلتر وضعیت"""
-        status_map = {
-            'all': None,
-            'read': 'خوانده شده',
-            'reading': 'در حال مطالعه',
-            'planned': 'برنامه‌ریزی شده'
-        }
-        
-        if filter_type == 'all':
+        status = dict((key, value) for key, _, value in STATUS_FILTERS).get(filter_type)
+        if status is None:
             self.current_filters.pop('status', None)
         else:
-            self.current_filters['status'] = status_map[filter_type]
+            self.current_filters['status'] = status
         
         self.load_research()
     
+    def on_facet_selected(self, facet, value):
+        """انتخاب دکمه وضعیت یا مقداری از فهرست‌های facet"""
+        if facet == 'status':
+            self.set_filter(value)
+            return
+        if value is None:
+            self.current_filters.pop(facet, None)
+        else:
+            self.current_filters[facet] = value
+        self.load_research()
+    
+    def on_tags_selected(self, tags, mode):
+        """فیلتر ترکیبی برچسب‌ها از فیلد تکمیل خودکار"""
+        if tags:
+            self.current_filters['tags'] = (tags, mode)
+        else:
+            self.current_filters.pop('tags', None)
+        self.load_research()
+    
+    def on_facets_changed(self, table):
+        """بروزرسانی تعدادها پس از نوشتن در papers (بدون پیمایش دوباره جدول)"""
+        if table == "papers" and self.facet_bar is not None:
+            self.facet_bar.update_counts(self.app.facets.counts("papers"))
+    
     def export_to_excel(self):
         """خروجی اکسل از مقالات"""
         try:
-            # دریافت تمام مقالات
-            papers = self.app.db.fetch_all("SELECT * FROM papers")
-            
-            if not papers:
+            if not self.app.db.fetch_one("SELECT 1 FROM papers LIMIT 1"):
                 messagebox.showwarning("هشدار", "هیچ مقاله‌ای برای خروجی وجود ندارد")
                 return
             
-            # ایجاد DataFrame
-            df = pd.DataFrame(papers, columns=[
-                'ID', 'Title', 'Authors', 'Publication Date', 'Journal', 
-                'Status', 'Rating', 'DOI', 'URL', 'File Path', 'Notes', 'Project ID'
-            ])
-            
             # انتخاب مسیر ذخیره
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
@@ -395,13 +508,26 @@ class ResearchModule(ttk.Frame):
             )
             
             if file_path:
-                # ذخیره به اکسل
-                df.to_excel(file_path, index=False)
-                messagebox.showinfo("موفقیت", "خروجی اکسل با موفقیت ایجاد شد")
+                # نوشتن جریانی مقالات در فایل اکسل در پس‌زمینه
+                self.app.tasks.run_in_thread(
+                    self.write_excel, file_path,
+                    name="export-papers",
+                    on_result=lambda count: messagebox.showinfo("موفقیت", "خروجی اکسل با موفقیت ایجاد شد"),
+                    on_error=lambda e: messagebox.showerror("خطا", f"خطا در ایجاد خروجی اکسل: {str(e)}")
+                )
                 
         except Exception as e:
             messagebox.showerror("خطا", f"خطا در ایجاد خروجی اکسل: {str(e)}")
     
+    def write_excel(self, file_path):
+        """نوشتن مقالات در فایل اکسل (در thread پس‌زمینه اجرا می‌شود)"""
+        select = ", ".join([*(f"p.{column}" for column in PAPER_COLUMNS), PAPER_PROJECTS])
+        papers = self.app.db.fetch_iter(f"SELECT {select} FROM papers p ORDER BY p.id")
+        return export_rows_to_excel(file_path, [
+            'ID', 'Title', 'Authors', 'Publication Date', 'Journal',
+            'Status', 'Rating', 'DOI', 'URL', 'File Path', 'Notes', 'Project ID'
+        ], papers, sheet_title="Papers")
+    
     def edit_selected(self):
         """ویرایش مقاله انتخاب شده"""
         selection = self.tree.selection()
@@ -648,21 +774,9 @@ class ResearchModule(ttk.Frame):
             messagebox.showwarning("هشدار", "مقاله انتخاب شده یادداشتی ندارد")
             return
         
-        try:
-            # خلاصه‌سازی متن با sumy
-            parser = PlaintextParser.from_string(notes, Tokenizer("english"))
-            summarizer = LsaSummarizer()
-            summary = summarizer(parser.document, 3)  # 3 جمله خلاصه
-            
-            summary_text = "\n".join([str(sentence) for sentence in summary])
-            
-            # نمایش خلاصه
-            self.notebook.select(self.analysis_tab)
-            self.analysis_text.delete(1.0, tk.END)
-            self.analysis_text.insert(tk.END, f"خلاصه مقاله:\n{summary_text}")
-            
-        except Exception as e:
-            messagebox.showerror("خطا", f"خطا در خلاصه‌سازی: {str(e)}")
+        self.ensure_tab(self.analysis_tab)
+        self.notebook.select(self.analysis_tab)
+        self.start_summary(notes)
     
     def show_context_menu(self, event):
         """نمایش منوی راست‌کلیک"""
@@ -770,37 +884,37 @@ class ResearchModule(ttk.Frame):
             return
         
         # نمایش وضعیت جستجو
+        self.ensure_tab(self.analysis_tab)
         self.analysis_text.delete(1.0, tk.END)
         self.analysis_text.insert(tk.END, f"در حال جستجوی '{keyword}' در {source}...\n")
         
-        # اجرای جستجو در thread جداگانه
-        thread = threading.Thread(target=self.perform_search, args=(source, keyword))
-        thread.daemon = True
-        thread.start()
+        # جستجوی قبلی در صورت اجرا لغو می‌شود
+        if self.search_task is not None:
+            self.search_task.cancel()
+        
+        # اجرای جستجو در thread pool؛ متغیرهای Tk پیش از ارسال خوانده می‌شوند
+        self.search_task = self.app.tasks.run_in_thread(
+            self.perform_search, source, keyword, self.result_count.get(),
+            name=f"search-{source}",
+            on_result=lambda results: self.display_search_results(results, source),
+            on_error=lambda e: messagebox.showerror("خطا", f"خطا در جستجو: {str(e)}")
+        )
     
-    def perform_search(self, source, keyword):
-        """انجام جستجو در پایگاه داده انتخاب شده"""
-        try:
-            if source == 'scholar':
-                results = self.search_google_scholar(keyword)
-            elif source == 'pubmed':
-                results = self.search_pubmed(keyword)
-            elif source == 'arxiv':
-                results = self.search_arxiv(keyword)
-            else:
-                results = []
-            
-            # نمایش نتایج در GUI
-            self.app.root.after(0, self.display_search_results, results, source)
-            
-        except Exception as e:
-            self.app.root.after(0, lambda: messagebox.showerror("خطا", f"خطا در جستجو: {str(e)}"))
+    def perform_search(self, source, keyword, count):
+        """انجام جستجو در پایگاه داده انتخاب شده (در thread پس‌زمینه اجرا می‌شود)"""
+        if source == 'scholar':
+            return self.search_google_scholar(keyword, count)
+        elif source == 'pubmed':
+            return self.search_pubmed(keyword, count)
+        elif source == 'arxiv':
+            return self.search_arxiv(keyword, count)
+        return []
     
-    def search_google_scholar(self, keyword):
+    def search_google_scholar(self, keyword, count):
         """جستجو در Google Scholar (شبیه‌سازی)"""
         # این یک شبیه‌سازی است - در عمل نیاز به استفاده از API دارد
         results = []
-        for i in range(self.result_count.get()):
+        for i in range(count):
             results.append({
                 'title': f'مقاله نمونه {i+1} درباره {keyword}',
                 'authors': 'نویسنده یک, نویسنده دو',
@@ -810,10 +924,10 @@ class ResearchModule(ttk.Frame):
             })
         return results
     
-    def search_pubmed(self, keyword):
+    def search_pubmed(self, keyword, count):
         """جستجو در PubMed (شبیه‌سازی)"""
         results = []
-        for i in range(self.result_count.get()):
+        for i in range(count):
             results.append({
                 'title': f'مطالعه تحقیقاتی {i+1} درباره {keyword}',
                 'authors': 'پژوهشگر الف, پژوهشگر ب',
@@ -823,10 +937,10 @@ class ResearchModule(ttk.Frame):
             })
         return results
     
-    def search_arxiv(self, keyword):
+    def search_arxiv(self, keyword, count):
         """جستجو در arXiv (شبیه‌سازی)"""
         results = []
-        for i in range(self.result_count.get()):
+        for i in range(count):
             results.append({
                 'title': f'پیش‌چاپ {i+1} درباره {keyword}',
                 'authors': 'دانشمند X, دانشمند Y',
@@ -842,9 +956,9 @@ class ResearchModule(ttk.Frame):
         for item in self.search_tree.get_children():
             self.search_tree.delete(item)
         
-        # افزودن نتایج جدید
-        for result in results:
-            self.search_tree.insert('', 'end', values=(
+        # افزودن نتایج جدید (iid برابر ایندکس نتیجه در self.search_results است)
+        for index, result in enumerate(results):
+            self.search_tree.insert('', 'end', iid=str(index), values=(
                 result['title'],
                 result['authors'],
                 result['year'],
@@ -871,27 +985,28 @@ class ResearchModule(ttk.Frame):
             messagebox.showwarning("هشدار", "لطفاً حداقل یک مقاله را انتخاب کنید")
             return
         
-        added_count = 0
+        # جمع‌آوری ردیف‌ها و درج همه آن‌ها در یک تراکنش
+        rows = []
         for item in selected_items:
-            values = self.search_tree.item(item)['values']
-            # یافتن نتیجه کامل در لیست نتایج
-            for result in self.search_results:
-                if result['title'] == values[0] and result['authors'] == values[1]:
-                    try:
-                        # افزودن به پایگاه داده
-                        self.app.db.execute_query("""
-                            INSERT INTO papers (title, authors, publication_date, journal, source)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (
-                            result['title'],
-                            result['authors'],
-                            result['year'],
-                            result.get('journal', ''),
-                            result['source']
-                        ))
-                        added_count += 1
-                    except Exception as e:
-                        logger.error(f"خطا در افزودن مقاله: {e}")
+            result = self.search_results[int(item)]
+            rows.append((
+                result['title'],
+                result['authors'],
+                result['year'],
+                result.get('journal', ''),
+                result['source']
+            ))
+        
+        added_count = 0
+        try:
+            self.app.db.bulk_insert(
+                "papers",
+                ("title", "authors", "publication_date", "journal", "source"),
+                rows
+            )
+            added_count = len(rows)
+        except Exception as e:
+            logger.error(f"خطا در افزودن مقالات: {e}")
         
         if added_count > 0:
             messagebox.showinfo("موفقیت", f"{added_count} مقاله با موفقیت افزوده شد")
@@ -924,10 +1039,16 @@ class ResearchModule(ttk.Frame):
         analysis_buttons = ttk.Frame(self.analysis_tab)
         analysis_buttons.pack(pady=10)
         
-        ttk.Button(analysis_buttons, text="خلاصه‌سازی متن", 
-                  command=self.summarize_text).pack(side=tk.LEFT, padx=5)
-        ttk.Button(analysis_buttons, text="استخراج کلیدواژه", 
-                  command=self.extract_keywords).pack(side=tk.LEFT, padx=5)
+        # دکمه‌های وابسته به منابع NLP تا آماده شدن آن‌ها غیرفعال می‌مانند
+        self.nlp_buttons = [
+            ttk.Button(analysis_buttons, text="خلاصه‌سازی متن", 
+                      command=self.summarize_text, state=tk.DISABLED),
+            ttk.Button(analysis_buttons, text="استخراج کلیدواژه", 
+                      command=self.extract_keywords, state=tk.DISABLED),
+        ]
+        for button in self.nlp_buttons:
+            button.pack(side=tk.LEFT, padx=5)
+        self.app.nlp.when_ready(self, self.on_nlp_ready)
         ttk.Button(analysis_buttons, text="تجزیه و تحلیل آماری", 
                   command=self.statistical_analysis).pack(side=tk.LEFT, padx=5)
         
@@ -941,23 +1062,49 @@ class ResearchModule(ttk.Frame):
         # فریم برای نمودارها
         self.chart_frame = ttk.Frame(self.analysis_tab)
         self.chart_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        self.chart_panel = self.app.charts.panel(self.chart_frame)
+    
+    def on_nlp_ready(self):
+        """فعال کردن دکمه‌های آنالیز پس از بارگذاری منابع NLP"""
+        for button in self.nlp_buttons:
+            button.configure(state=tk.NORMAL)
+    
+    def nlp_available(self):
+        """بررسی آماده بودن منابع لازم برای خلاصه‌سازی؛ در غیر این صورت پیام هشدار"""
+        if not self.app.nlp.ready.is_set():
+            messagebox.showinfo("اطلاعات", "منابع پردازش متن در حال بارگذاری است، لطفاً کمی بعد تلاش کنید")
+            return False
+        if not self.app.nlp.has_punkt:
+            messagebox.showwarning(
+                "هشدار",
+                f"داده punkt برای NLTK یافت نشد. آن را در پوشه {self.app.nlp.data_dir} قرار دهید"
+            )
+            return False
+        return True
     
     def load_analysis_titles(self):
         """بارگذاری عناوین مقالات برای combobox آنالیز"""
+        if not self.analysis_combo:
+            return
         try:
+            self.mark_synced('analysis')
             papers = self.app.db.fetch_all("SELECT id, title FROM papers ORDER BY title")
             paper_options = [f"{paper[0]}: {paper[1]}" for paper in papers]
             
             # به روزرسانی combobox
-            if self.analysis_combo:
-                self.analysis_combo['values'] = paper_options
-                
-                if paper_options:
-                    self.analysis_combo.current(0)
+            self.analysis_combo['values'] = paper_options
+            
+            if paper_options:
+                self.analysis_combo.current(0)
                 
         except Exception as e:
             logger.error(f"خطا در بارگذاری عناوین: {e}")
     
+    def refresh_analysis_titles(self):
+        """بارگذاری دوباره عناوین فقط اگر مقالات تغییر کرده باشند"""
+        if self.papers_changed('analysis'):
+            self.load_analysis_titles()
+    
     def summarize_text(self):
         """خلاصه‌سازی متن مقاله انتخاب شده"""
         selected_value = self.analysis_var.get()
@@ -973,21 +1120,27 @@ class ResearchModule(ttk.Frame):
             messagebox.showwarning("هشدار", "مقاله انتخاب شده یادداشتی ندارد")
             return
         
-        notes = result[0]
-        try:
-            # خلاصه‌سازی متن با sumy
-            parser = PlaintextParser.from_string(notes, Tokenizer("english"))
-            summarizer = LsaSummarizer()
-            summary = summarizer(parser.document, 3)  # 3 جمله خلاصه
-            
-            summary_text = "\n".join([str(sentence) for sentence in summary])
-            
-            # نمایش خلاصه
+        self.start_summary(result[0])
+    
+    def start_summary(self, notes):
+        """خلاصه‌سازی متن با sumy در process pool و نمایش نتیجه در تب آنالیز"""
+        if not self.nlp_available():
+            return
+        
+        self.analysis_text.delete(1.0, tk.END)
+        self.analysis_text.insert(tk.END, "در حال خلاصه‌سازی...")
+        
+        def show(summary):
+            summary_text = "\n".join(summary)
             self.analysis_text.delete(1.0, tk.END)
             self.analysis_text.insert(tk.END, f"خلاصه مقاله:\n{summary_text}")
-            
-        except Exception as e:
-            messagebox.showerror("خطا", f"خطا در خلاصه‌سازی: {str(e)}")
+        
+        self.app.tasks.run_in_process(
+            nlp_tasks.summarize, notes, 3, self.app.nlp.search_dirs(),  # 3 جمله خلاصه
+            name="summarize",
+            on_result=show,
+            on_error=lambda e: messagebox.showerror("خطا", f"خطا در خلاصه‌سازی: {str(e)}")
+        )
     
     def extract_keywords(self):
         """استخراج کلیدواژه‌های مقاله انتخاب شده"""
@@ -1005,17 +1158,8 @@ class ResearchModule(ttk.Frame):
             return
         
         notes = result[0]
-        try:
-            # استخراج کلیدواژه‌ها
-            words = word_tokenize(notes)
-            stop_words = set(stopwords.words('english'))
-            filtered_words = [word for word in words if word.isalnum() and word.lower() not in stop_words]
-            
-            # شمارش تکرار کلمات
-            from collections import Counter
-            word_freq = Counter(filtered_words)
-            top_keywords = word_freq.most_common(10)  # 10 کلیدواژه برتر
-            
+        
+        def show(top_keywords):
             # نمایش کلیدواژه‌ها
             keywords_text = "\n".join([f"{word}: {count}" for word, count in top_keywords])
             self.analysis_text.delete(1.0, tk.END)
@@ -1023,46 +1167,41 @@ class ResearchModule(ttk.Frame):
             
             # ایجاد نمودار
             self.create_keyword_chart(top_keywords)
-            
-        except Exception as e:
-            messagebox.showerror("خطا", f"خطا در استخراج کلیدواژه: {str(e)}")
+        
+        # توکن‌سازی و شمارش کلمات در process pool
+        nlp = self.app.nlp
+        self.app.tasks.run_in_process(
+            nlp_tasks.keyword_frequencies, notes, nlp.stopwords('english'), 10,  # 10 کلیدواژه برتر
+            nlp.has_punkt, nlp.search_dirs(),
+            name="keywords",
+            on_result=show,
+            on_error=lambda e: messagebox.showerror("خطا", f"خطا در استخراج کلیدواژه: {str(e)}")
+        )
     
     def create_keyword_chart(self, keywords):
         """ایجاد نمودار برای کلیدواژه‌ها"""
-        # پاک کردن فریم نمودار
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-        
-        # ایجاد نمودار
-        words = [item[0] for item in keywords]
-        counts = [item[1] for item in keywords]
-        
-        fig, ax = plt.subplots(figsize=(8, 6))
-        ax.barh(words, counts)
-        ax.set_xlabel('تعداد تکرار')
-        ax.set_title('توزیع کلیدواژه‌ها')
-        
-        # نمایش نمودار در Tkinter
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # رسم در پس‌زمینه روی figure ثابت پنل
+        self.chart_panel.show(
+            "barh", keywords,
+            title='توزیع کلیدواژه‌ها',
+            xlabel='تعداد تکرار'
+        )
     
     def statistical_analysis(self):
         """تجزیه و تحلیل آماری مقالات"""
         try:
-            # دریافت تمام مقالات از دیتابیس
-            papers = self.app.db.fetch_all("SELECT publication_date, journal, status FROM papers")
-            
-            if not papers:
-                messagebox.showwarning("هشدار", "هیچ مقاله‌ای برای تحلیل وجود ندارد")
-                return
-            
-            # تحلیل داده‌ها
+            # تحلیل داده‌ها به صورت جریانی (فقط ستون‌های لازم خوانده می‌شوند)
+            total = 0
             year_counts = {}
             journal_counts = {}
             status_counts = {}
             
+            papers = self.app.db.fetch_iter(
+                "SELECT * FROM papers",
+                columns=('publication_date', 'journal', 'status')
+            )
             for paper in papers:
+                total += 1
                 # شمارش بر اساس سال
                 year = paper[0][:4] if paper[0] and len(paper[0]) >= 4 else 'نامشخص'
                 year_counts[year] = year_counts.get(year, 0) + 1
@@ -1075,9 +1214,13 @@ class ResearchModule(ttk.Frame):
                 status = paper[2] or 'نامشخص'
                 status_counts[status] = status_counts.get(status, 0) + 1
             
+            if not total:
+                messagebox.showwarning("هشدار", "هیچ مقاله‌ای برای تحلیل وجود ندارد")
+                return
+            
             # نمایش نتایج
             analysis_text = "تحلیل آماری مقالات:\n\n"
-            analysis_text += f"تعداد کل مقالات: {len(papers)}\n\n"
+            analysis_text += f"تعداد کل مقالات: {total}\n\n"
             
             analysis_text += "توزیع بر اساس سال:\n"
             for year, count in sorted(year_counts.items()):
@@ -1102,23 +1245,10 @@ class ResearchModule(ttk.Frame):
     
     def create_status_chart(self, status_counts):
         """ایجاد نمودار وضعیت مقالات"""
-        # پاک کردن فریم نمودار
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-        
-        # ایجاد نمودار
-        labels = list(status_counts.keys())
-        sizes = list(status_counts.values())
-        
-        fig, ax = plt.subplots(figsize=(8, 6))
-        ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-        ax.axis('equal')
-        ax.set_title('توزیع مقالات بر اساس وضعیت')
-        
-        # نمایش نمودار در Tkinter
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.chart_panel.show(
+            "pie", list(status_counts.items()),
+            title='توزیع مقالات بر اساس وضعیت'
+        )
     
     def setup_projects_tab(self):
         """ایجاد تب مدیریت پروژه‌ها"""
@@ -1208,7 +1338,10 @@ class ResearchModule(ttk.Frame):
     
     def load_projects(self):
         """بارگذاری پروژه‌ها از دیتابیس"""
+        if self.projects_tree is None:
+            return
         try:
+            self.mark_synced('projects')
             # پاک کردن لیست قبلی
             for item in self.projects_tree.get_children():
                 self.projects_tree.delete(item)
@@ -1229,6 +1362,14 @@ class ResearchModule(ttk.Frame):
         except Exception as e:
             logger.error(f"خطا در بارگذاری پروژه‌ها: {e}")
     
+    def refresh_projects(self):
+        """بارگذاری دوباره پروژه‌ها اگر مقالات (و در نتیجه تعداد مقالات پروژه‌ها) تغییر کرده باشند
+
+        تغییرات خود پروژه‌ها فقط از همین تب انجام می‌شوند و همان‌جا load_projects را صدا می‌زنند.
+        """
+        if self.papers_changed('projects'):
+            self.load_projects()
+    
     def manage_project_papers(self):
         """مدیریت مقالات پروژه انتخاب شده"""
         selection = self.projects_tree.selection()
@@ -1408,11 +1549,12 @@ class ResearchModule(ttk.Frame):
         
         if messagebox.askyesno("تأیید", f"آیا از حذف پروژه '{project_name}' مطمئن هستید؟"):
             try:
-                # حذف روابط مقاله-پروژه
-                self.app.db.execute_query("DELETE FROM research_project_mapers WHERE project_id = ?", (project_id,))
-                
-                # حذف پروژه
-                self.app.db.execute_query("DELETE FROM research_projects WHERE id = ?", (project_id,))
+                with self.app.db.transaction():
+                    # حذف روابط مقاله-پروژه
+                    self.app.db.execute_query("DELETE FROM research_project_mapers WHERE project_id = ?", (project_id,))
+                    
+                    # حذف پروژه
+                    self.app.db.execute_query("DELETE FROM research_projects WHERE id = ?", (project_id,))
                 
                 messagebox.showinfo("موفقیت", "پروژه با موفقیت حذف شد")
                 self.load_projects()
@@ -1550,9 +1692,40 @@ class ResearchModule(ttk.Frame):
         self.clipboard_append(text)
         messagebox.showinfo("موفقیت", "متن با موفقیت کپی شد")
     
+    def refresh_research(self):
+        """همگام‌سازی جدول مقالات با تغییرات ثبت‌شده پس از آخرین بارگذاری
+        
+        اگر change_log تغییری برای papers نداشته باشد فقط watermark خوانده می‌شود.
+        """
+        if self.table is None:
+            return
+        try:
+            if not self.papers_changed('articles'):
+                return
+            
+            if self.current_filters.get('search'):
+                self.table.set_source(self.build_research_source(), keep_position=True)
+            else:
+                self.table.refresh()
+            
+        except Exception as e:
+            logger.error(f"خطا در بروزرسانی مقالات: {e}")
+    
     def on_activate(self):
-        """هنگام فعال شدن ماژول فراخوانی می‌شود"""
+        """هنگام فعال شدن ماژول فراخوانی می‌شود
+        
+        نمونه ماژول بین جابجایی‌ها حفظ می‌شود، پس فقط داده‌های تب قابل مشاهده
+        و فقط در صورت تغییر دوباره خوانده می‌شوند.
+        """
         logger.info("ماژول مقالات تحقیقاتی فعال شد")
-        self.load_research()
-        self.load_projects()
-        self.load_analysis_titles()
\ No newline at end of file
+        self.on_tab_changed()
+    
+    def on_deactivate(self):
+        """هنگام پنهان شدن ماژول فراخوانی می‌شود"""
+        # نتیجه جستجوی معلق نباید روی ماژول پنهان اعمال شود
+        if self.research_query is not None:
+            self.research_query.cancel()
+    
+    def destroy(self):
+        self.app.event_bus.unsubscribe(FACETS_CHANGED_EVENT, self.on_facets_changed)
+        super().destroy()
\ No newline at end of file
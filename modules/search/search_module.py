@@ -1,31 +1,180 @@
 # research_assistant/modules/search/search_module.py
+import os
+import time
 import tkinter as tk
 from tkinter import ttk
 import logging
+from core.debounce import DebouncedQuery
 
 logger = logging.getLogger(__name__)
 
-class SearchModule(tk.Frame):
+MODULE_INFO = {"icon": "🔎", "title_key": "search", "order": 50}
+
+# نوع سند، برچسب نمایشی و جدولی که مسیر فایل از آن خوانده می‌شود
+KIND_LABELS = {
+    "paper": ("📄 مقاله", "papers"),
+    "datasheet": ("📋 دیتاشیت", "datasheets"),
+    "note": ("📝 یادداشت", None),
+}
+
+# تعداد نتایج هر صفحه
+PAGE_SIZE = 50
+
+
+class SearchModule(ttk.Frame):
     module_name = "جستجو"
-    
-    def __init__(self, parent, app):
+
+    def __init__(self, parent, app, config):
         super().__init__(parent)
         self.app = app
+        self.config = config
+        self.results = []
+        self.kind_vars = {}
         self.setup_ui()
-        
+
     def setup_ui(self):
-        """ایجاد رابط کاربری جستجوی علمی"""
+        """ایجاد رابط کاربری جستجوی سراسری"""
         title_label = ttk.Label(
             self,
-            text="🔎 جستجوی علمی",
+            text="🔎 " + self.config.t("search"),
             font=("Tahoma", 16, "bold")
         )
         title_label.pack(pady=20)
-        
-        # پیام موقت
-        message = ttk.Label(
+
+        # فیلد جستجو و انتخاب نوع اسناد
+        search_frame = ttk.Frame(self)
+        search_frame.pack(fill=tk.X, padx=20, pady=5)
+
+        ttk.Label(search_frame, text="جستجو:").pack(side=tk.RIGHT, padx=5)
+        self.query_var = tk.StringVar()
+        query_entry = ttk.Entry(search_frame, textvariable=self.query_var, width=50)
+        query_entry.pack(side=tk.RIGHT, padx=5, fill=tk.X, expand=True)
+        query_entry.bind('<KeyRelease>', lambda event: self.run_search())
+        query_entry.bind('<Return>', lambda event: self.run_search())
+
+        for kind, (label, _) in KIND_LABELS.items():
+            var = tk.BooleanVar(value=True)
+            self.kind_vars[kind] = var
+            ttk.Checkbutton(
+                search_frame, text=label, variable=var, command=self.run_search
+            ).pack(side=tk.LEFT, padx=5)
+
+        # جستجوی هنگام تایپ: ادغام ضربه‌های کلید و اجرای query در پس‌زمینه
+        self.search_query = DebouncedQuery(
             self,
-            text="این بخش در حال توسعه است. به زودی ویژگی‌های جستجوی علمی اضافه خواهد شد.",
-            font=("Tahoma", 10)
+            self.app.tasks,
+            self.query_index,
+            self.show_results,
+            delay_ms=self.config.get("search_debounce_ms", 250),
+            on_error=self.show_error
         )
-        message.pack(pady=50)
\ No newline at end of file
+
+        self.status_label = ttk.Label(self, text="", font=("Tahoma", 9))
+        self.status_label.pack(fill=tk.X, padx=20)
+
+        # جدول نتایج
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+        columns = ("kind", "title", "score")
+        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=12)
+        self.tree.heading("kind", text="نوع")
+        self.tree.heading("title", text="عنوان")
+        self.tree.heading("score", text="امتیاز")
+        self.tree.column("kind", width=100, anchor=tk.CENTER)
+        self.tree.column("title", width=500)
+        self.tree.column("score", width=80, anchor=tk.CENTER)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<Double-1>', self.on_open)
+
+        # بخشی از متن سند اطراف کلمات منطبق
+        self.snippet_text = tk.Text(self, height=5, wrap=tk.WORD, font=("Tahoma", 10))
+        self.snippet_text.pack(fill=tk.X, padx=20, pady=(0, 10))
+        self.snippet_text.configure(state=tk.DISABLED)
+
+    def selected_kinds(self):
+        return [kind for kind, var in self.kind_vars.items() if var.get()]
+
+    def run_search(self):
+        """زمان‌بندی جستجو برای متن فعلی"""
+        text = self.query_var.get().strip()
+        if not text:
+            self.search_query.cancel()
+            self.show_results((text, [], 0.0, False))
+            return
+        self.search_query.submit(text, self.selected_kinds())
+
+    def query_index(self, text, kinds):
+        """اجرا در thread پس‌زمینه"""
+        started = time.perf_counter()
+        if not kinds:
+            return text, [], 0.0, False
+        fuzzy = False
+        results = self.app.search_index.search(text, kinds=kinds, limit=PAGE_SIZE)
+        if not results:
+            # بدون تطبیق دقیق، واژه‌های نزدیک (غلط تایپی) از نمایه trigram
+            results = self.app.search_index.fuzzy_search(text, kinds=kinds, limit=PAGE_SIZE)
+            fuzzy = True
+        return text, results, (time.perf_counter() - started) * 1000, fuzzy
+
+    def show_results(self, result):
+        text, results, elapsed_ms, fuzzy = result
+        self.results = results
+        self.tree.delete(*self.tree.get_children())
+        for index, item in enumerate(results):
+            label = KIND_LABELS.get(item["kind"], (item["kind"], None))[0]
+            title = item["title"] or item["snippet"][:80]
+            self.tree.insert("", tk.END, iid=str(index), values=(label, title, f"{item['score']:.2f}"))
+        self.set_snippet("")
+        if text:
+            kind_text = " تقریبی" if fuzzy and results else ""
+            self.status_label.config(text=f"{len(results)} نتیجه{kind_text} در {elapsed_ms:.0f} میلی‌ثانیه")
+        else:
+            self.status_label.config(text="")
+
+    def show_error(self, error):
+        logger.error(f"خطا در جستجو: {error}")
+        self.status_label.config(text=f"خطا در جستجو: {error}")
+
+    def set_snippet(self, text):
+        self.snippet_text.configure(state=tk.NORMAL)
+        self.snippet_text.delete("1.0", tk.END)
+        self.snippet_text.insert("1.0", text)
+        self.snippet_text.configure(state=tk.DISABLED)
+
+    def selected_result(self):
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        return self.results[int(selection[0])]
+
+    def on_select(self, event=None):
+        item = self.selected_result()
+        self.set_snippet(item["snippet"] if item else "")
+
+    def on_open(self, event=None):
+        """باز کردن فایل مقاله یا دیتاشیت انتخاب‌شده"""
+        item = self.selected_result()
+        if item is None:
+            return
+        table = KIND_LABELS.get(item["kind"], (None, None))[1]
+        if table is None:
+            return
+        row = self.app.db.fetch_one(f"SELECT file_path FROM {table} WHERE id = ?", (item["id"],))
+        if row and row[0] and os.path.exists(row[0]):
+            self.app.open_file(row[0])
+
+    def on_activate(self):
+        """هنگام فعال شدن ماژول؛ نتایج با نمایه فعلی دوباره محاسبه می‌شوند"""
+        if self.query_var.get().strip():
+            self.run_search()
+
+    def on_deactivate(self):
+        """نتیجه جستجوی معلق نباید روی ماژول پنهان اعمال شود"""
+        self.search_query.cancel()
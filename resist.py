@@ -0,0 +1,7 @@
+# research_assistant/resist.py
+# رابط خط فرمان بدون Tk: python -m resist --help
+import sys
+from core.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,44 @@
+# research_assistant/tests/test_api_server.py
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from urllib.request import Request, urlopen
+
+from core.api_server import ApiServer
+from core.database import Database
+
+
+class ApiServerTest(unittest.TestCase):
+    def setUp(self):
+        # سرور اتصال نوشتنی جداگانه باز می‌کند، پس پایگاه داده باید فایل باشد
+        self.directory = tempfile.mkdtemp()
+        self.db = Database({"database_path": os.path.join(self.directory, "api.db")})
+        self.server = ApiServer(self.db, port=0, workers=2).start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.db.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def request(self, path, payload=None):
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        request = Request(self.server.url + path, data=data, headers={"Content-Type": "application/json"})
+        with urlopen(request, timeout=5) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def test_list_tags_are_stored_as_text(self):
+        result = self.request("/api/papers", {"title": "list", "tags": ["Alpha", "beta"]})
+        self.assertEqual(result["inserted"], 1)
+        row = self.request(f"/api/papers/{result['ids'][0]}")
+        self.assertEqual(row["tags"], "Alpha, beta")
+
+        titles = [item["title"] for item in self.request("/api/papers?tag=alpha,beta")["items"]]
+        self.assertEqual(titles, ["list"])
+        names = self.db.fetch_all("SELECT name FROM tags ORDER BY name")
+        self.assertEqual(names, [("Alpha",), ("beta",)])
+
+
+if __name__ == "__main__":
+    unittest.main()
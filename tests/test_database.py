@@ -0,0 +1,48 @@
+# research_assistant/tests/test_database.py
+import threading
+import unittest
+
+from core.database import Database
+
+
+class InMemoryDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.db = Database({"database_path": ":memory:"})
+        self.db.execute_query("INSERT INTO papers (title) VALUES ('one')")
+
+    def tearDown(self):
+        self.db.close()
+
+    def in_thread(self, fn):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(fn()))
+        thread.start()
+        thread.join(5)
+        return result[0]
+
+    def test_reads_from_other_threads(self):
+        query = "SELECT title FROM papers"
+        self.assertEqual(self.in_thread(lambda: self.db.fetch_all(query)), [("one",)])
+        self.assertEqual(self.in_thread(lambda: self.db.fetch_one(query)), ("one",))
+        self.assertEqual(self.in_thread(lambda: list(self.db.fetch_iter(query))), [("one",)])
+
+    def test_thread_reader_sees_later_writes(self):
+        query = "SELECT COUNT(*) FROM papers"
+        self.assertEqual(self.in_thread(lambda: self.db.fetch_one(query)), (1,))
+        self.db.execute_query("INSERT INTO papers (title) VALUES ('two')")
+        self.assertEqual(self.in_thread(lambda: self.db.fetch_one(query)), (2,))
+
+    def test_separate_databases(self):
+        other = Database({"database_path": ":memory:"})
+        try:
+            self.assertEqual(other.fetch_one("SELECT COUNT(*) FROM papers"), (0,))
+        finally:
+            other.close()
+
+    def test_reader_errors_are_logged(self):
+        with self.assertLogs("core.database", "ERROR"):
+            self.assertEqual(self.in_thread(lambda: self.db.fetch_all("SELECT * FROM missing")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# research_assistant/tests/test_facets.py
+import unittest
+
+from core.database import Database
+from core.facets import FacetCounts
+
+
+class FacetCountsTest(unittest.TestCase):
+    def setUp(self):
+        self.db = Database({"database_path": ":memory:"})
+        self.insert("one", "read", "2020-01-01", "Nature", "AI, Vision")
+        self.insert("two", "read", "2021-05-01", "Science", "ai")
+        self.facets = FacetCounts(self.db, "papers")
+        self.facets.load()
+
+    def tearDown(self):
+        self.db.close()
+
+    def insert(self, title, status, date, journal, tags):
+        self.db.execute_query(
+            "INSERT INTO papers (title, status, publication_date, journal, tags) VALUES (?, ?, ?, ?, ?)",
+            (title, status, date, journal, tags)
+        )
+
+    def paper_id(self, title):
+        return self.db.fetch_one("SELECT id FROM papers WHERE title = ?", (title,))[0]
+
+    def test_load(self):
+        snapshot = self.facets.snapshot()
+        self.assertEqual(snapshot["total"], 2)
+        self.assertEqual(snapshot["status"], {"read": 2})
+        self.assertEqual(snapshot["year"], {"2020": 1, "2021": 1})
+        # «AI» و «ai» یک برچسب با نام نمایشی اولین شکل دیده‌شده هستند
+        self.assertEqual(snapshot["tag"], {"AI": 2, "Vision": 1})
+
+    def test_refresh_without_changes(self):
+        self.assertFalse(self.facets.refresh())
+
+    def test_refresh_adds_rows(self):
+        self.insert("three", "planned", "2021-02-02", "Nature", "vision, Audio")
+        self.assertTrue(self.facets.refresh())
+        snapshot = self.facets.snapshot()
+        self.assertEqual(snapshot["total"], 3)
+        self.assertEqual(snapshot["status"], {"read": 2, "planned": 1})
+        self.assertEqual(snapshot["journal"], {"Nature": 2, "Science": 1})
+        self.assertEqual(snapshot["tag"], {"AI": 2, "Vision": 2, "Audio": 1})
+
+    def test_refresh_updates_and_removes_rows(self):
+        self.db.execute_query("UPDATE papers SET tags = 'audio', status = 'reading' WHERE title = 'one'")
+        self.db.execute_query("DELETE FROM papers WHERE title = 'two'")
+        self.assertTrue(self.facets.refresh())
+        snapshot = self.facets.snapshot()
+        self.assertEqual(snapshot["total"], 1)
+        self.assertEqual(snapshot["status"], {"reading": 1})
+        self.assertEqual(snapshot["year"], {"2020": 1})
+        # برچسب‌هایی که تعدادشان صفر شده همراه نام نمایشی‌شان حذف می‌شوند
+        self.assertEqual(snapshot["tag"], {"audio": 1})
+        self.assertEqual(self.facets.tag_names, {"audio": "audio"})
+
+    def test_matching(self):
+        one, two = self.paper_id("one"), self.paper_id("two")
+        self.assertEqual(self.facets.matching("tag", "Ai"), {one, two})
+        self.assertEqual(self.facets.matching("tag", "vision"), {one})
+        self.assertEqual(self.facets.matching("journal", "Science"), {two})
+
+    def test_matches_full_load(self):
+        self.insert("three", None, None, None, "x, X, y")
+        self.db.execute_query("UPDATE papers SET journal = 'Cell' WHERE title = 'two'")
+        self.facets.refresh()
+        loaded = FacetCounts(self.db, "papers")
+        loaded.load()
+        self.assertEqual(self.facets.snapshot(), loaded.snapshot())
+
+
+if __name__ == "__main__":
+    unittest.main()
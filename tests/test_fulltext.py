@@ -0,0 +1,69 @@
+# research_assistant/tests/test_fulltext.py
+import random
+import unittest
+
+from core.database import Database
+
+COLUMNS = ("title", "authors", "journal", "notes", "tags", "url")
+
+
+def random_rows(count, seed=5):
+    """ردیف‌هایی با حروف عربی، ارقام فارسی، نیم‌فاصله و جداکننده‌های برچسب"""
+    rng = random.Random(seed)
+    alphabet = "abcAB \t\n,يكةۀأؤ۰۱٢‌ـًی ک"
+
+    def text():
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16))) if rng.random() > 0.1 else None
+
+    return [((text() or "t"), *(text() for _ in COLUMNS[1:])) for _ in range(count)]
+
+
+class DeferredIndexingTest(unittest.TestCase):
+    """نوشتن‌های دسته‌ای (نمایه در پایتون) همان نتیجه triggerها را می‌سازند"""
+
+    def setUp(self):
+        self.triggered = Database({"database_path": ":memory:"})
+        self.bulk = Database({"database_path": ":memory:"})
+
+    def tearDown(self):
+        self.triggered.close()
+        self.bulk.close()
+
+    def indexed(self, db):
+        fts = db.fetch_all("SELECT rowid, * FROM papers_fts ORDER BY rowid")
+        links = db.fetch_all(
+            "SELECT l.row_id, t.name, t.normalized FROM tag_links l JOIN tags t ON t.id = l.tag_id "
+            "ORDER BY l.row_id, t.normalized"
+        )
+        return fts, links
+
+    def test_bulk_insert_and_update_match_triggers(self):
+        rows = random_rows(200)
+        for row in rows:
+            self.triggered.execute_query(f"INSERT INTO papers ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)", row)
+        self.bulk.bulk_insert("papers", COLUMNS, rows)
+        self.assertEqual(self.indexed(self.triggered), self.indexed(self.bulk))
+
+        updates = [(notes, tags, row_id) for row_id, (notes, tags, *_) in enumerate(random_rows(50, seed=6), 1)]
+        for row in updates:
+            self.triggered.execute_query("UPDATE papers SET notes = ?, tags = ? WHERE id = ?", row)
+        self.bulk.bulk_update("papers", ("notes", "tags"), updates)
+        self.assertEqual(self.indexed(self.triggered), self.indexed(self.bulk))
+
+    def test_deferral_is_cleared(self):
+        self.bulk.bulk_insert("papers", ("title",), [("a",), ("b",)])
+        self.assertEqual(self.bulk.fetch_all("SELECT * FROM index_deferrals"), [])
+        # نوشتن تک‌ردیفی پس از دسته دوباره از triggerها نمایه می‌شود
+        self.bulk.execute_query("INSERT INTO papers (title) VALUES ('يك')")
+        self.assertEqual(self.bulk.fetch_all("SELECT title FROM papers_fts WHERE papers_fts MATCH 'یک'"), [("یک",)])
+
+    def test_failed_batch_rolls_back_deferral(self):
+        self.bulk.bulk_insert("papers", ("title", "file_path"), [("a", "same")])
+        with self.assertRaises(Exception):
+            self.bulk.bulk_insert("papers", ("title", "file_path"), [("b", "other"), ("c", "same")])
+        self.assertEqual(self.bulk.fetch_all("SELECT * FROM index_deferrals"), [])
+        self.assertEqual(self.bulk.fetch_one("SELECT COUNT(*) FROM papers_fts"), (1,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# research_assistant/tests/test_fuzzy.py
+import random
+import sqlite3
+import unittest
+
+from core.fuzzy import add_terms, edit_distance, ensure_fuzzy_schema, max_distance, similar_terms, trigrams
+
+
+def levenshtein(a, b):
+    """فاصله Levenshtein کامل (بدون نوار و هزینه حروف هم‌شکل) برای مقایسه"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+class EditDistanceTest(unittest.TestCase):
+    def test_identical(self):
+        self.assertEqual(edit_distance("resistor", "resistor", 2), 0)
+
+    def test_single_edits(self):
+        self.assertEqual(edit_distance("resistor", "resister", 2), 1)
+        self.assertEqual(edit_distance("resistor", "resistors", 2), 1)
+        self.assertEqual(edit_distance("resistor", "resstor", 2), 1)
+
+    def test_confusable_substitution_costs_half(self):
+        self.assertEqual(edit_distance("lm317", "1m317", 1), 0.5)
+        self.assertEqual(edit_distance("bc547", "8c547", 1), 0.5)
+        self.assertEqual(edit_distance("l0l", "1o1", 2), 1.5)
+
+    def test_over_limit_returns_limit_plus_one(self):
+        self.assertEqual(edit_distance("abc", "xyz", 1), 2)
+        # اختلاف طول بیش از limit بدون محاسبه رد می‌شود
+        self.assertEqual(edit_distance("ab", "abcdef", 2), 3)
+
+    def test_symmetric(self):
+        self.assertEqual(edit_distance("kitten", "sitting", 3), edit_distance("sitting", "kitten", 3))
+
+    def test_matches_full_levenshtein(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            a = "".join(rng.choice("acdefh") for _ in range(rng.randint(0, 8)))
+            b = "".join(rng.choice("acdefh") for _ in range(rng.randint(0, 8)))
+            limit = rng.randint(0, 3)
+            expected = levenshtein(a, b)
+            self.assertEqual(edit_distance(a, b, limit), expected if expected <= limit else limit + 1, (a, b, limit))
+
+
+class TrigramTest(unittest.TestCase):
+    def test_trigrams_are_padded(self):
+        self.assertEqual(trigrams("abc"), {"$ab", "abc", "bc$"})
+
+    def test_max_distance_by_length(self):
+        self.assertEqual(max_distance("ab"), 0)
+        self.assertEqual(max_distance("abc"), 1)
+        self.assertEqual(max_distance("resistor"), 2)
+
+
+class SimilarTermsTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.cursor = self.connection.cursor()
+        ensure_fuzzy_schema(self.cursor)
+        add_terms(self.cursor, ["resistor", "capacitor", "transistor", "lm317", "inductor"])
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_add_terms_skips_existing(self):
+        self.assertEqual(add_terms(self.cursor, ["resistor", "diode"]), 1)
+        count = self.cursor.execute("SELECT COUNT(*) FROM fuzzy_terms").fetchone()[0]
+        self.assertEqual(count, 6)
+
+    def test_typo_within_threshold(self):
+        self.assertEqual(similar_terms(self.cursor, "resistr"), [("resistor", 1)])
+        self.assertEqual(similar_terms(self.cursor, "capacitr"), [("capacitor", 1)])
+
+    def test_confusable_part_number(self):
+        self.assertEqual(similar_terms(self.cursor, "1m317"), [("lm317", 0.5)])
+
+    def test_beyond_threshold(self):
+        # سه ویرایش از حد مجاز واژه هشت‌حرفی (دو) بیشتر است
+        self.assertEqual(similar_terms(self.cursor, "rezyztor"), [])
+
+    def test_short_word_exact_only(self):
+        add_terms(self.cursor, ["ab"])
+        self.assertEqual(similar_terms(self.cursor, "ab"), [("ab", 0)])
+        self.assertEqual(similar_terms(self.cursor, "ac"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# research_assistant/tests/test_tags.py
+import unittest
+
+from core.database import Database
+from core.tags import backfill, parse_tag_filter, split_tags, tag_filter, tag_key
+
+
+class TagKeyTest(unittest.TestCase):
+    def test_split_tags(self):
+        self.assertEqual(split_tags(" a, b ,,a\tc,\n"), ["a", "b", "a c"])
+
+    def test_tag_key_folds_case_and_spaces(self):
+        self.assertEqual(tag_key("  Machine Learning "), tag_key("machine learning"))
+        self.assertEqual(tag_key(" "), "")
+
+    def test_parse_tag_filter(self):
+        self.assertEqual(parse_tag_filter("a, b"), (["a", "b"], "and"))
+        self.assertEqual(parse_tag_filter("a | b"), (["a", "b"], "or"))
+
+
+class TagFilterTest(unittest.TestCase):
+    def setUp(self):
+        # مهاجرت‌ها جدول‌ها و triggerهای tag_links را می‌سازند
+        self.db = Database({"database_path": ":memory:"})
+        for title, tags in (("one", "AI, Vision"), ("two", "ai"), ("three", "vision, audio"), ("four", None)):
+            self.db.execute_query("INSERT INTO papers (title, tags) VALUES (?, ?)", (title, tags))
+
+    def tearDown(self):
+        self.db.close()
+
+    def titles(self, tags, mode):
+        condition, params = tag_filter("papers", "p.id", tags, mode)
+        rows = self.db.fetch_all(f"SELECT p.title FROM papers p WHERE {condition} ORDER BY p.id", params)
+        return [row[0] for row in rows]
+
+    def test_single_tag(self):
+        self.assertEqual(self.titles(["ai"], "and"), ["one", "two"])
+
+    def test_and_requires_every_tag(self):
+        self.assertEqual(self.titles(["ai", "VISION"], "and"), ["one"])
+        self.assertEqual(self.titles(["ai", "audio"], "and"), [])
+
+    def test_or_matches_any_tag(self):
+        self.assertEqual(self.titles(["ai", "audio"], "or"), ["one", "two", "three"])
+
+    def test_unknown_tag(self):
+        self.assertEqual(self.titles(["missing"], "or"), [])
+        self.assertEqual(self.titles(["ai", "missing"], "and"), [])
+
+    def test_empty_filter_matches_all(self):
+        self.assertEqual(tag_filter("papers", "p.id", [" ", ""], "and"), ("1=1", []))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            tag_filter("papers", "p.id", ["a", "b"], "xor")
+
+    def test_triggers_follow_updates_and_deletes(self):
+        self.db.execute_query("UPDATE papers SET tags = 'audio' WHERE title = 'one'")
+        self.db.execute_query("DELETE FROM papers WHERE title = 'two'")
+        self.assertEqual(self.titles(["ai"], "or"), [])
+        self.assertEqual(self.titles(["audio"], "or"), ["one", "three"])
+
+    def test_trigger_keys_match_tag_key(self):
+        self.db.execute_query("INSERT INTO papers (title, tags) VALUES ('five', ' Deep\tLearning ,, ')")
+        rows = self.db.fetch_all("SELECT name, normalized FROM tags WHERE normalized LIKE 'deep%'")
+        self.assertEqual(rows, [("Deep Learning", tag_key("Deep Learning"))])
+
+    def test_backfill_rebuilds_links(self):
+        with self.db.transaction() as cursor:
+            cursor.execute("DELETE FROM tag_links")
+            backfill(cursor, "papers")
+        self.assertEqual(self.titles(["vision"], "and"), ["one", "three"])
+
+
+if __name__ == "__main__":
+    unittest.main()